@@ -23,8 +23,10 @@ from archai.common.ordered_dict_logger import OrderedDictLogger
 from archai.datasets.nlp.fast_hf_dataset_provider_utils import (
     FastHfDataset,
     SHMArray,
+    get_document_offsets,
     process_with_memory_map_files,
     process_with_shared_memory,
+    process_with_streaming,
     xor,
 )
 from archai.datasets.nlp.hf_dataset_provider_utils import tokenize_concatenated_dataset
@@ -91,27 +93,43 @@ class FastHfDatasetProvider(DatasetProvider):
         return dataset_dict
 
     @staticmethod
-    def _encode_dataset(
-        dataset_dict: DatasetDict,
+    def _get_mapping_fn(
         tokenizer: AutoTokenizer,
         mapping_fn: Callable[[Any], Dict[str, Any]],
         mapping_fn_kwargs: Dict[str, Any],
         mapping_column_name: List[str],
         use_eos_token: bool,
         dtype: np.dtype,
-        num_workers: int,
-    ) -> DatasetDict:
-        logger.info("Encoding dataset ...")
-        logger.info(f"Number of workers: {num_workers} | EOS token: {use_eos_token}")
-
+    ) -> Tuple[Callable[[Any], Dict[str, Any]], Dict[str, Any]]:
         mapping_fn = mapping_fn or tokenize_concatenated_dataset
         mapping_fn_kwargs = mapping_fn_kwargs or {
             "tokenizer": tokenizer,
             "mapping_column_name": mapping_column_name,
             "use_eos_token": use_eos_token,
             "dtype": dtype,
+            "return_document_lengths": True,
         }
 
+        return mapping_fn, mapping_fn_kwargs
+
+    @staticmethod
+    def _encode_dataset(
+        dataset_dict: DatasetDict,
+        tokenizer: AutoTokenizer,
+        mapping_fn: Callable[[Any], Dict[str, Any]],
+        mapping_fn_kwargs: Dict[str, Any],
+        mapping_column_name: List[str],
+        use_eos_token: bool,
+        dtype: np.dtype,
+        num_workers: int,
+    ) -> DatasetDict:
+        logger.info("Encoding dataset ...")
+        logger.info(f"Number of workers: {num_workers} | EOS token: {use_eos_token}")
+
+        mapping_fn, mapping_fn_kwargs = FastHfDatasetProvider._get_mapping_fn(
+            tokenizer, mapping_fn, mapping_fn_kwargs, mapping_column_name, use_eos_token, dtype
+        )
+
         column_names = dataset_dict["train"].column_names
         encoded_dataset_dict = dataset_dict.map(
             mapping_fn,
@@ -145,16 +163,20 @@ class FastHfDatasetProvider(DatasetProvider):
     @staticmethod
     def _save_dataset(
         dataset_dict: Dict[str, Union[SHMArray, np.ndarray]],
+        encoded_dataset_dict: DatasetDict,
         tokenizer: AutoTokenizer,
         cache_dir: str,
         use_shared_memory: bool,
-    ) -> Tuple[Path, Path, Path]:
+    ) -> Dict[str, Path]:
         logger.info(f"Saving dataset to: {cache_dir}")
 
         cache_files = {}
         for split, dataset in dataset_dict.items():
             np.save(cache_dir / f"{split}.npy", dataset)
 
+            # End offsets of the documents are saved as an index of document boundaries
+            np.save(cache_dir / f"{split}_offsets.npy", get_document_offsets(encoded_dataset_dict[split]))
+
             # If using shared memory, dataset needs to have its shared memory
             # unlinked to prevent memory leak
             if use_shared_memory:
@@ -168,10 +190,40 @@ class FastHfDatasetProvider(DatasetProvider):
 
             cache_files[f"{split}_file"] = cache_dir / f"{split}.npy"
 
+        FastHfDatasetProvider._save_tokenizer(tokenizer, cache_dir)
+
+        return cache_files
+
+    @staticmethod
+    def _save_tokenizer(tokenizer: AutoTokenizer, cache_dir: str) -> None:
         with open(cache_dir / "tokenizer.pkl", "wb") as f:
             pickle.dump(tokenizer, f)
 
-        return cache_files
+    @staticmethod
+    def _encode_and_save_dataset_with_streaming(
+        dataset_dict: DatasetDict,
+        tokenizer: AutoTokenizer,
+        mapping_fn: Callable[[Any], Dict[str, Any]],
+        mapping_fn_kwargs: Dict[str, Any],
+        mapping_column_name: List[str],
+        use_eos_token: bool,
+        dtype: np.dtype,
+        num_workers: int,
+        cache_dir: str,
+    ) -> Dict[str, Path]:
+        logger.info(f"Encoding and saving dataset to: {cache_dir}")
+        logger.info(f"Number of workers: {num_workers} | EOS token: {use_eos_token} | Streaming: True")
+
+        mapping_fn, mapping_fn_kwargs = FastHfDatasetProvider._get_mapping_fn(
+            tokenizer, mapping_fn, mapping_fn_kwargs, mapping_column_name, use_eos_token, dtype
+        )
+        cache_files = process_with_streaming(
+            dataset_dict, cache_dir, dtype, mapping_fn, mapping_fn_kwargs, num_proc=num_workers
+        )
+
+        FastHfDatasetProvider._save_tokenizer(tokenizer, cache_dir)
+
+        return {f"{split}_file": cache_file for split, cache_file in cache_files.items()}
 
     @classmethod
     def from_disk(
@@ -188,6 +240,7 @@ class FastHfDatasetProvider(DatasetProvider):
         num_workers: Optional[int] = 1,
         use_eos_token: Optional[bool] = True,
         use_shared_memory: Optional[bool] = True,
+        use_streaming: Optional[bool] = False,
         cache_dir: Optional[str] = "cache",
     ) -> FastHfDatasetProvider:
         """Load a dataset provider by loading and encoding data from disk.
@@ -197,7 +250,9 @@ class FastHfDatasetProvider(DatasetProvider):
             tokenizer: Instance of tokenizer to use.
             tokenizer_name: Name of the tokenizer, if `tokenizer` has not been passed.
             mapping_fn: A function that maps the dataset. If not provided,
-                the default `tokenize_concatenated_dataset` function will be used.
+                the default `tokenize_concatenated_dataset` function will be used. Document
+                boundaries are given by its `document_lengths` output, or by its rows if it
+                does not return `document_lengths`.
             mapping_fn_kwargs: Keyword arguments to pass to `mapping_fn`.
             mapping_column_name: The columns in the dataset to be tokenized.
                 If `str`, only one column will be tokenized.
@@ -208,6 +263,8 @@ class FastHfDatasetProvider(DatasetProvider):
             num_workers: Number of workers to use for encoding.
             use_eos_token: Whether to use EOS token to separate sequences.
             use_shared_memory: Whether to use shared memory for caching.
+            use_streaming: Whether to encode and save the dataset in a single streaming pass,
+                with memory usage bounded by the size of a batch (`use_shared_memory` is ignored).
             cache_dir: Root path to the cache directory.
 
         Returns:
@@ -235,25 +292,38 @@ class FastHfDatasetProvider(DatasetProvider):
         # Ensure that `validation` and `test` splits are available
         disk_dataset_dict = FastHfDatasetProvider._create_splits(disk_dataset_dict, validation_split, shuffle, seed)
 
-        encoded_dataset_dict = FastHfDatasetProvider._encode_dataset(
-            disk_dataset_dict,
-            tokenizer,
-            mapping_fn,
-            mapping_fn_kwargs,
-            mapping_column_name,
-            use_eos_token,
-            dtype,
-            num_workers,
-        )
-        processed_dataset_dict = FastHfDatasetProvider._process_dataset_to_memory(
-            encoded_dataset_dict, cache_dir, dtype, num_workers, use_shared_memory
-        )
+        if use_streaming:
+            cache_files = FastHfDatasetProvider._encode_and_save_dataset_with_streaming(
+                disk_dataset_dict,
+                tokenizer,
+                mapping_fn,
+                mapping_fn_kwargs,
+                mapping_column_name,
+                use_eos_token,
+                dtype,
+                num_workers,
+                cache_dir,
+            )
+        else:
+            encoded_dataset_dict = FastHfDatasetProvider._encode_dataset(
+                disk_dataset_dict,
+                tokenizer,
+                mapping_fn,
+                mapping_fn_kwargs,
+                mapping_column_name,
+                use_eos_token,
+                dtype,
+                num_workers,
+            )
+            processed_dataset_dict = FastHfDatasetProvider._process_dataset_to_memory(
+                encoded_dataset_dict, cache_dir, dtype, num_workers, use_shared_memory
+            )
 
-        cache_files = FastHfDatasetProvider._save_dataset(
-            processed_dataset_dict, tokenizer, cache_dir, use_shared_memory
-        )
+            cache_files = FastHfDatasetProvider._save_dataset(
+                processed_dataset_dict, encoded_dataset_dict, tokenizer, cache_dir, use_shared_memory
+            )
 
-        FastHfDatasetProvider._close_mem_maps(processed_dataset_dict)
+            FastHfDatasetProvider._close_mem_maps(processed_dataset_dict)
 
         with open(cache_dir / "config.json", "w") as f:
             json.dump(
@@ -292,6 +362,7 @@ class FastHfDatasetProvider(DatasetProvider):
         num_workers: Optional[int] = 1,
         use_eos_token: Optional[bool] = True,
         use_shared_memory: Optional[bool] = True,
+        use_streaming: Optional[bool] = False,
         cache_dir: Optional[str] = "cache",
     ) -> FastHfDatasetProvider:
         """Load a dataset provider by downloading and encoding data from Hugging Face Hub.
@@ -304,7 +375,9 @@ class FastHfDatasetProvider(DatasetProvider):
             tokenizer: Instance of tokenizer to use.
             tokenizer_name: Name of the tokenizer, if `tokenizer` has not been passed.
             mapping_fn: A function that maps the dataset. If not provided,
-                the default `tokenize_concatenated_dataset` function will be used.
+                the default `tokenize_concatenated_dataset` function will be used. Document
+                boundaries are given by its `document_lengths` output, or by its rows if it
+                does not return `document_lengths`.
             mapping_fn_kwargs: Keyword arguments to pass to `mapping_fn`.
             mapping_column_name: The columns in the dataset to be tokenized.
                 If `str`, only one column will be tokenized.
@@ -315,6 +388,8 @@ class FastHfDatasetProvider(DatasetProvider):
             num_workers: Number of workers to use for encoding.
             use_eos_token: Whether to use EOS token to separate sequences.
             use_shared_memory: Whether to use shared memory for caching.
+            use_streaming: Whether to encode and save the dataset in a single streaming pass,
+                with memory usage bounded by the size of a batch (`use_shared_memory` is ignored).
             cache_dir: Root path to the cache directory.
 
         Returns:
@@ -344,25 +419,38 @@ class FastHfDatasetProvider(DatasetProvider):
         # Ensure that `validation` and `test` splits are available
         hub_dataset_dict = FastHfDatasetProvider._create_splits(hub_dataset_dict, validation_split, shuffle, seed)
 
-        encoded_dataset_dict = FastHfDatasetProvider._encode_dataset(
-            hub_dataset_dict,
-            tokenizer,
-            mapping_fn,
-            mapping_fn_kwargs,
-            mapping_column_name,
-            use_eos_token,
-            dtype,
-            num_workers,
-        )
-        processed_dataset_dict = FastHfDatasetProvider._process_dataset_to_memory(
-            encoded_dataset_dict, cache_dir, dtype, num_workers, use_shared_memory
-        )
+        if use_streaming:
+            cache_files = FastHfDatasetProvider._encode_and_save_dataset_with_streaming(
+                hub_dataset_dict,
+                tokenizer,
+                mapping_fn,
+                mapping_fn_kwargs,
+                mapping_column_name,
+                use_eos_token,
+                dtype,
+                num_workers,
+                cache_dir,
+            )
+        else:
+            encoded_dataset_dict = FastHfDatasetProvider._encode_dataset(
+                hub_dataset_dict,
+                tokenizer,
+                mapping_fn,
+                mapping_fn_kwargs,
+                mapping_column_name,
+                use_eos_token,
+                dtype,
+                num_workers,
+            )
+            processed_dataset_dict = FastHfDatasetProvider._process_dataset_to_memory(
+                encoded_dataset_dict, cache_dir, dtype, num_workers, use_shared_memory
+            )
 
-        cache_files = FastHfDatasetProvider._save_dataset(
-            processed_dataset_dict, tokenizer, cache_dir, use_shared_memory
-        )
+            cache_files = FastHfDatasetProvider._save_dataset(
+                processed_dataset_dict, encoded_dataset_dict, tokenizer, cache_dir, use_shared_memory
+            )
 
-        FastHfDatasetProvider._close_mem_maps(processed_dataset_dict)
+            FastHfDatasetProvider._close_mem_maps(processed_dataset_dict)
 
         with open(cache_dir / "config.json", "w") as f:
             json.dump(
@@ -415,23 +503,72 @@ class FastHfDatasetProvider(DatasetProvider):
 
         return FastHfDatasetProvider(cache_train_file, cache_validation_file, cache_test_file, tokenizer=tokenizer)
 
+    def _load_dataset(self, file_path: str, seq_len: int, use_document_boundaries: bool) -> FastHfDataset:
+        input_ids = np.load(file_path, mmap_mode=self.mmap_mode)
+
+        document_offsets = None
+        if use_document_boundaries:
+            offsets_file_path = Path(file_path).with_name(f"{Path(file_path).stem}_offsets.npy")
+            if not offsets_file_path.exists():
+                raise FileNotFoundError(f"Document boundaries are not available: {offsets_file_path}")
+
+            document_offsets = np.load(offsets_file_path)
+
+        return FastHfDataset(input_ids, seq_len=seq_len, document_offsets=document_offsets)
+
     @overrides
-    def get_train_dataset(self, seq_len: Optional[int] = 1) -> FastHfDataset:
-        input_ids = np.load(self.train_file, mmap_mode=self.mmap_mode)
+    def get_train_dataset(
+        self, seq_len: Optional[int] = 1, use_document_boundaries: Optional[bool] = False
+    ) -> FastHfDataset:
+        """Get the training dataset.
+
+        Args:
+            seq_len: Sequence length.
+            use_document_boundaries: Whether labels that cross the boundary of packed
+                documents should be ignored.
+
+        Returns:
+            Training dataset.
+
+        """
 
-        return FastHfDataset(input_ids, seq_len=seq_len)
+        return self._load_dataset(self.train_file, seq_len, use_document_boundaries)
 
     @overrides
-    def get_val_dataset(self, seq_len: Optional[int] = 1) -> FastHfDataset:
-        input_ids = np.load(self.validation_file, mmap_mode=self.mmap_mode)
+    def get_val_dataset(
+        self, seq_len: Optional[int] = 1, use_document_boundaries: Optional[bool] = False
+    ) -> FastHfDataset:
+        """Get the validation dataset.
+
+        Args:
+            seq_len: Sequence length.
+            use_document_boundaries: Whether labels that cross the boundary of packed
+                documents should be ignored.
 
-        return FastHfDataset(input_ids, seq_len=seq_len)
+        Returns:
+            Validation dataset.
+
+        """
+
+        return self._load_dataset(self.validation_file, seq_len, use_document_boundaries)
 
     @overrides
-    def get_test_dataset(self, seq_len: Optional[int] = 1) -> FastHfDataset:
-        input_ids = np.load(self.test_file, mmap_mode=self.mmap_mode)
+    def get_test_dataset(
+        self, seq_len: Optional[int] = 1, use_document_boundaries: Optional[bool] = False
+    ) -> FastHfDataset:
+        """Get the testing dataset.
+
+        Args:
+            seq_len: Sequence length.
+            use_document_boundaries: Whether labels that cross the boundary of packed
+                documents should be ignored.
+
+        Returns:
+            Testing dataset.
+
+        """
 
-        return FastHfDataset(input_ids, seq_len=seq_len)
+        return self._load_dataset(self.test_file, seq_len, use_document_boundaries)
 
 
 @dataclass
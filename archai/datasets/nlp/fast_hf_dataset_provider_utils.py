@@ -9,12 +9,17 @@ from __future__ import annotations
 
 import math
 import mmap
+import os
 import sys
-from typing import Any, Dict, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from types import TracebackType
 
 import numpy as np
 import torch
+from datasets import Dataset as HfDataset
 from datasets.dataset_dict import DatasetDict
 from torch.utils.data import Dataset
 
@@ -24,14 +29,24 @@ if sys.version_info.major == 3 and sys.version_info.minor >= 8:
 
 
 class FastHfDataset(Dataset):
-    """Fast Hugging Face dataset."""
+    """Fast Hugging Face dataset.
 
-    def __init__(self, input_ids: torch.Tensor, seq_len: Optional[int] = 1) -> None:
+    Besides indexing single sequences, the dataset implements `__getitems__`, which is used by
+    `torch.utils.data.DataLoader` to fetch a whole batch of sequences with a single vectorized
+    indexing over the (memory-mapped) inputs and a single conversion to `int64`.
+
+    """
+
+    def __init__(
+        self, input_ids: torch.Tensor, seq_len: Optional[int] = 1, document_offsets: Optional[np.ndarray] = None
+    ) -> None:
         """Initialize the dataset.
 
         Args:
             input_ids: Tensor with the inputs (encoded data).
             seq_len: Sequence length.
+            document_offsets: End offsets of the documents packed in `input_ids`. If given, labels
+                that belong to a different document than their inputs are ignored (set to -100).
 
         """
 
@@ -43,6 +58,8 @@ class FastHfDataset(Dataset):
         # `input_ids` should not be sliced since they could be memory mapped
         self.input_ids = input_ids
         self.n_sequences = math.ceil((self.n_input_ids - 1) / self.seq_len)
+
+        self.document_offsets = np.asarray(document_offsets) if document_offsets is not None else None
     
     def __enter__(self):
         return self
@@ -54,15 +71,38 @@ class FastHfDataset(Dataset):
     def __len__(self) -> int:
         return self.n_sequences
 
+    def _mask_document_boundaries(self, positions: np.ndarray, labels: torch.Tensor) -> torch.Tensor:
+        # Documents are identified by the number of document offsets up to each position
+        document_ids = np.searchsorted(self.document_offsets, positions, side="right")
+        is_boundary = torch.from_numpy(document_ids[..., 1:] != document_ids[..., :-1])
+
+        return labels.masked_fill(is_boundary, -100)
+
     def __getitem__(self, idx: int) -> Tuple[torch.Tensor, torch.Tensor]:
         start_idx = idx * self.seq_len
         seq_len = min(self.seq_len, self.n_input_ids - 1 - start_idx)
 
         input_ids = torch.as_tensor(self.input_ids[start_idx : (start_idx + seq_len + 1)].astype(np.int64))
-        labels = input_ids[1:].clone()
+        labels = input_ids[1:]
+
+        if self.document_offsets is not None:
+            labels = self._mask_document_boundaries(np.arange(start_idx, start_idx + seq_len + 1), labels)
 
         return input_ids[:-1], labels
 
+    def __getitems__(self, indices: List[int]) -> List[Tuple[torch.Tensor, torch.Tensor]]:
+        # All sequences have `seq_len` tokens, since the inputs are trimmed to a multiple of `seq_len`
+        positions = np.asarray(indices, dtype=np.int64)[:, None] * self.seq_len + np.arange(self.seq_len + 1)
+
+        input_ids = torch.from_numpy(self.input_ids[positions].astype(np.int64))
+        labels = input_ids[:, 1:]
+
+        if self.document_offsets is not None:
+            labels = self._mask_document_boundaries(positions, labels)
+
+        # Samples are views of the batch, which avoids copying each sequence
+        return list(zip(input_ids[:, :-1], labels))
+
 
 class SHMArray(np.ndarray):
     """Numpy array compatible with SharedMemory from `multiprocessing.shared_memory`.
@@ -85,6 +125,38 @@ class SHMArray(np.ndarray):
         self.shm = getattr(obj, "shm", None)
 
 
+def _get_document_lengths(lengths: List[int], document_lengths: Optional[List[List[int]]] = None) -> np.ndarray:
+    # Rows of concatenated examples hold several documents, which are described by `document_lengths`
+    if document_lengths is None:
+        return np.asarray(lengths, dtype=np.int64)
+
+    document_lengths = np.fromiter(chain.from_iterable(document_lengths), dtype=np.int64)
+    assert document_lengths.sum() == sum(lengths), "`document_lengths` should sum up to the length of the rows."
+
+    return document_lengths
+
+
+def get_document_offsets(encoded_dataset: HfDataset) -> np.ndarray:
+    """Get the end offsets of the documents of an encoded dataset.
+
+    If the mapping function concatenates examples, it should return their lengths in
+    a `document_lengths` column, otherwise each row is considered as a document.
+
+    Args:
+        encoded_dataset: Encoded dataset with `length` (and optionally `document_lengths`) columns.
+
+    Returns:
+        End offsets of the documents.
+
+    """
+
+    document_lengths = None
+    if "document_lengths" in encoded_dataset.column_names:
+        document_lengths = encoded_dataset["document_lengths"]
+
+    return np.cumsum(_get_document_lengths(encoded_dataset["length"], document_lengths))
+
+
 def process_with_shared_memory(
     dataset_dict: DatasetDict, dtype: np.dtype, num_proc: Optional[int] = 1
 ) -> Dict[str, SHMArray]:
@@ -181,6 +253,144 @@ def process_with_memory_map_files(
     return processed_dataset_dict
 
 
+def _process_shard_with_streaming(
+    dataset: HfDataset,
+    file_path: Path,
+    dtype: np.dtype,
+    mapping_fn: Callable[[Any], Dict[str, Any]],
+    mapping_fn_kwargs: Dict[str, Any],
+    batch_size: int,
+) -> int:
+    n_input_ids = 0
+
+    # Tokens and the end offset of each encoded document are appended sequentially to the files
+    with open(file_path, "wb") as f, open(file_path.with_suffix(".offsets"), "wb") as offsets_f:
+        for batch_start_idx in range(0, len(dataset), batch_size):
+            examples = dataset[batch_start_idx : batch_start_idx + batch_size]
+            encoded_examples = mapping_fn(examples, **mapping_fn_kwargs)
+
+            lengths = []
+            for input_ids in encoded_examples["input_ids"]:
+                input_ids = np.asarray(input_ids, dtype=dtype)
+                f.write(input_ids.tobytes())
+                lengths.append(len(input_ids))
+
+            document_lengths = _get_document_lengths(lengths, encoded_examples.get("document_lengths", None))
+            offsets_f.write((n_input_ids + np.cumsum(document_lengths)).tobytes())
+            n_input_ids += sum(lengths)
+
+    return n_input_ids
+
+
+def _get_streaming_shard(dataset: HfDataset, n_shards: int, index: int) -> HfDataset:
+    if n_shards == 1:
+        return dataset
+
+    shard = dataset.shard(n_shards, index, contiguous=True)
+
+    # Slices of in-memory tables are pickled with the whole table, so their shards are copied
+    if not dataset.cache_files:
+        shard = shard.flatten_indices(keep_in_memory=True)
+
+    return shard
+
+
+def _concatenate_files(
+    file_paths: List[Path], output_path: Path, dtype: np.dtype, offsets: Optional[List[int]] = None
+) -> None:
+    sizes = [os.path.getsize(file_path) // np.dtype(dtype).itemsize for file_path in file_paths]
+    offsets = offsets or [0] * len(file_paths)
+
+    output = np.lib.format.open_memmap(output_path, mode="w+", dtype=dtype, shape=(sum(sizes),))
+
+    # Files are copied in chunks, shifting their values by the given offsets
+    chunk_size = 2**24
+    start_idx = 0
+    for file_path, size, offset in zip(file_paths, sizes, offsets):
+        for chunk_idx in range(0, size, chunk_size):
+            count = min(chunk_size, size - chunk_idx)
+            chunk = np.fromfile(file_path, dtype=dtype, count=count, offset=chunk_idx * output.itemsize)
+
+            output[start_idx + chunk_idx : start_idx + chunk_idx + count] = chunk + offset if offset else chunk
+
+        start_idx += size
+        file_path.unlink()
+
+    output.flush()
+    del output
+
+
+def process_with_streaming(
+    dataset_dict: DatasetDict,
+    cache_dir: Path,
+    dtype: np.dtype,
+    mapping_fn: Callable[[Any], Dict[str, Any]],
+    mapping_fn_kwargs: Dict[str, Any],
+    num_proc: Optional[int] = 1,
+    batch_size: Optional[int] = 1000,
+) -> Dict[str, Path]:
+    """Encode the dataset and save it to the cache in a single streaming pass.
+
+    Each split is divided into `num_proc` contiguous shards. Each shard is encoded in batches
+    by a single process, which appends the tokens and the end offsets of the documents to
+    its own files. Finally, the files are concatenated into `{split}.npy` and `{split}_offsets.npy`.
+    Memory usage is bounded by the size of a batch, regardless of the size of the dataset.
+
+    Processes only receive their own shard: memory-mapped datasets are sent as references
+    to their cache files, and in-memory datasets as a copy of the shard.
+
+    Args:
+        dataset_dict: Dataset dictionary (not encoded).
+        cache_dir: Cache directory.
+        dtype: Numpy data type.
+        mapping_fn: Function that encodes a batch of examples into a dictionary with `input_ids`,
+            and optionally `document_lengths` if it concatenates the examples.
+        mapping_fn_kwargs: Keyword arguments to pass to `mapping_fn`.
+        num_proc: Number of processes.
+        batch_size: Number of examples encoded at once.
+
+    Returns:
+        Dictionary with the paths to the encoded datasets.
+
+    """
+
+    cache_files = {}
+    for split, dataset in dataset_dict.items():
+        n_shards = max(min(num_proc, len(dataset)), 1)
+        shard_paths = [cache_dir / f"{split}_{i}.bin" for i in range(n_shards)]
+
+        jobs = [
+            (
+                _get_streaming_shard(dataset, n_shards, i),
+                shard_path,
+                dtype,
+                mapping_fn,
+                mapping_fn_kwargs,
+                batch_size,
+            )
+            for i, shard_path in enumerate(shard_paths)
+        ]
+
+        if n_shards > 1:
+            with ProcessPoolExecutor(max_workers=n_shards) as executor:
+                n_input_ids = list(executor.map(_process_shard_with_streaming, *zip(*jobs)))
+        else:
+            n_input_ids = [_process_shard_with_streaming(*job) for job in jobs]
+
+        shard_offsets = np.cumsum([0] + n_input_ids[:-1]).tolist()
+        _concatenate_files(shard_paths, cache_dir / f"{split}.npy", dtype)
+        _concatenate_files(
+            [shard_path.with_suffix(".offsets") for shard_path in shard_paths],
+            cache_dir / f"{split}_offsets.npy",
+            np.int64,
+            shard_offsets,
+        )
+
+        cache_files[split] = cache_dir / f"{split}.npy"
+
+    return cache_files
+
+
 def xor(p: Any, q: Any) -> bool:
     """Implements the logical XOR operator.
 
@@ -78,6 +78,7 @@ def tokenize_concatenated_dataset(
     mapping_column_name: Optional[List[str]] = None,
     use_eos_token: Optional[bool] = False,
     dtype: Optional[np.dtype] = None,
+    return_document_lengths: Optional[bool] = False,
 ) -> Dict[str, Any]:
     """Tokenize a list of examples using a specified tokenizer and
     with concatenated batches (no truncation nor padding).
@@ -88,6 +89,8 @@ def tokenize_concatenated_dataset(
         mapping_column_name: The columns in `examples` that should be tokenized.
         use_eos_token: Whether to append the EOS token to each example.
         dtype: Numpy data type of the tokenized examples.
+        return_document_lengths: Whether to return the number of tokens of each example
+            (`document_lengths`), since they are lost when concatenating the batch.
 
     Returns:
         Concatenated tokenized examples.
@@ -104,7 +107,11 @@ def tokenize_concatenated_dataset(
     )
     tokenized_examples = np.fromiter(chain(*examples["input_ids"]), dtype=dtype)
 
-    return {"input_ids": [tokenized_examples], "length": [len(tokenized_examples)]}
+    concatenated_examples = {"input_ids": [tokenized_examples], "length": [len(tokenized_examples)]}
+    if return_document_lengths:
+        concatenated_examples["document_lengths"] = [[len(input_ids) for input_ids in examples["input_ids"]]]
+
+    return concatenated_examples
 
 
 def tokenize_contiguous_dataset(
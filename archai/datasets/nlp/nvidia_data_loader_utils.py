@@ -2,7 +2,9 @@
 # Licensed under the Apache License, Version 2.0.
 # https://github.com/NVIDIA/DeepLearningExamples/blob/master/PyTorch/LanguageModeling/Transformer-XL/pytorch/data_utils.py
 
-from typing import Generator, Iterator, List, Optional, Tuple
+import queue
+import threading
+from typing import Any, Generator, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 import torch
@@ -12,11 +14,18 @@ from archai.datasets.nlp.tokenizer_utils.tokenizer_base import TokenizerBase
 
 
 class LMOrderedIterator:
-    """Iterator that provides contiguous batches of input tokens without padding."""
+    """Iterator that provides contiguous batches of input tokens without padding.
+
+    The input sequence is never copied: rolling, warmup batches and distributed chunking
+    are applied by index arithmetic when gathering each batch. This allows the iterator to
+    consume a read-only memory-mapped array (e.g., loaded from the `Corpus` cache) in place,
+    so that processes on the same node share the page cache instead of holding private copies.
+
+    """
 
     def __init__(
         self,
-        input_ids: torch.LongTensor,
+        input_ids: Union[torch.LongTensor, np.ndarray],
         bsz: int,
         bptt: int,
         device: Optional[torch.device] = None,
@@ -27,7 +36,7 @@ class LMOrderedIterator:
         """Initialize the iterator with the input sequence and batch parameters.
 
         Args:
-            input_ids: Input sequence of tokens.
+            input_ids: Input sequence of tokens, either a tensor or a (memory-mapped) array.
             bsz: Batch size.
             bptt: Sequence length (backpropagation through time).
             device: Device to place the iterator.
@@ -45,27 +54,39 @@ class LMOrderedIterator:
         self.warmup = warmup
         self.last_iter = None
 
+        if isinstance(input_ids, torch.Tensor):
+            input_ids = input_ids.cpu().numpy()
+
         # Divides cleanly the inputs into batches and trims the remaining elements
-        n_step = input_ids.size(0) // bsz
-        input_ids = input_ids[: n_step * bsz]
-        self.input_ids = input_ids.view(bsz, -1).contiguous()
-        if self.device.type != "cpu":
-            self.input_ids = self.input_ids.pin_memory()
+        n_step = input_ids.shape[0] // bsz
+        self.input_ids = input_ids[: n_step * bsz].reshape(bsz, -1)
 
-        # Creates warmup batches if memory is being used
+        # Warmup batches (if memory is being used) prepend the end of the previous row to each row
+        # (at most a full row is prepended)
+        self.warmup_elems = self.warmup_len = 0
         if mem_len and warmup:
             self.warmup_batches = (mem_len + bptt - 1) // bptt
             self.warmup_elems = self.warmup_batches * bptt
+            self.warmup_len = min(self.warmup_elems, n_step)
 
-            warmup_ids = self.input_ids.roll((self.warmup_elems, 1), (1, 0))[:, : self.warmup_elems]
-            self.input_ids = torch.cat((warmup_ids, self.input_ids), dim=-1)
-
-        # Chunks the inputs for distributed training (if available)
+        # Chunks the rows for distributed training (if available), following `torch.chunk`
         world_size = get_world_size()
         rank = get_rank()
-        self.input_ids = self.input_ids.chunk(world_size, dim=0)[rank]
+        chunk_size = (bsz + world_size - 1) // world_size
+        self.rows = np.arange(rank * chunk_size, min((rank + 1) * chunk_size, bsz))
 
-        self.n_batch = (self.input_ids.size(1) + self.bptt - 1) // self.bptt
+        # Length of each row (including warmup) and shift of each row applied by `roll`
+        self.row_len = n_step + self.warmup_len
+        self.shifts = np.zeros(len(self.rows), dtype=np.int64)
+
+        self.n_batch = (self.row_len + self.bptt - 1) // self.bptt
+
+        # Batches copied to a CUDA device are gathered into pinned memory staging buffers, which are
+        # alternated (as in `LMMultiFileIterator`), with the events that mark when their copies are complete
+        self.pin_memory = self.device.type == "cuda"
+        self._pinned_buffers = [None, None]
+        self._pinned_events = [None, None]
+        self._pinned_idx = 0
 
     def roll(self, seed: int) -> None:
         """Roll the data according to a random seed.
@@ -82,13 +103,44 @@ class LMOrderedIterator:
         rng = torch.Generator()
         rng.manual_seed(seed)
 
-        for i in range(self.input_ids.size(0)):
-            shift = torch.randint(0, self.input_ids.size(1), (1,), generator=rng)
+        for i in range(len(self.rows)):
+            shift = torch.randint(0, self.row_len, (1,), generator=rng).item()
+            self.shifts[i] = (self.shifts[i] + shift) % self.row_len
+
+    def _gather(self, start_idx: int, end_idx: int, out: Optional[torch.LongTensor] = None) -> torch.LongTensor:
+        n_step = self.input_ids.shape[1]
+
+        if not self.warmup_len and not self.shifts.any():
+            # Contiguous slice that does not need to gather indices
+            ids = self.input_ids[self.rows[0] : self.rows[-1] + 1, start_idx:end_idx]
+        else:
+            cols = (np.arange(start_idx, end_idx)[None, :] + self.shifts[:, None]) % self.row_len
+            is_warmup = cols < self.warmup_len
+
+            # Warmup elements are gathered from the end of the previous row
+            rows = np.where(is_warmup, (self.rows[:, None] - 1) % self.input_ids.shape[0], self.rows[:, None])
+            cols = np.where(is_warmup, (cols - self.warmup_elems) % n_step, cols - self.warmup_len)
 
-            row = self.input_ids[i, :]
-            row = torch.cat((row[shift:], row[:shift]))
+            ids = self.input_ids[rows, cols]
 
-            self.input_ids[i, :] = row
+        if out is None:
+            return torch.from_numpy(np.asarray(ids, dtype=np.int64).reshape(len(self.rows), -1))
+
+        # Tokens are cast while being written to `out`, without intermediate copies
+        out.numpy()[...] = ids
+
+        return out
+
+    def _get_pinned_buffer(self, numel: int) -> torch.LongTensor:
+        # Waits until the previous copy from the staging buffer is complete before overwriting it
+        idx = self._pinned_idx
+        if self._pinned_events[idx] is not None:
+            self._pinned_events[idx].synchronize()
+
+        if self._pinned_buffers[idx] is None or self._pinned_buffers[idx].numel() < numel:
+            self._pinned_buffers[idx] = torch.empty(numel, dtype=torch.long, pin_memory=True)
+
+        return self._pinned_buffers[idx]
 
     def get_batch(self, i: int, bptt: Optional[int] = None) -> Tuple[torch.LongTensor, torch.LongTensor, int, bool]:
         """Get a batch of `bptt` size.
@@ -105,13 +157,30 @@ class LMOrderedIterator:
         if bptt is None:
             bptt = self.bptt
 
-        seq_len = min(bptt, self.input_ids.size(1) - 1 - i)
+        seq_len = min(bptt, self.row_len - 1 - i)
 
         start_idx = max(0, i - self.ext_len)
         end_idx = i + seq_len
 
-        input_ids = self.input_ids[:, start_idx:end_idx].to(self.device, non_blocking=True)
-        labels = self.input_ids[:, i + 1 : i + 1 + seq_len].to(self.device, non_blocking=True)
+        if self.pin_memory:
+            n_rows = len(self.rows)
+            n_input_ids, n_labels = n_rows * (end_idx - start_idx), n_rows * seq_len
+            buffer = self._get_pinned_buffer(n_input_ids + n_labels)
+            input_ids_buffer = buffer[:n_input_ids].view(n_rows, -1)
+            labels_buffer = buffer[n_input_ids : n_input_ids + n_labels].view(n_rows, -1)
+
+            input_ids = self._gather(start_idx, end_idx, out=input_ids_buffer)
+            labels = self._gather(i + 1, i + 1 + seq_len, out=labels_buffer)
+
+            input_ids = input_ids.to(self.device, non_blocking=True)
+            labels = labels.to(self.device, non_blocking=True)
+
+            self._pinned_events[self._pinned_idx] = torch.cuda.Event()
+            self._pinned_events[self._pinned_idx].record()
+            self._pinned_idx = 1 - self._pinned_idx
+        else:
+            input_ids = self._gather(start_idx, end_idx).to(self.device)
+            labels = self._gather(i + 1, i + 1 + seq_len).to(self.device)
 
         warmup = True
         if self.mem_len and self.warmup:
@@ -142,7 +211,7 @@ class LMOrderedIterator:
         if start != 0:
             start += self.bptt
 
-        for i in range(start, self.input_ids.size(1) - 1, self.bptt):
+        for i in range(start, self.row_len - 1, self.bptt):
             self.last_iter = i
             yield self.get_batch(i)
 
@@ -186,7 +255,7 @@ class LMOrderedIterator:
             i += seq_len
 
             yield input_ids, labels, seq_len
-            if i >= self.input_ids.size(1) - 2:
+            if i >= self.row_len - 2:
                 break
 
     def __iter__(self) -> Generator[Tuple, None, None]:
@@ -210,6 +279,8 @@ class LMMultiFileIterator:
         ext_len: Optional[int] = 0,
         n_chunks: Optional[int] = 16,
         shuffle: Optional[bool] = False,
+        pin_memory: Optional[bool] = False,
+        prefetch: Optional[int] = 0,
     ) -> None:
         """Initialize by adding support to multi-file inputs and sharding files
             across GPUs, if distributed training is available.
@@ -224,6 +295,11 @@ class LMMultiFileIterator:
             ext_len: Length of extended context (for Transformer-XL).
             n_chunks: Number of chunks (to avoid out of memory).
             shuffle: Whether shuffling should be used.
+            pin_memory: Whether batches should be staged in pinned memory before being
+                copied to a CUDA device, which allows asynchronous copies. Two staging
+                buffers are alternated, so a batch is assembled while the previous one is copied.
+            prefetch: Number of batches assembled in advance by a background thread.
+                If 0, batches are assembled when requested.
 
         """
 
@@ -234,11 +310,18 @@ class LMMultiFileIterator:
         self.ext_len = ext_len
         self.n_chunks = n_chunks
         self.shuffle = shuffle
+        self.pin_memory = pin_memory and torch.device(device).type == "cuda"
+        self.prefetch = prefetch
         self.last_iter = None
 
         # For compatibility with LMOrderedIterator
         self.n_batch = -1
 
+        # Pinned memory staging buffers and the events that mark when their copies are complete
+        self._pinned_buffers = [None, None]
+        self._pinned_events = [None, None]
+        self._pinned_idx = 0
+
         # Divides self.paths into world-size chunks and picks chunk for corresponding rank
         world_size = get_world_size()
         rank = get_rank()
@@ -269,61 +352,73 @@ class LMMultiFileIterator:
 
         return sequences
 
-    def stream_iterator(self, iterator: Iterator) -> Generator[Tuple, None, None]:
+    def _to_device(
+        self, input_ids: torch.LongTensor, labels: torch.LongTensor
+    ) -> Tuple[torch.LongTensor, torch.LongTensor]:
+        if not self.pin_memory:
+            return input_ids.to(self.device).contiguous(), labels.to(self.device).contiguous()
+
+        # Waits until the previous copy from the staging buffer is complete before overwriting it
+        idx = self._pinned_idx
+        self._pinned_idx = 1 - idx
+        if self._pinned_events[idx] is not None:
+            self._pinned_events[idx].synchronize()
+
+        n_input_ids = input_ids.numel()
+        if self._pinned_buffers[idx] is None or self._pinned_buffers[idx].numel() < n_input_ids + labels.numel():
+            self._pinned_buffers[idx] = torch.empty(n_input_ids + labels.numel(), dtype=torch.long, pin_memory=True)
+
+        buffer = self._pinned_buffers[idx]
+        staged_input_ids = buffer[:n_input_ids].view(input_ids.shape).copy_(input_ids)
+        staged_labels = buffer[n_input_ids : n_input_ids + labels.numel()].view(labels.shape).copy_(labels)
+
+        input_ids = staged_input_ids.to(self.device, non_blocking=True)
+        labels = staged_labels.to(self.device, non_blocking=True)
+
+        self._pinned_events[idx] = torch.cuda.Event()
+        self._pinned_events[idx].record()
+
+        return input_ids, labels
+
+    def stream_iterator(self, input_ids: Union[torch.LongTensor, Iterator]) -> Generator[Tuple, None, None]:
         """Create a streaming-based iterator.
 
+        Each row of a batch is carved out of `bptt + 1` contiguous tokens, where the
+        first `bptt` tokens are the inputs and the last `bptt` tokens are the labels.
+        Inputs are also prefixed with the last `ext_len` input tokens of the same row
+        in the previous batches. Remaining tokens that do not fill a batch are dropped.
+
         Args:
-            iterator: Iterator with chunks of sequences.
+            input_ids: Chunk of sequences, either as a tensor or an iterator over tokens.
 
         Yields:
             Stream-based batch.
 
         """
 
-        input_ids = torch.LongTensor(self.bsz, self.bptt)
-        labels = torch.LongTensor(self.bsz, self.bptt)
+        if not isinstance(input_ids, torch.Tensor):
+            input_ids = torch.as_tensor([int(token) for token in input_ids], dtype=torch.long)
 
-        n_retain = 0
+        n_batch = input_ids.size(0) // (self.bsz * (self.bptt + 1))
+        if n_batch == 0:
+            return
 
-        while True:
-            # input_ids: [bsz x n_retain+bptt]
-            # labels: [bsz x bptt]
-            input_ids[:, n_retain:].fill_(-1)
-            labels.fill_(-1)
-
-            valid_batch = True
-            for i in range(self.bsz):
-                n_filled = 0
-                try:
-                    while n_filled < self.bptt:
-                        stream = torch.LongTensor([next(iterator) for _ in range(self.bptt + 1)])
-
-                        # Number of new tokens to be filled in
-                        n_tokens = min(len(stream) - 1, self.bptt - n_filled)
-
-                        # First n_tokens are retained from last batch
-                        input_ids[i, n_retain + n_filled : n_retain + n_filled + n_tokens] = stream[:n_tokens]
-                        labels[i, n_filled : n_filled + n_tokens] = stream[1 : n_tokens + 1]
-
-                        n_filled += n_tokens
-                except StopIteration:
-                    valid_batch = False
-                    break
+        # windows: [n_batch x bsz x bptt+1]
+        windows = input_ids[: n_batch * self.bsz * (self.bptt + 1)].view(n_batch, self.bsz, self.bptt + 1)
 
-            if not valid_batch:
-                return
+        # Inputs of each row across all batches, used to retain `ext_len` tokens of previous batches
+        # row_input_ids: [bsz x n_batch*bptt]
+        row_input_ids = windows[:, :, :-1].transpose(0, 1).reshape(self.bsz, -1)
 
-            input_ids = input_ids.to(self.device)
-            labels = labels.to(self.device)
+        for i in range(n_batch):
+            start_idx = max(0, i * self.bptt - self.ext_len)
+            end_idx = (i + 1) * self.bptt
 
-            yield input_ids, labels, self.bptt, True
+            input_ids, labels = self._to_device(row_input_ids[:, start_idx:end_idx], windows[i, :, 1:])
 
-            n_retain = min(input_ids.size(1), self.ext_len)
-            if n_retain > 0:
-                input_ids[:, :n_retain] = input_ids[:, -n_retain:]
-            input_ids.resize_(input_ids.size(0), n_retain + self.bptt)
+            yield input_ids, labels, self.bptt, True
 
-    def __iter__(self) -> Generator[Tuple, None, None]:
+    def _iter_batches(self) -> Generator[Tuple[int, Tuple], None, None]:
         if self.shuffle:
             np.random.shuffle(self.paths)
 
@@ -331,8 +426,54 @@ class LMMultiFileIterator:
             sequences = self.get_sequences(path)
             sequences_chunks = torch.chunk(sequences, self.n_chunks, 0)
 
-            for i in range(self.n_chunks):
-                iterator = iter(sequences_chunks[i])
-                for idx, batch in enumerate(self.stream_iterator(iterator)):
-                    yield batch
-                    self.last_iter = idx
+            for chunk in sequences_chunks:
+                for idx, batch in enumerate(self.stream_iterator(chunk)):
+                    yield idx, batch
+
+    def _put_prefetched_batch(self, batches: queue.Queue, stop_event: threading.Event, item: Any) -> bool:
+        while not stop_event.is_set():
+            try:
+                batches.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+
+        return False
+
+    def _produce_prefetched_batches(self, batches: queue.Queue, stop_event: threading.Event) -> None:
+        # Reads and encodes the files, and stages their batches until the iterator is stopped
+        try:
+            for item in self._iter_batches():
+                if not self._put_prefetched_batch(batches, stop_event, item):
+                    return
+            self._put_prefetched_batch(batches, stop_event, None)
+        except Exception as e:
+            self._put_prefetched_batch(batches, stop_event, e)
+
+    def _iter_prefetched_batches(self) -> Generator[Tuple[int, Tuple], None, None]:
+        batches = queue.Queue(maxsize=self.prefetch)
+        stop_event = threading.Event()
+
+        thread = threading.Thread(target=self._produce_prefetched_batches, args=(batches, stop_event), daemon=True)
+        thread.start()
+
+        try:
+            while True:
+                item = batches.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+
+                yield item
+        finally:
+            # Stops the background thread if the iterator is not exhausted
+            stop_event.set()
+            thread.join()
+
+    def __iter__(self) -> Generator[Tuple, None, None]:
+        batches = self._iter_prefetched_batches() if self.prefetch > 0 else self._iter_batches()
+
+        for idx, batch in batches:
+            yield batch
+            self.last_iter = idx
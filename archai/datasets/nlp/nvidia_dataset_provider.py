@@ -1,8 +1,9 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT license.
 
-from typing import List, Optional
+from typing import List, Optional, Union
 
+import numpy as np
 from overrides import overrides
 
 from archai.api.dataset_provider import DatasetProvider
@@ -21,6 +22,7 @@ class NvidiaDatasetProvider(DatasetProvider):
         vocab_type: Optional[str] = "gpt2",
         vocab_size: Optional[int] = None,
         refresh_cache: Optional[bool] = False,
+        num_workers: Optional[int] = 1,
     ) -> None:
         """Initialize NVIDIA dataset provider.
 
@@ -31,30 +33,48 @@ class NvidiaDatasetProvider(DatasetProvider):
             vocab_type: Type of vocabulary/tokenizer.
             vocab_size: Vocabulary size.
             refresh_cache: Whether cache should be refreshed.
+            num_workers: Number of worker processes used to encode the dataset files.
 
         """
 
         super().__init__()
 
         self.corpus = Corpus(
-            dataset_name, dataset_dir, cache_dir, vocab_type, vocab_size=vocab_size, refresh_cache=refresh_cache
+            dataset_name,
+            dataset_dir,
+            cache_dir,
+            vocab_type,
+            vocab_size=vocab_size,
+            refresh_cache=refresh_cache,
+            num_workers=num_workers,
         )
 
-        if not self.corpus.load():
-            self.corpus.train_and_encode()
+        # Every process checks the cache before it is cleared and encoded again
+        with sync_workers():
+            cache_loaded = self.corpus.load()
 
+        if not cache_loaded:
+            # The corpus is encoded into the cache by a single process, except for lm1b,
+            # which is not cached and is encoded by every process
             with sync_workers() as rank:
+                if rank == 0 or dataset_name == "lm1b":
+                    self.corpus.train_and_encode()
+
                 if rank == 0 and dataset_name != "lm1b":
                     self.corpus.save_cache()
 
+            # Replaces the encoded dataset of each process with the memory-mapped cache
+            if dataset_name != "lm1b":
+                self.corpus.load_cache()
+
     @overrides
-    def get_train_dataset(self) -> List[int]:
+    def get_train_dataset(self) -> Union[np.ndarray, List[str]]:
         return self.corpus.train
 
     @overrides
-    def get_val_dataset(self) -> List[int]:
+    def get_val_dataset(self) -> np.ndarray:
         return self.corpus.valid
 
     @overrides
-    def get_test_dataset(self) -> List[int]:
+    def get_test_dataset(self) -> np.ndarray:
         return self.corpus.test
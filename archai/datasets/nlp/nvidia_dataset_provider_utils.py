@@ -2,6 +2,8 @@
 # Licensed under the MIT license.
 
 import glob
+import hashlib
+import json
 import os
 from typing import Optional, Tuple
 
@@ -37,6 +39,7 @@ class Corpus:
         vocab_type: str,
         vocab_size: Optional[int] = None,
         refresh_cache: Optional[bool] = False,
+        num_workers: Optional[int] = 1,
     ) -> None:
         """Initialize the `Corpus` class by defining attributes and creating
         cache-related paths.
@@ -49,6 +52,7 @@ class Corpus:
                 Valid options are `word`, `bbpe`, `gpt2`, or `bpe`.
             vocab_size: Vocabulary size.
             refresh_cache: Whether to refresh the cache.
+            num_workers: Number of worker processes used to encode the dataset files.
 
         """
 
@@ -56,16 +60,18 @@ class Corpus:
         self.dataset_dir = dataset_dir
         self.vocab_type = vocab_type
         self.vocab_size = vocab_size
+        self.num_workers = num_workers
 
         # Corpus cache is created using dataset/vocab_type/vocab_size path
         self.corpus_cache_dir = get_full_path(
             os.path.join(cache_dir, str(dataset_name), str(vocab_type), str(vocab_size)), create_folder=True
         )
 
-        # Encoded dataset (.npy files) cache paths
+        # Encoded dataset (.npy files) and its header (vocabulary hash and data type) cache paths
         self.train_cache_filepath = os.path.join(self.corpus_cache_dir, "train.npy")
         self.valid_cache_filepath = os.path.join(self.corpus_cache_dir, "valid.npy")
         self.test_cache_filepath = os.path.join(self.corpus_cache_dir, "test.npy")
+        self.cache_info_filepath = os.path.join(self.corpus_cache_dir, "cache_info.json")
 
         # Tokenizer-related files cache paths
         self.vocab_cache_dir = os.path.join(self.corpus_cache_dir, "vocab")
@@ -78,7 +84,11 @@ class Corpus:
 
     @staticmethod
     def _create_vocab(
-        dataset_name: str, vocab_type: str, vocab_cache_dir: str, vocab_size: Optional[int] = None
+        dataset_name: str,
+        vocab_type: str,
+        vocab_cache_dir: str,
+        vocab_size: Optional[int] = None,
+        num_workers: Optional[int] = 1,
     ) -> TokenizerBase:
         if vocab_type == "word":
             bos_token, eos_token, lower_case = None, "<eos>", False
@@ -100,6 +110,7 @@ class Corpus:
                 bos_token=bos_token,
                 eos_token=eos_token,
                 lower_case=lower_case,
+                num_workers=num_workers,
             )
 
         elif vocab_type == "bbpe":
@@ -117,6 +128,13 @@ class Corpus:
     def _clear_cache(self) -> None:
         self.train = self.valid = self.test = self.vocab = None
 
+    def _get_vocab_hash(self) -> str:
+        tokens = [self.vocab.id_to_token(i) for i in range(len(self.vocab))]
+        return hashlib.sha1(json.dumps(tokens).encode("utf-8")).hexdigest()
+
+    def _get_cache_dtype(self) -> np.dtype:
+        return np.dtype(np.uint16) if len(self.vocab) <= 2**16 else np.dtype(np.uint32)
+
     def _dataset_filepaths(self) -> Tuple[str, str, str]:
         train_file_name, valid_file_name, test_file_name = "train.txt", "valid.txt", "test.txt"
         if self.dataset_name in ["wt2", "wt103"]:
@@ -163,25 +181,57 @@ class Corpus:
 
     def _create_train_vocab(self) -> TokenizerBase:
         self.vocab = Corpus._create_vocab(
-            self.dataset_name, self.vocab_type, self.vocab_cache_dir, vocab_size=self.vocab_size
+            self.dataset_name,
+            self.vocab_type,
+            self.vocab_cache_dir,
+            vocab_size=self.vocab_size,
+            num_workers=self.num_workers,
         )
         self._train_vocab()
 
         return self.vocab
 
+    def _create_vocab_from_cache(self) -> TokenizerBase:
+        self.vocab = Corpus._create_vocab(
+            self.dataset_name,
+            self.vocab_type,
+            self.vocab_cache_dir,
+            vocab_size=self.vocab_size,
+            num_workers=self.num_workers,
+        )
+
+        return self.vocab
+
     def _encode_files(self) -> None:
         train_filepath, valid_filepath, test_filepath = self._dataset_filepaths()
 
+        # lm1b training files are encoded while loading batches, so its corpus is not cached
         if self.dataset_name == "lm1b":
             self.train = train_filepath
-        else:
-            self.train = self.vocab.encode_file(train_filepath)
+            self.valid = self.vocab.encode_file(valid_filepath, num_workers=self.num_workers)
+            self.test = self.vocab.encode_file(test_filepath, num_workers=self.num_workers)
+            return
 
-        self.valid = self.vocab.encode_file(valid_filepath)
-        self.test = self.vocab.encode_file(test_filepath)
+        # Tokens are encoded directly into the cache, so the corpus is never held in memory
+        dtype = self._get_cache_dtype()
+
+        self.train = self.vocab.encode_file(
+            train_filepath, num_workers=self.num_workers, output_path=self.train_cache_filepath, dtype=dtype
+        )
+        self.valid = self.vocab.encode_file(
+            valid_filepath, num_workers=self.num_workers, output_path=self.valid_cache_filepath, dtype=dtype
+        )
+        self.test = self.vocab.encode_file(
+            test_filepath, num_workers=self.num_workers, output_path=self.test_cache_filepath, dtype=dtype
+        )
 
     def train_and_encode(self) -> None:
-        """Train the vocabulary/tokenizer and encodes the corpus."""
+        """Train the vocabulary/tokenizer and encodes the corpus.
+
+        Apart from lm1b, the corpus is encoded into the cache files, which are only marked
+        as complete by `save_cache`.
+
+        """
 
         logger.info(
             f"Corpus: dataset = {self.dataset_name} | vocab_type = {self.vocab_type} | vocab_size = {self.vocab_size}"
@@ -190,8 +240,8 @@ class Corpus:
         self._create_train_vocab()
         self._encode_files()
 
-        train_size = f"{len(self.train)} files" if isinstance(self.train, list) else self.train.size(0)
-        logger.debug(f"Size: train = {train_size} | valid = {self.valid.size(0)} | test = {self.test.size(0)}")
+        train_size = f"{len(self.train)} files" if isinstance(self.train, list) else len(self.train)
+        logger.debug(f"Size: train = {train_size} | valid = {len(self.valid)} | test = {len(self.test)}")
 
     def load(self) -> bool:
         """Load a pre-trained corpus.
@@ -202,9 +252,7 @@ class Corpus:
         """
 
         # Ensures tokenizer cache is loaded as well
-        self.vocab = Corpus._create_vocab(
-            self.dataset_name, self.vocab_type, self.vocab_cache_dir, vocab_size=self.vocab_size
-        )
+        self._create_vocab_from_cache()
 
         cache_exists = (
             os.path.exists(self.train_cache_filepath)
@@ -218,15 +266,8 @@ class Corpus:
 
             self.vocab.load()
 
-            self.train = torch.from_numpy(np.load(self.train_cache_filepath))
-            self.valid = torch.from_numpy(np.load(self.valid_cache_filepath))
-            self.test = torch.from_numpy(np.load(self.test_cache_filepath))
-
-            logger.debug(
-                f"Size: train = {self.train.size(0)} | valid = {self.valid.size(0)} | test = {self.test.size(0)}"
-            )
-
-            return True
+            if self.load_cache():
+                return True
 
         logger.info("Clearing and rebuilding cache ...")
         self._clear_cache()
@@ -234,14 +275,67 @@ class Corpus:
         _delete_file(self.train_cache_filepath)
         _delete_file(self.valid_cache_filepath)
         _delete_file(self.test_cache_filepath)
+        _delete_file(self.cache_info_filepath)
 
         return False
 
+    def load_cache(self) -> bool:
+        """Load the encoded dataset from the cache as read-only memory-mapped arrays.
+
+        The arrays are not copied into the memory of the process, which allows every process
+        on the same node (e.g., distributed training ranks) to share the operating system's page cache.
+        Caches without a header (created by previous versions) are loaded without validation.
+        If the vocabulary has not been created, e.g., by processes that did not encode the corpus,
+        it is loaded from its cache.
+
+        Returns:
+            Whether the cache has been successfully loaded.
+
+        """
+
+        if not os.path.exists(self.train_cache_filepath):
+            return False
+
+        if self.vocab is None:
+            self._create_vocab_from_cache().load()
+
+        train = np.load(self.train_cache_filepath, mmap_mode="r")
+        valid = np.load(self.valid_cache_filepath, mmap_mode="r")
+        test = np.load(self.test_cache_filepath, mmap_mode="r")
+
+        if os.path.exists(self.cache_info_filepath):
+            with open(self.cache_info_filepath, "r") as f:
+                cache_info = json.load(f)
+
+            if cache_info["vocab_hash"] != self._get_vocab_hash():
+                logger.warn("Cache has been encoded with a different vocabulary.")
+                return False
+
+            if any(ids.dtype.name != cache_info["dtype"] for ids in [train, valid, test]):
+                logger.warn(f"Cache does not match its data type: {cache_info['dtype']}.")
+                return False
+
+        self.train, self.valid, self.test = train, valid, test
+
+        logger.debug(f"Size: train = {len(self.train)} | valid = {len(self.valid)} | test = {len(self.test)}")
+
+        return True
+
     def save_cache(self) -> None:
-        """Save the cache."""
+        """Save the cache header.
+
+        Tokens are encoded into the cache by `train_and_encode` with the smallest data type
+        (`uint16` or `uint32`) that holds the vocabulary, so only the header that identifies
+        the vocabulary used to encode them is saved. The header marks the cache as complete.
+
+        """
 
         assert self.vocab is not None and self.vocab.is_trained()
 
-        np.save(self.train_cache_filepath, self.train.numpy())
-        np.save(self.valid_cache_filepath, self.valid.numpy())
-        np.save(self.test_cache_filepath, self.test.numpy())
+        cache_info = {
+            "vocab_hash": self._get_vocab_hash(),
+            "dtype": self._get_cache_dtype().name,
+            "size": {"train": len(self.train), "valid": len(self.valid), "test": len(self.test)},
+        }
+        with open(self.cache_info_filepath, "w") as f:
+            json.dump(cache_info, f)
@@ -150,6 +150,16 @@ class BbpeTokenizer(TokenizerBase):
 
         return toks
 
+    @overrides
+    def encode_batch(self, texts: List[str]) -> List[List[int]]:
+        texts = [self._preprocess_text(text) for text in texts]
+        toks = self._tokenizer(texts, add_special_tokens=False)["input_ids"]
+
+        if self.encode_special_tokens:
+            toks = [self.bos_id + t + self.eos_id for t in toks]
+
+        return toks
+
     @overrides
     def decode_text(self, ids: List[int]) -> str:
         return self._tokenizer.decode(ids, skip_special_tokens=self.decode_special_tokens)
@@ -1,9 +1,16 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT license.
 
+import io
+import itertools
+import os
 from abc import abstractmethod
-from typing import List, Optional
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
+from tempfile import TemporaryDirectory
+from typing import Any, List, Optional, Tuple, Union
 
+import numpy as np
 import torch
 from overrides import EnforceOverrides
 
@@ -12,6 +19,19 @@ from archai.datasets.nlp.tokenizer_utils.token_config import SpecialTokenEnum
 
 logger = OrderedDictLogger(source=__name__)
 
+# Tokenizer used by the worker processes of `TokenizerBase._map_shards`
+_WORKER_TOKENIZER = None
+
+
+def _init_shard_worker(tokenizer: "TokenizerBase") -> None:
+    global _WORKER_TOKENIZER
+    _WORKER_TOKENIZER = tokenizer
+
+
+def _process_shard_in_worker(job: Tuple[str, Tuple]) -> Any:
+    method_name, args = job
+    return getattr(_WORKER_TOKENIZER, method_name)(*args)
+
 
 class TokenizerBase(EnforceOverrides):
     """Abstract class for tokenizers.
@@ -161,43 +181,181 @@ class TokenizerBase(EnforceOverrides):
 
         return [self.id_to_token(id) for id in ids]
 
-    def encode_file(self, path: str, verbose: Optional[bool] = True) -> torch.Tensor:
+    def encode_batch(self, texts: List[str]) -> List[List[int]]:
+        """Encode a batch of texts into tokens.
+
+        Tokenizers that support batched encoding should override this method,
+        which encodes each text with `encode_text` by default.
+
+        Args:
+            texts: The input texts to encode.
+
+        Returns:
+            The encoded texts (tokens).
+
+        """
+
+        return [self.encode_text(text) for text in texts]
+
+    def get_token_dtype(self) -> np.dtype:
+        """Get the smallest data type that holds the tokens' identifiers.
+
+        Returns:
+            The data type.
+
+        """
+
+        return np.min_scalar_type(max(len(self) - 1, 0))
+
+    def _get_shards(self, path: str, shard_size: int) -> List[Tuple[int, int]]:
+        file_size = os.path.getsize(path)
+        offsets = [0]
+
+        # Moves each shard boundary to the beginning of the next line
+        with open(path, "rb") as f:
+            while offsets[-1] + shard_size < file_size:
+                f.seek(offsets[-1] + shard_size)
+                f.readline()
+
+                offsets.append(f.tell())
+
+        offsets.append(file_size)
+
+        return [(start, end) for start, end in zip(offsets[:-1], offsets[1:]) if end > start]
+
+    def _map_shards(
+        self, method_name: str, jobs: List[Tuple], num_workers: Optional[int] = 1, verbose: Optional[bool] = True
+    ) -> List[Any]:
+        # Calls the method on each job, in worker processes that hold a copy of the tokenizer if needed
+        if num_workers > 1 and len(jobs) > 1:
+            executor = ProcessPoolExecutor(max_workers=num_workers, initializer=_init_shard_worker, initargs=(self,))
+
+            with executor:
+                return list(executor.map(_process_shard_in_worker, [(method_name, job) for job in jobs]))
+
+        results = []
+
+        for i, job in enumerate(jobs):
+            results.append(getattr(self, method_name)(*job))
+
+            if verbose and (i + 1) % 10 == 0:
+                logger.debug(f"Completed shard: {i + 1}/{len(jobs)}")
+
+        return results
+
+    def _read_shard(self, path: str, start: int, end: int) -> io.TextIOWrapper:
+        with open(path, "rb") as f:
+            f.seek(start)
+            return io.TextIOWrapper(io.BytesIO(f.read(end - start)), encoding="utf-8")
+
+    def _encode_lines(self, lines: List[str]) -> np.ndarray:
+        # Encodes lines read from a file, which can be overridden with a faster path for such lines
+        tokens = self.encode_batch(lines)
+        return np.fromiter(itertools.chain.from_iterable(tokens), dtype=self.get_token_dtype())
+
+    def _encode_shard(
+        self, path: str, start: int, end: int, batch_size: int, shard_path: Optional[str] = None
+    ) -> Union[np.ndarray, int]:
+        shard = self._read_shard(path, start, end)
+
+        dtype = self.get_token_dtype()
+        encoded = []
+
+        while True:
+            lines = list(itertools.islice(shard, batch_size))
+            if not lines:
+                break
+
+            encoded.append(self._encode_lines(lines))
+
+        encoded = np.concatenate(encoded) if encoded else np.empty(0, dtype=dtype)
+
+        if shard_path is None:
+            return encoded
+
+        encoded.tofile(shard_path)
+        return encoded.size
+
+    def encode_file(
+        self,
+        path: str,
+        verbose: Optional[bool] = True,
+        num_workers: Optional[int] = 1,
+        output_path: Optional[str] = None,
+        shard_size: Optional[int] = 2**24,
+        batch_size: Optional[int] = 1024,
+        dtype: Optional[np.dtype] = None,
+    ) -> Union[torch.Tensor, np.memmap]:
         """Encode text from an input file.
 
-        This method reads text from the specified file and encodes it using
-        the `encode_text` method. It also includes options for verbosity and
-        efficiently handling large datasets by converting the encoded tokens
-        to a `torch.Tensor` every 500k lines.
+        This method splits the specified file into shards of approximately `shard_size`
+        bytes at line boundaries, and encodes each shard with the `encode_batch` method,
+        optionally using a pool of worker processes. Tokens are stored with the smallest
+        data type that holds the vocabulary, and can be written to a memory-mapped `.npy`
+        file, so large datasets do not need to be kept in memory.
+
+        Note:
+            The number of tokens of each shard is only known after it is encoded, so when
+            `output_path` is given, shards are written to temporary files in the same directory
+            and copied once into the output file. This requires free disk space for twice the
+            size of the output, which avoids encoding the file twice (once to count tokens and
+            once to write them at their offsets).
 
         Args:
             path: The path to the input file.
             verbose: Whether to add verbosity to the logger.
+            num_workers: Number of worker processes used to encode the shards.
+            output_path: Path to a `.npy` file where the encoded tokens should be written.
+                If `None`, the encoded tokens are returned as a `torch.Tensor`.
+            shard_size: Approximate size (in bytes) of each shard.
+            batch_size: Number of lines encoded at once.
+            dtype: Data type of the tokens written to `output_path`. If `None`, uses the
+                smallest data type that holds the vocabulary.
 
         Returns:
-            The encoded tokens.
+            The encoded tokens, or a memory-mapped array with the encoded tokens if
+            `output_path` is given.
 
         """
 
         logger.info(f"Encoding file: {path}")
 
-        encoded = []
-        tensor_encoded = torch.LongTensor()
+        shards = self._get_shards(path, shard_size)
+        shard_dtype = self.get_token_dtype()
+
+        # When writing to a file, shards are stored in temporary files until the output size is known
+        tmp_dir_context = (
+            TemporaryDirectory(dir=os.path.dirname(os.path.abspath(output_path))) if output_path else nullcontext()
+        )
+
+        with tmp_dir_context as tmp_dir:
+            shard_paths = [os.path.join(tmp_dir, f"shard_{i}.bin") if output_path else None for i in range(len(shards))]
+            jobs = [(path, start, end, batch_size, shard_path) for (start, end), shard_path in zip(shards, shard_paths)]
+
+            results = self._map_shards("_encode_shard", jobs, num_workers=num_workers, verbose=verbose)
+
+            if output_path is None:
+                encoded = torch.empty(sum(r.size for r in results), dtype=torch.long)
+
+                # Shards are released once copied, so only one of them is held along with the output
+                offset = 0
+                for i, shard_encoded in enumerate(results):
+                    encoded[offset : offset + shard_encoded.size] = torch.from_numpy(shard_encoded.astype(np.int64))
+                    offset += shard_encoded.size
+                    results[i] = None
 
-        with open(path, "r", encoding="utf-8") as f:
-            for idx, line in enumerate(f):
-                # Converts to tensor.Tensor every 500k lines,
-                # otherwise Python list uses a lot of RAM
-                if idx > 0 and idx % 500000 == 0:
-                    tensor_encoded = torch.cat((tensor_encoded, torch.LongTensor(encoded)))
-                    encoded = []
+                return encoded
 
-                if verbose and idx > 0 and idx % 500000 == 0:
-                    logger.debug(f"Completed line: {format(idx)}")
+            # Copies the shards into the preallocated memory-mapped output
+            encoded = np.lib.format.open_memmap(
+                output_path, mode="w+", dtype=dtype if dtype is not None else shard_dtype, shape=(sum(results),)
+            )
 
-                tokens = self.encode_text(line)
-                encoded.extend(tokens)
+            offset = 0
+            for shard_path, n_tokens in zip(shard_paths, results):
+                encoded[offset : offset + n_tokens] = np.fromfile(shard_path, dtype=shard_dtype)
+                offset += n_tokens
 
-        if len(encoded) > 0:
-            tensor_encoded = torch.cat((tensor_encoded, torch.LongTensor(encoded)))
+            encoded.flush()
 
-        return tensor_encoded
+        return encoded
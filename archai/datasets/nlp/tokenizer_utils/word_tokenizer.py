@@ -1,10 +1,12 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT license.
 
+import itertools
 import os
 from collections import Counter, OrderedDict
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
+import numpy as np
 from overrides import overrides
 
 from archai.common.distributed_utils import sync_workers
@@ -34,6 +36,7 @@ class WordTokenizer(TokenizerBase):
         delimiter: Optional[str] = None,
         encode_special_tokens: Optional[bool] = True,
         decode_special_tokens: Optional[bool] = True,
+        num_workers: Optional[int] = 1,
     ):
         """Define the tokenization pipeline.
 
@@ -49,6 +52,7 @@ class WordTokenizer(TokenizerBase):
             delimiter: Delimiter between tokens.
             encode_special_tokens: Whether special tokens should be encoded.
             decode_special_tokens: Whether special tokens should be decoded.
+            num_workers: Number of worker processes used to count the tokens of the training files.
 
         """
 
@@ -75,6 +79,7 @@ class WordTokenizer(TokenizerBase):
         self.delimiter = delimiter
         self.encode_special_tokens = encode_special_tokens
         self.decode_special_tokens = decode_special_tokens
+        self.num_workers = num_workers
 
     @overrides
     def __len__(self) -> int:
@@ -129,14 +134,16 @@ class WordTokenizer(TokenizerBase):
 
     @overrides
     def encode_text(self, text: str) -> List[int]:
-        symbols = self._tokenize_text(text)
+        symbols = self._tokenize_lines([text], add_special_tokens=self.encode_special_tokens)
+        return self._symbols_to_array(symbols).tolist()
 
-        if self.encode_special_tokens:
-            symbols = self._bos + symbols + self._eos
-
-        toks = self.tokens_to_ids(symbols)
+    @overrides
+    def encode_batch(self, texts: List[str]) -> List[List[int]]:
+        symbols = self._tokenize_lines(texts, add_special_tokens=self.encode_special_tokens)
+        ids = self._symbols_to_array(symbols).tolist()
 
-        return toks
+        offsets = list(itertools.accumulate([len(line_symbols) for line_symbols in symbols], initial=0))
+        return [ids[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
 
     @overrides
     def decode_text(self, ids: List[int]) -> str:
@@ -163,11 +170,18 @@ class WordTokenizer(TokenizerBase):
 
     @overrides
     def tokens_to_ids(self, ts: List[str]) -> List[int]:
-        return [self._get_idx(t) for t in ts]
+        return list(map(self.sym2idx.get, ts, itertools.repeat(self.unk_idx)))
 
     @overrides
     def ids_to_tokens(self, ids: List[int]) -> List[str]:
-        return [self._get_sym(id) for id in ids]
+        ids = np.asarray(ids, dtype=np.int64)
+        assert ids.size == 0 or (ids.min() >= 0 and ids.max() < len(self)), "Index out of range."
+
+        # Array of symbols is re-created only when the vocabulary has changed
+        if len(self._sym_array) != len(self):
+            self._sym_array = np.array(self.idx2sym, dtype=object)
+
+        return self._sym_array[ids].tolist()
 
     def _preprocess_text(self, text: str) -> str:
         if self._config.add_prefix_space:
@@ -179,19 +193,60 @@ class WordTokenizer(TokenizerBase):
 
         return text
 
-    def _add_file(self, path: str, verbose: Optional[bool] = True) -> None:
+    def _add_file(self, path: str, verbose: Optional[bool] = True, shard_size: Optional[int] = 2**24) -> None:
         if verbose:
             logger.debug(f"Counting file: {path}")
 
         assert os.path.exists(path), f"File does not exist: {path}"
 
-        with open(path, "r", encoding="utf-8") as f:
-            for idx, line in enumerate(f):
-                if verbose and idx > 0 and idx % 500000 == 0:
-                    logger.debug(f"Completed line: {idx}")
+        # Counts blocks of lines in parallel and merges the counters in order,
+        # so that ties in `most_common` are broken as if the file was counted sequentially
+        jobs = [(path, start, end) for start, end in self._get_shards(path, shard_size)]
+        for counter in self._map_shards("_count_shard", jobs, num_workers=self.num_workers, verbose=verbose):
+            self.counter.update(counter)
+
+    def _count_shard(self, path: str, start: int, end: int) -> Counter:
+        shard = self._read_shard(path, start, end)
+
+        # Splitting the whole block is equivalent to splitting each line when delimiting on white space
+        if self.delimiter is None:
+            return Counter(self._tokenize_text(shard.read()))
+
+        return Counter(itertools.chain.from_iterable(self._tokenize_lines(shard)))
+
+    def _tokenize_lines(self, lines: Iterable[str], add_special_tokens: Optional[bool] = False) -> List[List[str]]:
+        if add_special_tokens:
+            return [self._bos + self._tokenize_text(line) + self._eos for line in lines]
+
+        return [self._tokenize_text(line) for line in lines]
+
+    def _symbols_to_array(self, symbols: List[List[str]]) -> np.ndarray:
+        # Maps the symbols of all lines at once with the vocabulary hash table
+        symbols = itertools.chain.from_iterable(symbols)
+        ids = list(map(self.sym2idx.get, symbols, itertools.repeat(self.unk_idx)))
 
-                symbols = self._tokenize_text(line)
-                self.counter.update(symbols)
+        return np.array(ids, dtype=self.get_token_dtype())
+
+    @overrides
+    def _encode_lines(self, lines: List[str]) -> np.ndarray:
+        if self.delimiter is not None or not lines:
+            return self._symbols_to_array(self._tokenize_lines(lines, add_special_tokens=self.encode_special_tokens))
+
+        # Lines are read from a file (by `_encode_shard`), so they only contain new line characters at their end,
+        # and when delimiting on white space, the whole block is split at once and special tokens are inserted
+        # in place of the new lines. Arbitrary texts should go through `encode_text` or `encode_batch` instead
+        text = self._preprocess_text("".join(lines))
+
+        if self.encode_special_tokens and (self._bos or self._eos):
+            if not text.endswith("\n"):
+                text += "\n"
+
+            separator = " ".join(["", *self._eos, *self._bos, ""])
+            symbols = (" ".join(["", *self._bos, ""]) + text.replace("\n", separator)).split()
+
+            return self._symbols_to_array([symbols[: len(symbols) - len(self._bos)]])
+
+        return self._symbols_to_array([text.split()])
 
     def _tokenize_text(self, text: str) -> List[str]:
         text = self._preprocess_text(text)
@@ -202,6 +257,7 @@ class WordTokenizer(TokenizerBase):
     def _clear(self) -> None:
         self.idx2sym = []
         self.sym2idx = OrderedDict()
+        self._sym_array = np.empty(0, dtype=object)
 
     def _vocab_filepath(self) -> str:
         vocab_dir = get_full_path(os.path.join(self.save_path), create_folder=True)
@@ -215,8 +271,7 @@ class WordTokenizer(TokenizerBase):
 
     def _add_special(self, sym: str) -> None:
         if sym not in self.sym2idx:
-            self.idx2sym.append(sym)
-            self.sym2idx[sym] = len(self.idx2sym) - 1
+            self._add_symbol(sym)
             setattr(self, "{}_idx".format(sym.strip("<>")), self.sym2idx[sym])
 
     def _add_symbol(self, sym: str) -> None:
@@ -6,3 +6,4 @@ from archai.discrete_search.algos.evolution_pareto import EvolutionParetoSearch
 from archai.discrete_search.algos.local_search import LocalSearch
 from archai.discrete_search.algos.random_search import RandomSearch
 from archai.discrete_search.algos.regularized_evolution import RegularizedEvolutionSearch
+from archai.discrete_search.algos.steady_state_evolution import SteadyStateEvolutionSearch
@@ -1,6 +1,7 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT license.
 
+from functools import partial
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -162,23 +163,18 @@ class MoBananasSearch(Searcher):
 
         mutations = {}
 
-        for p in parents:
-            candidates = {}
-            nb_tries = 0
-
-            while len(candidates) < mutations_per_parent and nb_tries < patience:
-                mutated_model = self.search_space.mutate(p)
-                mutated_model.metadata["parent"] = p.archid
-
-                if not self.so.is_model_valid(mutated_model):
-                    continue
-
-                if mutated_model.archid not in self.seen_archs:
-                    candidates[mutated_model.archid] = mutated_model
-
-                nb_tries += 1
+        # Mutations of all parents are validated together in batches
+        candidates = self.so.generate_valid_models(
+            [partial(self.search_space.mutate, p) for p in parents],
+            mutations_per_parent,
+            patience=patience,
+            exclude_archids=self.seen_archs,
+        )
 
-            mutations.update(candidates)
+        for p, p_candidates in zip(parents, candidates):
+            for m in p_candidates:
+                m.metadata["parent"] = p.archid
+                mutations[m.archid] = m
 
         if len(mutations) == 0:
             logger.warn(f"No mutations found after {patience} tries for each one of the {len(parents)} parents.")
@@ -278,7 +274,7 @@ class MoBananasSearch(Searcher):
             self.surrogate_model.fit(X, y)
 
             # Selects top-`num_parents` models from non-dominated sorted results
-            nds_frontiers = get_non_dominated_sorting(all_pop, self.search_state.all_evaluated_objs, self.so)
+            nds_frontiers = self.search_state.get_non_dominated_sorting()
             parents = [model for frontier in nds_frontiers for model in frontier["models"]]
             parents = parents[: self.num_parents]
 
@@ -307,6 +303,12 @@ class MoBananasSearch(Searcher):
 
             # Save plots and reports
             self.search_state.save_all_2d_pareto_evolution_plots(self.output_dir)
-            self.search_state.save_search_state(self.output_dir / f"search_state_{i}.csv")
+            self.search_state.checkpoint(self.output_dir / "search_state")
+
+        # Saves the complete search state after the last iteration
+        self.search_state.checkpoint(
+            self.output_dir / "search_state",
+            csv_file_path=str(self.output_dir / f"search_state_{self.search_state.iteration_num - 1}.csv"),
+        )
 
         return self.search_state
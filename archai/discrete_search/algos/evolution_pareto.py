@@ -2,11 +2,11 @@
 # Licensed under the MIT license.
 
 import random
+from functools import partial
 from pathlib import Path
 from typing import List, Optional
 
 from overrides import overrides
-from tqdm import tqdm
 
 from archai.common.ordered_dict_logger import OrderedDictLogger
 from archai.discrete_search.api.archai_model import ArchaiModel
@@ -139,22 +139,19 @@ class EvolutionParetoSearch(Searcher):
 
         mutations = {}
 
-        for p in tqdm(parents, desc="Mutating parents"):
-            candidates = {}
-            nb_tries = 0
+        # Mutations of all parents are validated together in batches
+        candidates = self.so.generate_valid_models(
+            [partial(self.search_space.mutate, p) for p in parents],
+            mutations_per_parent,
+            patience=patience,
+            exclude_archids=self.seen_archs,
+        )
 
-            while len(candidates) < mutations_per_parent and nb_tries < patience:
-                nb_tries += 1
-                mutated_model = self.search_space.mutate(p)
-                mutated_model.metadata["parent"] = p.archid
-
-                if not self.so.is_model_valid(mutated_model):
-                    continue
-
-                if mutated_model.archid not in self.seen_archs:
-                    mutated_model.metadata["generation"] = self.iter_num
-                    candidates[mutated_model.archid] = mutated_model
-            mutations.update(candidates)
+        for p, p_candidates in zip(parents, candidates):
+            for m in p_candidates:
+                m.metadata["parent"] = p.archid
+                m.metadata["generation"] = self.iter_num
+                mutations[m.archid] = m
 
         return list(mutations.values())
 
@@ -178,16 +175,18 @@ class EvolutionParetoSearch(Searcher):
 
         if len(parents) >= 2:
             pairs = [self.rng.sample(parents, 2) for _ in range(num_crossovers)]
-            for p1, p2 in pairs:
-                child = self.search_space.crossover([p1, p2])
-                nb_tries = 0
 
-                while not self.so.is_model_valid(child) and nb_tries < patience:
-                    child = self.search_space.crossover([p1, p2])
-                    nb_tries += 1
+            # Children of all pairs are validated together in batches
+            candidates = self.so.generate_valid_models(
+                [partial(self.search_space.crossover, [p1, p2]) for p1, p2 in pairs],
+                1,
+                patience=patience,
+                exclude_archids=self.seen_archs,
+            )
 
-                if child and self.so.is_model_valid(child):
-                    if child.archid not in children_ids and child.archid not in self.seen_archs:
+            for (p1, p2), pair_children in zip(pairs, candidates):
+                for child in pair_children:
+                    if child.archid not in children_ids:
                         child.metadata["generation"] = self.iter_num
                         child.metadata["parents"] = f"{p1.archid},{p2.archid}"
                         children.append(child)
@@ -264,8 +263,7 @@ class EvolutionParetoSearch(Searcher):
             logger.info(f"Found {len(pareto)} members.")
 
             # Saves search iteration results
-            # NOTE: There is a dependency on these file naming schemas on archai.common.notebook_helper
-            self.search_state.save_search_state(str(self.output_dir / f"search_state_{self.iter_num}.csv"))
+            self.search_state.checkpoint(self.output_dir / "search_state")
             self.search_state.save_pareto_frontier_models(
                 str(self.output_dir / f"pareto_models_iter_{self.iter_num}"),
                 save_weights=self.save_pareto_model_weights
@@ -305,4 +303,11 @@ class EvolutionParetoSearch(Searcher):
             # update the set of architectures ever visited
             self.all_pop.extend(unseen_pop)
 
+        # Saves the complete search state after the last iteration
+        # NOTE: There is a dependency on these file naming schemas on archai.common.notebook_helper
+        self.search_state.checkpoint(
+            self.output_dir / "search_state",
+            csv_file_path=str(self.output_dir / f"search_state_{self.search_state.iteration_num}.csv"),
+        )
+
         return self.search_state
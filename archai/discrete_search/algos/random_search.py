@@ -123,7 +123,7 @@ class RandomSearch(Searcher):
             logger.info(f"Found {len(pareto)} members.")
 
             # Saves search iteration results
-            self.search_state.save_search_state(str(self.output_dir / f"search_state_{self.iter_num}.csv"))
+            self.search_state.checkpoint(self.output_dir / "search_state")
             self.search_state.save_pareto_frontier_models(
                 str(self.output_dir / f"pareto_models_iter_{self.iter_num}"),
                 save_weights=self.save_pareto_model_weights
@@ -135,4 +135,10 @@ class RandomSearch(Searcher):
                 logger.info("Optimzing memory usage ...")
                 [model.clear() for model in unseen_pop]
 
+        # Saves the complete search state after the last iteration
+        self.search_state.checkpoint(
+            self.output_dir / "search_state",
+            csv_file_path=str(self.output_dir / f"search_state_{self.search_state.iteration_num}.csv"),
+        )
+
         return self.search_state
@@ -2,11 +2,11 @@
 # Licensed under the MIT license.
 
 import random
+from functools import partial
 from pathlib import Path
 from typing import List, Optional
 
 from overrides import overrides
-from tqdm import tqdm
 
 from archai.common.ordered_dict_logger import OrderedDictLogger
 from archai.discrete_search.api.archai_model import ArchaiModel
@@ -130,22 +130,19 @@ class RegularizedEvolutionSearch(Searcher):
 
         mutations = {}
 
-        for p in tqdm(parents, desc="Mutating parents"):
-            candidates = {}
-            nb_tries = 0
+        # Mutations of all parents are validated together in batches
+        candidates = self.so.generate_valid_models(
+            [partial(self.search_space.mutate, p) for p in parents],
+            mutations_per_parent,
+            patience=patience,
+            exclude_archids=self.seen_archs,
+        )
 
-            while len(candidates) < mutations_per_parent and nb_tries < patience:
-                mutated_model = self.search_space.mutate(p)
-                mutated_model.metadata["parent"] = p.archid
-
-                if not self.so.is_model_valid(mutated_model):
-                    continue
-
-                if mutated_model.archid not in self.seen_archs:
-                    mutated_model.metadata["generation"] = self.iter_num
-                    candidates[mutated_model.archid] = mutated_model
-                nb_tries += 1
-            mutations.update(candidates)
+        for p, p_candidates in zip(parents, candidates):
+            for m in p_candidates:
+                m.metadata["parent"] = p.archid
+                m.metadata["generation"] = self.iter_num
+                mutations[m.archid] = m
 
         return list(mutations.values())
 
@@ -187,7 +184,7 @@ class RegularizedEvolutionSearch(Searcher):
             self.seen_archs.update([m.archid for m in iter_members])
 
             # Saves search iteration results
-            self.search_state.save_search_state(str(self.output_dir / f"search_state_{self.iter_num}.csv"))
+            self.search_state.checkpoint(self.output_dir / "search_state")
             self.search_state.save_pareto_frontier_models(
                 str(self.output_dir / f"pareto_models_iter_{self.iter_num}"),
                 save_weights=self.save_pareto_model_weights
@@ -226,4 +223,10 @@ class RegularizedEvolutionSearch(Searcher):
             # update the set of architectures ever visited
             self.all_pop.extend(iter_members)
 
+        # Saves the complete search state after the last iteration
+        self.search_state.checkpoint(
+            self.output_dir / "search_state",
+            csv_file_path=str(self.output_dir / f"search_state_{self.search_state.iteration_num}.csv"),
+        )
+
         return self.search_state
@@ -0,0 +1,276 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT license.
+
+import random
+from functools import partial
+from pathlib import Path
+from typing import List, Optional
+
+from overrides import overrides
+
+from archai.common.ordered_dict_logger import OrderedDictLogger
+from archai.discrete_search.api.archai_model import ArchaiModel
+from archai.discrete_search.api.search_objectives import SearchObjectives
+from archai.discrete_search.api.search_results import SearchResults
+from archai.discrete_search.api.search_space import EvolutionarySearchSpace
+from archai.discrete_search.api.searcher import Searcher
+from archai.discrete_search.utils.multi_objective import get_pareto_frontier
+
+logger = OrderedDictLogger(source=__name__)
+
+
+class SteadyStateEvolutionSearch(Searcher):
+    """Asynchronous steady-state variant of the Regularized Evolution algorithm.
+
+    Instead of evaluating generations of models, it keeps `max_pending_models` models
+    being evaluated at all times. As soon as models are evaluated, new models are generated
+    by mutating Pareto frontier members of a sample of the most recently evaluated models,
+    and sent for evaluation. This keeps asynchronous evaluators (e.g., `RayParallelEvaluator`)
+    busy when evaluation times vary, instead of waiting for the slowest model of a generation.
+
+    Each batch of models fetched from `SearchObjectives.fetch_ready_objs` is stored as
+    a search iteration.
+
+    Reference:
+        https://arxiv.org/abs/1802.01548v7.
+
+    """
+
+    def __init__(
+        self,
+        search_space: EvolutionarySearchSpace,
+        search_objectives: SearchObjectives,
+        output_dir: str,
+        num_models: Optional[int] = 100,
+        max_pending_models: Optional[int] = 10,
+        init_num_models: Optional[int] = 10,
+        initial_population_paths: Optional[List[str]] = None,
+        pareto_sample_size: Optional[int] = 40,
+        history_size: Optional[int] = 100,
+        fetch_timeout: Optional[float] = None,
+        save_every: Optional[int] = 10,
+        clear_evaluated_models: Optional[bool] = True,
+        save_pareto_model_weights: bool = True,
+        seed: Optional[int] = 1,
+    ) -> None:
+        """Initialize the steady-state evolutionary search.
+
+        Args:
+            search_space: Discrete search space compatible with evolutionary algorithms.
+            search_objectives: Search objectives.
+            output_dir: Output directory.
+            num_models: Number of models to evaluate.
+            max_pending_models: Number of models being evaluated at the same time.
+            init_num_models: Number of initial models to evaluate.
+            initial_population_paths: Paths to initial population models.
+                If `None`, `init_num_models` random models are used.
+            pareto_sample_size: Number of models to sample from the history.
+            history_size: Number of most recently evaluated models that can be sampled.
+            fetch_timeout: Maximum time (in seconds) to wait for evaluation results
+                before checking again. If `None`, waits until a job is complete.
+            save_every: Number of evaluated models between saves of the search state.
+            clear_evaluated_models: Optimizes memory usage by clearing the architecture
+                of `ArchaiModel` after it is evaluated.
+            save_pareto_model_weights: If `True`, saves the weights of the pareto models.
+            seed: Random seed.
+
+        """
+
+        super(SteadyStateEvolutionSearch, self).__init__()
+
+        assert isinstance(
+            search_space, EvolutionarySearchSpace
+        ), f"{str(search_space.__class__)} is not compatible with {str(self.__class__)}"
+
+        self.search_space = search_space
+        self.so = search_objectives
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(exist_ok=True, parents=True)
+
+        # Algorithm settings
+        self.num_models = num_models
+        self.max_pending_models = max_pending_models
+        self.init_num_models = init_num_models
+        self.initial_population_paths = initial_population_paths
+        self.pareto_sample_size = pareto_sample_size
+        self.history_size = history_size
+        self.fetch_timeout = fetch_timeout
+
+        # Utils
+        self.save_every = save_every
+        self.clear_evaluated_models = clear_evaluated_models
+        self.save_pareto_model_weights = save_pareto_model_weights
+        self.search_state = SearchResults(search_space, self.so)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.seen_archs = set()
+        self.evaluated_models = []
+
+        assert self.num_models > 0
+        assert self.max_pending_models > 0
+        assert self.init_num_models > 0
+
+    def sample_models(self, num_models: int, patience: Optional[int] = 5) -> List[ArchaiModel]:
+        """Sample unseen models from the search space.
+
+        Args:
+            num_models: Number of models to sample.
+            patience: Number of tries to sample a valid model.
+
+        Returns:
+            List of sampled models.
+
+        """
+
+        return self.so.generate_valid_models(
+            [self.search_space.random_sample],
+            num_models,
+            patience=num_models * patience,
+            exclude_archids=self.seen_archs,
+        )[0]
+
+    def select_parents(self, num_parents: int) -> List[ArchaiModel]:
+        """Select parents from the Pareto frontier of a sample of the history.
+
+        Args:
+            num_parents: Number of parents to select (with replacement).
+
+        Returns:
+            List of parent models.
+
+        """
+
+        history_indices = list(
+            range(max(0, len(self.evaluated_models) - self.history_size), len(self.evaluated_models))
+        )
+        sample_indices = self.rng.sample(history_indices, min(self.pareto_sample_size, len(history_indices)))
+
+        all_evaluated_objs = self.search_state.all_evaluated_objs
+        pareto_sample = get_pareto_frontier(
+            [self.evaluated_models[idx] for idx in sample_indices],
+            {obj_name: obj_results[sample_indices] for obj_name, obj_results in all_evaluated_objs.items()},
+            self.so,
+        )
+
+        return [self.rng.choice(pareto_sample["models"]) for _ in range(num_parents)]
+
+    def mutate_parents(self, parents: List[ArchaiModel], patience: Optional[int] = 20) -> List[ArchaiModel]:
+        """Mutate each parent once to generate new models.
+
+        Args:
+            parents: List of parent models.
+            patience: Number of tries to sample a valid model.
+
+        Returns:
+            List of mutated models.
+
+        """
+
+        mutations = {}
+
+        # Mutations of all parents are validated together in batches
+        candidates = self.so.generate_valid_models(
+            [partial(self.search_space.mutate, p) for p in parents],
+            1,
+            patience=patience,
+            exclude_archids=self.seen_archs,
+        )
+
+        for p, p_candidates in zip(parents, candidates):
+            for m in p_candidates:
+                m.metadata["parent"] = p.archid
+                mutations.setdefault(m.archid, m)
+
+        return list(mutations.values())
+
+    def send_models(self, models: List[ArchaiModel]) -> None:
+        """Send models to be evaluated by the search objectives.
+
+        Args:
+            models: List of models.
+
+        """
+
+        self.seen_archs.update(m.archid for m in models)
+        self.so.send_all_objs(models)
+
+    def save_search_state(self, save_csv: Optional[bool] = False) -> None:
+        """Save the search state and the current Pareto frontier models.
+
+        Args:
+            save_csv: Whether the complete search state should also be saved to a .csv file,
+                otherwise only the new results are appended to the search state segments.
+
+        """
+
+        num_evaluated = len(self.evaluated_models)
+
+        csv_file_path = str(self.output_dir / f"search_state_{num_evaluated}.csv") if save_csv else None
+        self.search_state.checkpoint(self.output_dir / "search_state", csv_file_path=csv_file_path)
+        self.search_state.save_pareto_frontier_models(
+            str(self.output_dir / f"pareto_models_{num_evaluated}"), save_weights=self.save_pareto_model_weights
+        )
+        self.search_state.save_all_2d_pareto_evolution_plots(str(self.output_dir))
+
+    @overrides
+    def search(self) -> SearchResults:
+        if self.initial_population_paths:
+            logger.info(f"Loading initial population from {len(self.initial_population_paths)} architectures ...")
+            init_models = [self.search_space.load_arch(path) for path in self.initial_population_paths]
+        else:
+            logger.info(f"Using {self.init_num_models} random architectures as the initial population ...")
+            init_models = self.sample_models(self.init_num_models)
+
+        init_models = init_models[: self.num_models]
+        num_sent, last_saved = 0, 0
+
+        while len(self.evaluated_models) < self.num_models:
+            # Keeps `max_pending_models` models being evaluated, starting with the initial population
+            num_to_send = min(self.max_pending_models - self.so.num_pending_models, self.num_models - num_sent)
+
+            if num_to_send > 0:
+                if init_models:
+                    new_models, init_models = init_models[:num_to_send], init_models[num_to_send:]
+                elif self.evaluated_models:
+                    new_models = self.mutate_parents(self.select_parents(num_to_send))
+                else:
+                    new_models = []
+
+                self.send_models(new_models)
+                num_sent += len(new_models)
+
+            if self.so.num_pending_models == 0:
+                logger.info("No models to evaluate. Stopping search ...")
+                break
+
+            models, results = self.so.fetch_ready_objs(timeout=self.fetch_timeout)
+            if not models:
+                continue
+
+            self.on_start_iteration(self.search_state.iteration_num + 1)
+            self.search_state.add_iteration_results(
+                models,
+                results,
+                # Mutation info
+                extra_model_data={"parent": [m.metadata.get("parent", None) for m in models]},
+            )
+            self.evaluated_models.extend(models)
+
+            logger.info(
+                f"Evaluated {len(models)} models ({len(self.evaluated_models)}/{self.num_models}), "
+                f"{self.so.num_pending_models} pending."
+            )
+
+            # Clears models from memory if needed
+            if self.clear_evaluated_models:
+                [model.clear() for model in models]
+
+            # Saves search results periodically
+            if len(self.evaluated_models) - last_saved >= self.save_every:
+                self.save_search_state()
+                last_saved = len(self.evaluated_models)
+
+        if self.evaluated_models:
+            self.save_search_state(save_csv=True)
+
+        return self.search_state
@@ -105,7 +105,7 @@ class SuccessiveHalvingSearch(Searcher):
             for model in selected_models:
                 self.search_space.save_arch(model, str(models_dir / f"{model.archid}"))
 
-            self.search_state.save_search_state(str(self.output_dir / f"search_state_{self.iter_num}.csv"))
+            self.search_state.checkpoint(self.output_dir / "search_state")
             self.search_state.save_all_2d_pareto_evolution_plots(self.output_dir)
 
             # Keeps only the best `1/self.budget_multiplier` NDS frontiers
@@ -120,4 +120,10 @@ class SuccessiveHalvingSearch(Searcher):
             self.iter_num += 1
             current_budget = current_budget * self.budget_multiplier
 
+        # Saves the complete search state after the last iteration
+        self.search_state.checkpoint(
+            self.output_dir / "search_state",
+            csv_file_path=str(self.output_dir / f"search_state_{self.search_state.iteration_num - 1}.csv"),
+        )
+
         return self.search_state
@@ -1,13 +1,19 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT license.
 
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
 
 class ArchaiModel:
     """Model wrapper with an architecture identifier and an optional metadata dictionary."""
 
-    def __init__(self, arch: Any, archid: str, metadata: Optional[Dict[str, Any]] = None):
+    def __init__(
+        self,
+        arch: Any,
+        archid: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        builder: Optional[Callable[[], Any]] = None,
+    ):
         """Initialize the Archai-based model.
 
         Args:
@@ -16,15 +22,81 @@ class ArchaiModel:
                 of the same architecture, so architecture hashes are prefered. `archid` should
                 only identify neural network architectures and not model weight information.
             metadata: Optional model metadata dictionary.
+            builder: Optional function that builds the model object. If `arch` is `None`, the
+                model object is only built when `arch` is first accessed, which avoids building
+                candidates that are discarded before being evaluated (e.g., invalid or repeated
+                architectures).
 
         """
 
-        self.arch = arch
+        self._arch = arch
+        self._is_cleared = False
         self.archid = archid
         self.metadata = metadata or {}
+        self.builder = builder
+
+    @property
+    def arch(self) -> Any:
+        """Return the model object, building it if needed.
+
+        Raises:
+            RuntimeError: If the model object has been cleared with `clear`.
+
+        """
+
+        if self._is_cleared:
+            raise RuntimeError(
+                f"Model `{self.archid}` has been cleared from memory. Use `build()` to build it again "
+                "(with newly initialized weights) or assign a new model object to `arch`."
+            )
+
+        if self._arch is None and self.builder is not None:
+            self._arch = self.builder()
+
+        return self._arch
+
+    @arch.setter
+    def arch(self, arch: Any) -> None:
+        self._arch = arch
+        self._is_cleared = False
+
+    @property
+    def is_built(self) -> bool:
+        """Return whether the model object is in memory."""
+
+        return self._arch is not None
+
+    def build(self) -> Any:
+        """Build the model object with `builder`, replacing the current one.
+
+        Returns:
+            Model object, with newly initialized weights.
+
+        """
+
+        if self.builder is None:
+            raise ValueError(f"Model `{self.archid}` can not be built since it does not have a `builder`.")
+
+        self.arch = self.builder()
+
+        return self._arch
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Built models are pickled (e.g., sent to other processes) without their builder,
+        # since it is not needed and might hold references to large objects
+        state = self.__dict__.copy()
+        if self._arch is not None:
+            state["builder"] = None
+
+        return state
 
     def __repr__(self) -> str:
-        return f"ArchaiModel(\n\tarchid={self.archid}, \n\t" f"metadata={self.metadata}, \n\tarch={self.arch}\n)"
+        # Avoids building the model object just to represent it
+        if self._is_cleared:
+            arch = "<cleared>"
+        else:
+            arch = self._arch if self.is_built or self.builder is None else "<not built>"
+        return f"ArchaiModel(\n\tarchid={self.archid}, \n\t" f"metadata={self.metadata}, \n\tarch={arch}\n)"
 
     def __str__(self) -> str:
         return repr(self)
@@ -33,8 +105,11 @@ class ArchaiModel:
         """Clear architecture from memory.
 
         Sometimes, after evaluating an `ArchaiModel`, there is no need to keep its
-        architecture instantiated, which optimizes memory usage.
+        architecture instantiated, which optimizes memory usage. Since its weights
+        are lost, accessing `arch` afterwards raises an error instead of silently
+        building a new model. Use `build` to explicitly build the model again.
 
         """
 
-        self.arch = None
+        self._arch = None
+        self._is_cleared = True
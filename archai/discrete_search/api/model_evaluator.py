@@ -1,8 +1,9 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT license.
 
+import time
 from abc import abstractmethod
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from overrides import EnforceOverrides
 
@@ -54,6 +55,11 @@ class ModelEvaluator(EnforceOverrides):
 
     """
 
+    # Part of `ArchaiModel` read by the evaluator: `arch` (the model object), `config` (only the
+    # architecture identifier and metadata) or `encoding` (the search space encoding), so that lazily
+    # built models are only materialized when needed
+    model_input = "arch"
+
     @abstractmethod
     def evaluate(self, arch: ArchaiModel, budget: Optional[float] = None) -> float:
         """Evaluate an `ArchaiModel` instance, optionally using a budget value.
@@ -108,10 +114,28 @@ class AsyncModelEvaluator(EnforceOverrides):
     >>> my_obj.send(model_4, budget=None)
     >>> assert len(my_obj.fetch_all()) == 1
 
+    Subclasses can also implement a streaming interface, which allows search algorithms to
+    dispatch new jobs while others are running. Jobs are identified by their position in the
+    sequence of jobs sent since the job queue was last emptied, which is returned by `send`:
+    `AsyncModelEvaluator.fetch_ready` gathers the results of complete jobs,
+    `AsyncModelEvaluator.pending_jobs` lists jobs that were not fetched yet and
+    `AsyncModelEvaluator.cancel` cancels a pending job. With these methods, results can be
+    iterated as they complete:
+
+    >>> jobs = {my_obj.send(model, budget=None): model for model in models}
+    >>>
+    >>> for job_idx, result in my_obj.as_completed():
+    >>>     print(jobs[job_idx].archid, result)
+
     """
 
+    # Part of `ArchaiModel` read by the evaluator: `arch` (the model object), `config` (only the
+    # architecture identifier and metadata) or `encoding` (the search space encoding), so that lazily
+    # built models are only materialized when needed
+    model_input = "arch"
+
     @abstractmethod
-    def send(self, arch: ArchaiModel, budget: Optional[float] = None) -> None:
+    def send(self, arch: ArchaiModel, budget: Optional[float] = None) -> Optional[int]:
         """Send an evaluation job for a given (model, budget) triplet.
 
         Args:
@@ -122,6 +146,9 @@ class AsyncModelEvaluator(EnforceOverrides):
                 this type of search algorithm, the implementation of `send()` must use the passed
                 `budget` value accordingly.
 
+        Returns:
+            Position of the job in the job queue, if supported by the evaluator.
+
         """
 
         pass
@@ -136,3 +163,89 @@ class AsyncModelEvaluator(EnforceOverrides):
         """
 
         pass
+
+    def fetch_ready(self, timeout: Optional[float] = None) -> Dict[int, Optional[float]]:
+        """Fetch the results of the evaluation jobs that are complete.
+
+        Jobs are identified by their position in the sequence of jobs sent since the job queue
+        was last emptied. Fetched jobs are removed from the queue, which is emptied once all
+        of its jobs have been fetched.
+
+        The default implementation waits for all jobs with `fetch_all`. Subclasses should
+        override it to return as soon as any job is complete.
+
+        Args:
+            timeout: Maximum time (in seconds) to wait for a job to complete. If `None`,
+                waits until at least one job is complete. Implementations may ignore it.
+
+        Returns:
+            Dictionary mapping the position of each complete job to its result. Each result is
+            a `float` or `None` if evaluation job failed.
+
+        """
+
+        return dict(enumerate(self.fetch_all()))
+
+    def pending_jobs(self) -> List[int]:
+        """Return the positions of the jobs that were sent but not fetched yet.
+
+        Evaluators that override `fetch_ready` should also override this method,
+        which is required by `as_completed`.
+
+        Returns:
+            List of job positions.
+
+        """
+
+        raise NotImplementedError(f"`{self.__class__.__name__}` does not support tracking pending jobs.")
+
+    def poll(self) -> Dict[int, Optional[float]]:
+        """Fetch the results of the evaluation jobs that are complete, without waiting.
+
+        Returns:
+            Dictionary mapping the position of each complete job to its result.
+
+        """
+
+        return self.fetch_ready(timeout=0)
+
+    def cancel(self, job_idx: int) -> bool:
+        """Cancel a pending evaluation job.
+
+        Cancelled jobs are still fetched, with a `None` result. The default implementation
+        does not support cancellation.
+
+        Args:
+            job_idx: Position of the job.
+
+        Returns:
+            Whether the job was cancelled.
+
+        """
+
+        return False
+
+    def as_completed(self, timeout: Optional[float] = None) -> Iterator[Tuple[int, Optional[float]]]:
+        """Iterate over the results of the pending jobs as they complete.
+
+        Args:
+            timeout: Maximum time (in seconds) to wait for all jobs. If `None`, waits indefinitely.
+
+        Yields:
+            Position of the job and its result.
+
+        Raises:
+            TimeoutError: If jobs are still pending after `timeout` seconds.
+
+        """
+
+        deadline = time.time() + timeout if timeout is not None else None
+
+        while self.pending_jobs():
+            remaining_time = max(deadline - time.time(), 0) if deadline is not None else None
+            results = self.fetch_ready(timeout=remaining_time)
+
+            yield from results.items()
+
+            if not results and deadline is not None and time.time() >= deadline:
+                raise TimeoutError(f"{len(self.pending_jobs())} jobs are still pending after {timeout} seconds.")
@@ -1,7 +1,13 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT license.
 
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.context import BaseContext
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
 import numpy as np
 import yaml
@@ -12,6 +18,49 @@ from archai.discrete_search.api.model_evaluator import (
     AsyncModelEvaluator,
     ModelEvaluator,
 )
+from archai.discrete_search.utils.objective_cache import (
+    ObjectiveCache,
+    get_evaluator_version,
+)
+
+# Jobs of a forked worker process, which are set by the pool initializer and
+# inherited from the parent process instead of being unpickled
+_WORKER_JOBS: List[Tuple[ModelEvaluator, ArchaiModel, Any]] = []
+
+
+def _evaluate_job(job: Tuple[ModelEvaluator, ArchaiModel, Any]) -> Any:
+    evaluator, model, budget = job
+    return evaluator.evaluate(model, budget)
+
+
+def _init_forked_worker(jobs: List[Tuple[ModelEvaluator, ArchaiModel, Any]]) -> None:
+    global _WORKER_JOBS
+    _WORKER_JOBS = jobs
+
+
+def _evaluate_forked_job(job_idx: int) -> Any:
+    return _evaluate_job(_WORKER_JOBS[job_idx])
+
+
+def _is_multithreaded() -> bool:
+    # Native threads (e.g., torch intra-op and OpenMP pools) are only listed by `/proc`,
+    # otherwise assumes that torch threads are running if torch may use more than one
+    try:
+        return len(os.listdir("/proc/self/task")) > 1
+    except OSError:
+        torch = sys.modules.get("torch")
+        return threading.active_count() > 1 or (torch is not None and torch.get_num_threads() > 1)
+
+
+def _get_mp_context() -> BaseContext:
+    # Forking a multi-threaded process may deadlock the workers, since locks held by other
+    # threads are copied in their locked state, so `forkserver` or `spawn` are used instead
+    start_methods = multiprocessing.get_all_start_methods()
+
+    if "fork" in start_methods and not _is_multithreaded():
+        return multiprocessing.get_context("fork")
+
+    return multiprocessing.get_context("forkserver" if "forkserver" in start_methods else "spawn")
 
 
 class SearchConstraint:
@@ -33,7 +82,13 @@ class SearchObjective:
 class SearchObjectives:
     """Search objectives and constraints."""
 
-    def __init__(self, cache_objective_evaluation: Optional[bool] = True) -> None:
+    def __init__(
+        self,
+        cache_objective_evaluation: Optional[bool] = True,
+        executor: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        cache: Optional[ObjectiveCache] = None,
+    ) -> None:
         """Create, evaluate and cache search objectives and constraints for search algorithms.
 
         Besides objectives, this class also supports registering search constraints,
@@ -45,16 +100,40 @@ class SearchObjectives:
         Args:
             cache_objective_evaluation: If `True`, objective evaluations are cached using the
                 tuple `(obj_name, archid, budget)` as key.
+            executor: How synchronous objectives (`ModelEvaluator`) are evaluated. If `None`,
+                objectives and models are evaluated sequentially. If `thread` or `process`,
+                all (objective, model) pairs are evaluated concurrently by a pool of threads
+                or processes. Processes are forked if the main process is single-threaded, so
+                they inherit evaluators and models instead of receiving pickled copies, and
+                started with `forkserver` (or `spawn`) otherwise (e.g., when torch threads are
+                running), which requires picklable evaluators and models. Only the evaluation
+                results are sent back, so evaluators should not rely on altering the state of
+                `ArchaiModel` objects.
+            max_workers: Maximum number of threads or processes used by `executor`.
+                If `None`, uses the default of `concurrent.futures`.
+            cache: Cache used to store objective evaluations, e.g., a `SqliteObjectiveCache`
+                to share evaluations across processes and search runs. If `None`, evaluations
+                are cached in memory.
 
         """
 
+        assert executor in [None, "thread", "process"], f"Invalid executor: {executor}."
+
         self._cache_objective_evaluation = cache_objective_evaluation
+        self._executor = executor
+        self._max_workers = max_workers
 
         self._objs = {}
         self._extra_constraints = {}
 
         # Cache key: (obj_name, archid, budget)
-        self._cache: Dict[Tuple[str, str, Optional[float]], Optional[float]] = {}
+        self._cache = cache if cache is not None else ObjectiveCache()
+        self._cache_versions = {}
+
+        # Models sent by `send_all_objs` that were not fetched yet, and the pending
+        # model of each job sent to asynchronous objectives, in the order they were sent
+        self._pending_models = []
+        self._pending_jobs = {}
 
     @property
     def objective_names(self) -> List[str]:
@@ -71,6 +150,11 @@ class SearchObjectives:
         """Return a list of expensive objective names."""
         return list(self.expensive_objectives.keys())
 
+    @property
+    def num_pending_models(self) -> int:
+        """Return the number of models sent by `send_all_objs` that were not fetched yet."""
+        return len(self._pending_models)
+
     @property
     def objectives(self) -> Dict[str, SearchObjective]:
         """Return a dictionary of all objectives."""
@@ -124,6 +208,7 @@ class SearchObjectives:
             assert constraint is None, "Constraints can only be set for cheap objectives (compute_intensive=False)."
 
         self._objs[name] = obj
+        self._cache_versions[name] = get_evaluator_version(model_evaluator)
 
     def add_constraint(
         self, name: str, model_evaluator: Union[ModelEvaluator, AsyncModelEvaluator], constraint: Tuple[float, float]
@@ -146,10 +231,46 @@ class SearchObjectives:
         assert name not in self._extra_constraints, f"There is already an constraint named {name}."
 
         self._extra_constraints[name] = SearchConstraint(name, model_evaluator, constraint)
+        self._cache_versions[name] = get_evaluator_version(model_evaluator)
 
     def _filter_objs(self, objs: Dict[str, Dict], query_fn: Callable) -> Dict[str, Dict]:
         return {obj_name: obj_dict for obj_name, obj_dict in objs.items() if query_fn(obj_dict)}
 
+    def _eval_sync_jobs(
+        self, jobs: List[Tuple[ModelEvaluator, ArchaiModel, Any]], progress_bar: Optional[bool] = False
+    ) -> List[Any]:
+        mp_context = _get_mp_context() if self._executor == "process" else None
+
+        if self._executor == "thread":
+            executor = ThreadPoolExecutor(max_workers=self._max_workers)
+            job_fn, job_args = _evaluate_job, jobs
+        elif mp_context.get_start_method() == "fork":
+            # Lazily built models are built once before forking, otherwise every worker
+            # process would build its own copy and discard it after the evaluation
+            for evaluator, model, _ in jobs:
+                if evaluator.model_input == "arch":
+                    model.arch
+
+            # Jobs are inherited by the forked worker processes through the initializer arguments
+            executor = ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                mp_context=mp_context,
+                initializer=_init_forked_worker,
+                initargs=(jobs,),
+            )
+            job_fn, job_args = _evaluate_forked_job, range(len(jobs))
+        else:
+            executor = ProcessPoolExecutor(max_workers=self._max_workers, mp_context=mp_context)
+            job_fn, job_args = _evaluate_job, jobs
+
+        with executor:
+            # `map` yields results in the same order as `jobs`
+            results = executor.map(job_fn, job_args)
+            if progress_bar:
+                results = tqdm(results, total=len(jobs), desc="Calculating synchronous objectives...")
+
+            return list(results)
+
     def _eval_objs(
         self,
         objs: Dict[str, Dict],
@@ -170,10 +291,10 @@ class SearchObjectives:
 
         # Initializes evaluation results with cached results
         eval_results = {
-            obj_name: [
-                self._cache.get((obj_name, model.archid, budget))
-                for model, budget in zip(models, budgets[obj_name])
-            ]
+            obj_name: self._cache.get_many(
+                [(obj_name, model.archid, budget) for model, budget in zip(models, budgets[obj_name])],
+                version=self._cache_versions[obj_name],
+            )
             for obj_name in objs
         }
 
@@ -195,18 +316,27 @@ class SearchObjectives:
                 obj_d.evaluator.send(models[i], budgets[obj_name][i])
 
         # Calculates synchronous objectives in order
-        for obj_name, obj_d in sync_objs.items():
-            pbar = (
-                tqdm(eval_indices[obj_name], desc=f'Calculating "{obj_name}"...')
-                if progress_bar
-                else eval_indices[obj_name]
+        sync_jobs = [(obj_name, i) for obj_name in sync_objs for i in eval_indices[obj_name]]
+
+        if self._executor and len(sync_jobs) > 1:
+            sync_results = self._eval_sync_jobs(
+                [(sync_objs[obj_name].evaluator, models[i], budgets[obj_name][i]) for obj_name, i in sync_jobs],
+                progress_bar,
             )
 
-            for i in pbar:
-                eval_results[obj_name][i] = obj_d.evaluator.evaluate(
-                    models[i], budgets[obj_name][i]
+            for (obj_name, i), result in zip(sync_jobs, sync_results):
+                eval_results[obj_name][i] = result
+        else:
+            for obj_name, obj_d in sync_objs.items():
+                pbar = (
+                    tqdm(eval_indices[obj_name], desc=f'Calculating "{obj_name}"...')
+                    if progress_bar
+                    else eval_indices[obj_name]
                 )
 
+                for i in pbar:
+                    eval_results[obj_name][i] = obj_d.evaluator.evaluate(models[i], budgets[obj_name][i])
+
         # Gets results from async objectives
         pbar = (
             tqdm(async_objs.items(), desc="Gathering results from async objectives...")
@@ -225,14 +355,13 @@ class SearchObjectives:
         # Updates cache
         if self._cache_objective_evaluation:
             for obj_name in objs:
-                for i in eval_indices[obj_name]:
-                    cache_tuple = (
-                        obj_name,
-                        models[i].archid,
-                        budgets[obj_name][i],
-                    )
-
-                    self._cache[cache_tuple] = eval_results[obj_name][i]
+                self._cache.set_many(
+                    {
+                        (obj_name, models[i].archid, budgets[obj_name][i]): eval_results[obj_name][i]
+                        for i in eval_indices[obj_name]
+                    },
+                    version=self._cache_versions[obj_name],
+                )
 
         assert len(set(len(r) for r in eval_results.values())) == 1
 
@@ -300,6 +429,81 @@ class SearchObjectives:
         _, idx = self.validate_constraints([model], progress_bar=False)
         return len(idx) > 0
 
+    def generate_valid_models(
+        self,
+        generators: List[Callable[[], Optional[ArchaiModel]]],
+        num_models: Union[int, List[int]],
+        patience: Optional[int] = 20,
+        exclude_archids: Optional[Set[str]] = None,
+    ) -> List[List[ArchaiModel]]:
+        """Generate unique models that satisfy all constraints.
+
+        Instead of validating candidates one at a time, each round draws a pool with the
+        remaining quota of every generator and validates the whole pool with a single
+        `validate_constraints` call. Candidates in `exclude_archids` or already drawn by the same
+        generator are discarded before validation. Rounds are repeated until all quotas are met
+        or generators run out of tries.
+
+        Args:
+            generators: List of functions that generate a candidate model (e.g., by mutating
+                a parent), which may return `None` if no candidate could be generated.
+            num_models: Number of models to generate with each generator.
+            patience: Maximum number of candidates generated by each generator.
+            exclude_archids: Architecture identifiers that should not be generated
+                (e.g., already evaluated architectures).
+
+        Returns:
+            List of valid models generated by each generator, without repeated architectures.
+
+        """
+
+        if isinstance(num_models, int):
+            num_models = [num_models] * len(generators)
+        assert len(num_models) == len(generators), "`num_models` must have the same length as `generators`."
+
+        exclude_archids = exclude_archids or set()
+        valid_models = [{} for _ in generators]
+        num_tries = [0] * len(generators)
+
+        # Architectures already validated (or about to be) for each generator, which are
+        # discarded before validation since their result can not change
+        seen_archids = [set() for _ in generators]
+
+        while True:
+            pool, pool_generators = [], []
+            num_generated = 0
+
+            for i, generator in enumerate(generators):
+                num_candidates = min(num_models[i] - len(valid_models[i]), patience - num_tries[i])
+
+                for _ in range(max(num_candidates, 0)):
+                    candidate = generator()
+                    num_tries[i] += 1
+                    num_generated += 1
+
+                    if (
+                        candidate is not None
+                        and candidate.archid not in exclude_archids
+                        and candidate.archid not in seen_archids[i]
+                    ):
+                        seen_archids[i].add(candidate.archid)
+                        pool.append(candidate)
+                        pool_generators.append(i)
+
+            if not num_generated:
+                break
+
+            if not pool:
+                continue
+
+            _, valid_indices = self.validate_constraints(pool, progress_bar=False)
+
+            for idx in valid_indices:
+                model, i = pool[idx], pool_generators[idx]
+                valid_models[i][model.archid] = model
+
+        return [list(models.values()) for models in valid_models]
+
     def eval_cheap_objs(
         self,
         models: List[ArchaiModel],
@@ -359,6 +563,108 @@ class SearchObjectives:
 
         return self._eval_objs(self._objs, models, budgets, progress_bar)
 
+    def send_all_objs(self, models: List[ArchaiModel], budgets: Optional[Dict[str, List]] = None) -> None:
+        """Send a list of models to be evaluated by all objective functions, without
+        waiting for asynchronous objectives.
+
+        Synchronous objectives are evaluated right away, while asynchronous objectives
+        only receive the evaluation jobs. Results are gathered with `fetch_ready_objs`,
+        which allows search algorithms to send new models as soon as others are evaluated.
+        Asynchronous evaluators should not be used by other methods (e.g., `eval_all_objs`)
+        while there are pending models.
+
+        Args:
+            models: List of models to evaluate.
+            budgets: Budgets for each objective.
+
+        """
+
+        if not models:
+            return
+
+        budgets = budgets or {}
+        budgets = {obj_name: budgets.get(obj_name, [None] * len(models)) for obj_name in self._objs}
+
+        sync_objs = self._filter_objs(self._objs, lambda x: isinstance(x.evaluator, ModelEvaluator))
+        async_objs = self._filter_objs(self._objs, lambda x: isinstance(x.evaluator, AsyncModelEvaluator))
+
+        sync_results = self._eval_objs(sync_objs, models, budgets)
+        pending_models = [
+            {
+                "model": model,
+                "budgets": {obj_name: obj_budgets[i] for obj_name, obj_budgets in budgets.items()},
+                "results": {obj_name: obj_results[i] for obj_name, obj_results in sync_results.items()},
+                "num_pending_jobs": 0,
+            }
+            for i, model in enumerate(models)
+        ]
+
+        for obj_name, obj_d in async_objs.items():
+            cached_results = self._cache.get_many(
+                [(obj_name, model.archid, budget) for model, budget in zip(models, budgets[obj_name])],
+                version=self._cache_versions[obj_name],
+            )
+
+            for pending_model, result in zip(pending_models, cached_results):
+                if result is None:
+                    obj_d.evaluator.send(pending_model["model"], pending_model["budgets"][obj_name])
+
+                    self._pending_jobs.setdefault(obj_name, []).append(pending_model)
+                    pending_model["num_pending_jobs"] += 1
+                else:
+                    pending_model["results"][obj_name] = result
+
+        self._pending_models.extend(pending_models)
+
+    def fetch_ready_objs(self, timeout: Optional[float] = None) -> Tuple[List[ArchaiModel], Dict[str, np.ndarray]]:
+        """Fetch the models sent by `send_all_objs` whose objectives are all evaluated.
+
+        Args:
+            timeout: Maximum time (in seconds) to wait for an asynchronous objective job.
+                If `None`, waits until at least one job is complete. Returns right away if
+                a model is already evaluated.
+
+        Returns:
+            Evaluated models (which may be empty if no model is complete yet) and
+            dictionary with their evaluation results.
+
+        """
+
+        for obj_name, jobs in self._pending_jobs.items():
+            if not jobs:
+                continue
+
+            # Only waits for jobs if no model can be returned yet
+            if any(pending_model["num_pending_jobs"] == 0 for pending_model in self._pending_models):
+                timeout = 0
+
+            results = self._objs[obj_name].evaluator.fetch_ready(timeout=timeout)
+            timeout = 0
+
+            fetched_results = {}
+
+            for job_idx, result in results.items():
+                pending_model, jobs[job_idx] = jobs[job_idx], None
+
+                pending_model["results"][obj_name] = result
+                pending_model["num_pending_jobs"] -= 1
+                fetched_results[(obj_name, pending_model["model"].archid, pending_model["budgets"][obj_name])] = result
+
+            if self._cache_objective_evaluation:
+                self._cache.set_many(fetched_results, version=self._cache_versions[obj_name])
+
+            # The evaluator empties its job queue once all jobs are fetched
+            if all(job is None for job in jobs):
+                jobs.clear()
+
+        ready_models = [m for m in self._pending_models if m["num_pending_jobs"] == 0]
+        self._pending_models = [m for m in self._pending_models if m["num_pending_jobs"] > 0]
+
+        return [m["model"] for m in ready_models], {
+            obj_name: np.array([m["results"][obj_name] for m in ready_models], dtype=np.float64)
+            for obj_name in self._objs
+        }
+
     def save_cache(self, file_path: str) -> None:
         """Save the state of the `SearchObjectives` object to a YAML file.
 
@@ -368,18 +674,20 @@ class SearchObjectives:
         """
 
         with open(file_path, "w", encoding="utf-8") as f:
-            yaml.dump(self._cache, f)
+            yaml.dump(self._cache.to_dict(), f)
 
     def load_cache(self, file_path: str) -> None:
         """Load the state of the `SearchObjectives` object from a YAML file.
 
+        Loaded evaluations are added to the current cache.
+
         Args:
             file_path: Path to YAML file.
 
         """
 
         with open(file_path, "r", encoding="utf-8") as f:
-            self._cache = yaml.load(f)
+            self._cache.update(yaml.load(f, Loader=yaml.Loader))
 
     def lookup_cache(self, obj_name: str, arch_id: str, budget: Optional[int]) -> Optional[float]:
         """Look up the cache for a specific objective, architecture and budget.
@@ -394,4 +702,4 @@ class SearchObjectives:
 
         """
 
-        return self._cache.get((obj_name, arch_id, budget), None)
\ No newline at end of file
+        return self._cache.get((obj_name, arch_id, budget), None, version=self._cache_versions.get(obj_name))
\ No newline at end of file
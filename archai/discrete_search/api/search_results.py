@@ -2,6 +2,7 @@
 # Licensed under the MIT license.
 
 import copy
+import importlib.util
 import re
 from pathlib import Path
 from time import time
@@ -14,11 +15,16 @@ import pandas as pd
 from archai.discrete_search.api.archai_model import ArchaiModel
 from archai.discrete_search.api.search_objectives import SearchObjectives
 from archai.discrete_search.api.search_space import DiscreteSearchSpace
+from archai.discrete_search.utils.columnar_store import ColumnarStore
 from archai.discrete_search.utils.multi_objective import (
+    ParetoArchive,
     _find_pareto_frontier_points,
     get_pareto_frontier,
 )
 
+# Parquet segments of `append_search_state` require `pyarrow`
+PARQUET_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
 
 class SearchResults:
     """Discrete search results.
@@ -42,15 +48,57 @@ class SearchResults:
 
         self.iteration_num = 0
         self.init_time = time()
-        self.search_walltimes = []
-        self.results = []
+
+        # Evaluation results are stored column-wise, one row per evaluated model
+        self._store = ColumnarStore()
+        self._models = []
+        self._iteration_offsets = [0]
+        self._results = None
+
+        # Non-dominated sorting of all evaluated models, updated after every iteration
+        self._pareto_archive = None
+
+    @property
+    def search_walltimes(self) -> np.ndarray:
+        """Return the search duration (in hours) when each model was added."""
+
+        if "search_walltime_hours" not in self._store:
+            return np.empty(0, dtype=np.float64)
+
+        return self._store["search_walltime_hours"]
+
+    @property
+    def results(self) -> List[Dict[str, Any]]:
+        """Return the results of each search iteration."""
+
+        # Results are materialized once and then extended by `add_iteration_results`
+        if self._results is None:
+            self._results = [
+                self._get_iteration_results(start, end)
+                for start, end in zip(self._iteration_offsets[:-1], self._iteration_offsets[1:])
+            ]
+
+        return self._results
+
+    def _get_iteration_results(self, start: int, end: int) -> Dict[str, Any]:
+        data_columns = [
+            name for name in self._store.column_names if name not in ["iteration_num", "search_walltime_hours"]
+        ]
+
+        return {
+            "models": self._models[start:end],
+            # Copies do not keep the (growing) buffers of the store alive
+            **{name: self._store[name][start:end].copy() for name in data_columns},
+        }
 
     @property
     def all_evaluated_objs(self) -> Dict[str, np.array]:
         """Return all evaluated objectives."""
 
         return {
-            obj_name: np.array([r for iter_results in self.results for r in iter_results[obj_name]], dtype=np.float32)
+            obj_name: (
+                self._store[obj_name].astype(np.float32) if obj_name in self._store else np.empty(0, dtype=np.float32)
+            )
             for obj_name in self.objectives.objectives
         }
 
@@ -78,21 +126,49 @@ class SearchResults:
         if extra_model_data:
             assert all(len(v) == len(models) for v in extra_model_data.values())
 
-        evaluation_results = copy.deepcopy(evaluation_results)
-        evaluation_results.update(extra_model_data)
-
-        self.results.append(
+        self._store.append(
             {
                 "archid": [m.archid for m in models],
-                "models": [m for m in models],  # To avoid creating a reference to `models` variable
                 **evaluation_results,
+                **extra_model_data,
+                "iteration_num": np.full(len(models), self.iteration_num, dtype=np.int64),
+                # Adds current search duration in hours
+                "search_walltime_hours": np.full(len(models), (time() - self.init_time) / 3600),
             }
         )
+        self._models.extend(models)
+        self._iteration_offsets.append(len(self._models))
+
+        if self._results is not None:
+            self._results.append(self._get_iteration_results(*self._iteration_offsets[-2:]))
 
-        # Adds current search duration in hours
-        self.search_walltimes += [(time() - self.init_time) / 3600] * len(models)
+        self._update_pareto_archive(evaluation_results, len(models))
         self.iteration_num += 1
 
+    def _update_pareto_archive(self, evaluation_results: Dict[str, np.ndarray], num_models: int) -> None:
+        objective_names = self.objectives.objective_names
+
+        if self._pareto_archive is None:
+            self._pareto_archive = ParetoArchive(len(objective_names))
+
+        # Inverts maximization objectives
+        points = np.zeros((num_models, len(objective_names)), dtype=np.float64)
+        for i, obj_name in enumerate(objective_names):
+            obj_results = np.asarray(evaluation_results[obj_name], dtype=np.float64)
+            points[:, i] = -obj_results if self.objectives.objectives[obj_name].higher_is_better else obj_results
+
+        self._pareto_archive.add(points)
+
+    def _get_models_from_indices(self, indices: np.ndarray) -> Dict[str, Any]:
+        return {
+            "models": [self._models[idx] for idx in indices],
+            "evaluation_results": {
+                obj_name: self._store[obj_name][indices] for obj_name in self.objectives.objective_names
+            },
+            "indices": indices,
+            "iteration_nums": self._store["iteration_num"][indices],
+        }
+
     def get_pareto_frontier(
         self, start_iteration: Optional[int] = 0, end_iteration: Optional[int] = None
     ) -> Dict[str, Any]:
@@ -111,24 +187,37 @@ class SearchResults:
 
         end_iteration = end_iteration or self.iteration_num
 
-        all_models = [model for it in range(start_iteration, end_iteration) for model in self.results[it]["models"]]
+        # Frontiers starting from the first iteration are kept by the Pareto archive
+        if not start_iteration and self._pareto_archive is not None:
+            return self._get_models_from_indices(self._pareto_archive.get_pareto_frontier(end_iteration))
 
-        all_results = {
-            obj_name: np.concatenate(
-                [self.results[it][obj_name] for it in range(start_iteration, end_iteration)], axis=0
-            )
-            for obj_name in self.objectives.objective_names
-        }
+        start, end = self._iteration_offsets[start_iteration], self._iteration_offsets[end_iteration]
 
-        all_iteration_nums = np.array(
-            [it for it in range(start_iteration, end_iteration) for _ in range(len(self.results[it]["models"]))]
-        )
+        all_models = self._models[start:end]
+        all_results = {obj_name: self._store[obj_name][start:end] for obj_name in self.objectives.objective_names}
+        all_iteration_nums = self._store["iteration_num"][start:end]
 
         pareto_frontier = get_pareto_frontier(all_models, all_results, self.objectives)
         pareto_frontier.update({"iteration_nums": all_iteration_nums[pareto_frontier["indices"]]})
 
         return pareto_frontier
 
+    def get_non_dominated_sorting(self) -> List[Dict[str, Any]]:
+        """Get the non-dominated sorting frontiers using all search results.
+
+        Returns:
+            List of dictionaries containing 'models', 'evaluation_results', 'indices' and
+                'iteration_nums' for the members of each frontier.
+
+        """
+
+        if self._pareto_archive is None:
+            return []
+
+        return [
+            self._get_models_from_indices(frontier) for frontier in self._pareto_archive.get_non_dominated_sorting()
+        ]
+
     def get_search_state_df(self) -> pd.DataFrame:
         """Get the search state data frame.
 
@@ -137,17 +226,14 @@ class SearchResults:
 
         """
 
-        state_df = pd.concat(
-            [pd.DataFrame(it_results).assign(iteration_num=it) for it, it_results in enumerate(self.results)], axis=0
-        ).reset_index(drop=True)
-        state_df["search_walltime_hours"] = self.search_walltimes
+        state_df = self._store.to_pandas()
 
         pareto_frontier = self.get_pareto_frontier()
 
         state_df["is_pareto"] = False
         state_df.loc[pareto_frontier["indices"], "is_pareto"] = True
 
-        return state_df.drop(["models"], axis=1)
+        return state_df
 
     def save_search_state(self, file_path: Union[str, Path]) -> None:
         """Save the search state to a .csv file.
@@ -160,6 +246,74 @@ class SearchResults:
         state_df = self.get_search_state_df()
         state_df.to_csv(file_path, index=False)
 
+    def append_search_state(self, directory: Union[str, Path]) -> None:
+        """Append the results added since the last call to a directory of Parquet segments.
+
+        Differently from `save_search_state`, previously saved results are not rewritten,
+        which keeps the cost of saving proportional to the number of new results. Pareto
+        frontier information is not saved, as it is recomputed by `load_search_state`. Segments
+        of a previous search in `directory` are removed on the first call, unless the search
+        state was loaded from `directory` with `load_search_state`.
+
+        Args:
+            directory: Directory to save the search state segments.
+
+        """
+
+        self._store.save_segment(directory)
+
+    def checkpoint(self, directory: Union[str, Path], csv_file_path: Optional[Union[str, Path]] = None) -> None:
+        """Checkpoint the search state, which searchers do after every search iteration.
+
+        New results are appended to the Parquet segments in `directory` with `append_search_state`,
+        so the cost of a checkpoint does not grow with the number of results. If `pyarrow` is not
+        available, the complete search state is saved to `directory/search_state.csv` instead.
+
+        Args:
+            directory: Directory to save the search state segments.
+            csv_file_path: If given, the complete search state is also saved to this .csv file,
+                which searchers only do after their last iteration.
+
+        """
+
+        if PARQUET_AVAILABLE:
+            self.append_search_state(directory)
+        else:
+            Path(directory).mkdir(exist_ok=True, parents=True)
+            self.save_search_state(Path(directory) / "search_state.csv")
+
+        if csv_file_path is not None and self.iteration_num > 0:
+            self.save_search_state(csv_file_path)
+
+    def load_search_state(self, directory: Union[str, Path]) -> None:
+        """Load the search state saved by `append_search_state`, replacing current results.
+
+        Models are restored without their architectures, only with their `archid`.
+
+        Args:
+            directory: Directory with the search state segments.
+
+        """
+
+        self._store = ColumnarStore.load(directory)
+        self._models = [ArchaiModel(None, archid) for archid in self._store["archid"]]
+        self._results = None
+        self._pareto_archive = None
+
+        iteration_nums = self._store["iteration_num"]
+        self.iteration_num = int(iteration_nums[-1]) + 1 if len(self._store) > 0 else 0
+        self._iteration_offsets = np.searchsorted(iteration_nums, np.arange(self.iteration_num + 1)).tolist()
+
+        for start, end in zip(self._iteration_offsets[:-1], self._iteration_offsets[1:]):
+            self._update_pareto_archive(
+                {obj_name: self._store[obj_name][start:end] for obj_name in self.objectives.objective_names},
+                end - start,
+            )
+
+        # Continues counting the search duration from the last saved result
+        if len(self._store) > 0:
+            self.init_time = time() - self.search_walltimes[-1] * 3600
+
     def save_pareto_frontier_models(self, directory: str, save_weights: Optional[bool] = False) -> None:
         """Save the pareto-frontier models to a directory.
 
@@ -1,8 +1,12 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT license.
 
+from archai.discrete_search.evaluators.analytic_cost import (
+    AnalyticFlops, AnalyticMacs, AnalyticNumParameters
+)
 from archai.discrete_search.evaluators.functional import EvaluationFunction
 from archai.discrete_search.evaluators.onnx_model import AvgOnnxLatency
+from archai.discrete_search.evaluators.process_pool import ProcessParallelEvaluator
 from archai.discrete_search.evaluators.progressive_training import (
     ProgressiveTraining, RayProgressiveTraining
 )
@@ -12,8 +16,9 @@ from archai.discrete_search.evaluators.pt_profiler import (
 from archai.discrete_search.evaluators.ray import RayParallelEvaluator
 
 __all__ = [
+    'AnalyticFlops', 'AnalyticMacs', 'AnalyticNumParameters',
     'EvaluationFunction', 'AvgOnnxLatency', 'ProgressiveTraining',
     'RayProgressiveTraining', 'TorchFlops', 'TorchLatency',
     'TorchPeakCpuMemory', 'TorchPeakCudaMemory',
-    'TorchNumParameters', 'RayParallelEvaluator'
+    'TorchNumParameters', 'RayParallelEvaluator', 'ProcessParallelEvaluator'
 ]
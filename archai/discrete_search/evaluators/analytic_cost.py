@@ -0,0 +1,672 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT license.
+
+"""Analytic cost models that estimate parameters, FLOPs and MACs from architecture configurations.
+
+Cost models follow the conventions of the hook-based profiler (`archai.discrete_search.evaluators.pt_profiler`):
+a multiply-accumulate of a linear layer, convolution or matrix multiplication counts as one MAC and two FLOPs,
+while normalization layers, activations and element-wise operations only count FLOPs. Parameters are counted
+exactly, whereas FLOPs of element-wise operations are approximated, since they depend on how each operation
+is implemented.
+
+"""
+
+import math
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from overrides import overrides
+
+from archai.discrete_search.api.archai_model import ArchaiModel
+from archai.discrete_search.api.model_evaluator import ModelEvaluator
+
+
+class AnalyticCost(NamedTuple):
+    """Number of parameters, FLOPs and MACs of a model or layer."""
+
+    params: int
+    flops: int
+    macs: int
+
+
+# Cost model registry, which maps names to functions that compute the cost of a configuration
+ANALYTIC_COST_MODELS: Dict[str, Callable[..., AnalyticCost]] = {}
+
+
+def register_cost_model(name: str) -> Callable:
+    """Register an analytic cost model.
+
+    Cost models are functions that receive an architecture configuration (and optional
+    keyword arguments, such as the input shape) and return an `AnalyticCost`.
+
+    Args:
+        name: Name of the cost model.
+
+    Returns:
+        Decorator that registers the cost model.
+
+    """
+
+    def _register(cost_model: Callable[..., AnalyticCost]) -> Callable[..., AnalyticCost]:
+        assert name not in ANALYTIC_COST_MODELS, f"There is already a cost model named {name}."
+
+        ANALYTIC_COST_MODELS[name] = cost_model
+        return cost_model
+
+    return _register
+
+
+def get_analytic_cost(cost_model: str, config: Any, **kwargs) -> AnalyticCost:
+    """Compute the cost of an architecture configuration using a registered cost model.
+
+    Args:
+        cost_model: Name of the cost model.
+        config: Architecture configuration.
+        kwargs: Additional arguments passed to the cost model.
+
+    Returns:
+        Cost of the architecture.
+
+    """
+
+    if cost_model not in ANALYTIC_COST_MODELS:
+        raise ValueError(f"Cost model {cost_model} is not registered. Available: {list(ANALYTIC_COST_MODELS)}.")
+
+    return ANALYTIC_COST_MODELS[cost_model](config, **kwargs)
+
+
+def _sum_costs(*costs: AnalyticCost) -> AnalyticCost:
+    return AnalyticCost(*(sum(values) for values in zip(*costs))) if costs else AnalyticCost(0, 0, 0)
+
+
+def _linear_cost(in_features: int, out_features: int, num_tokens: int, bias: Optional[bool] = True) -> AnalyticCost:
+    macs = num_tokens * in_features * out_features
+    return AnalyticCost(in_features * out_features + (out_features if bias else 0), 2 * macs, macs)
+
+
+def _conv2d_cost(
+    in_channels: int,
+    out_channels: int,
+    kernel_size: int,
+    out_size: Tuple[int, int],
+    batch_size: int,
+    groups: Optional[int] = 1,
+    bias: Optional[bool] = True,
+) -> AnalyticCost:
+    num_outputs = batch_size * out_size[0] * out_size[1]
+    macs = kernel_size * kernel_size * in_channels * (out_channels // groups) * num_outputs
+
+    params = kernel_size * kernel_size * (in_channels // groups) * out_channels + (out_channels if bias else 0)
+    flops = 2 * macs + (out_channels * num_outputs if bias else 0)
+
+    return AnalyticCost(params, flops, macs)
+
+
+def _layer_norm_cost(hidden_size: int, num_tokens: int) -> AnalyticCost:
+    return AnalyticCost(2 * hidden_size, 5 * num_tokens * hidden_size, 0)
+
+
+def _elementwise_cost(num_elements: int) -> AnalyticCost:
+    return AnalyticCost(0, num_elements, 0)
+
+
+def _attention_cost(
+    num_heads: int, head_size: int, query_length: int, key_length: int, batch_size: int
+) -> AnalyticCost:
+    # Scores (`q @ k^T`) and context (`scores @ v`) matrix multiplications, followed by the scaling,
+    # masking and softmax of the scores
+    num_scores = batch_size * num_heads * query_length * key_length
+    macs = 2 * num_scores * head_size
+
+    return AnalyticCost(0, 2 * macs + 3 * num_scores, macs)
+
+
+def _fft_conv_cost(num_channels: int, kernel_channels: int, seq_len: int, batch_size: int) -> AnalyticCost:
+    # Real FFTs of size `2 * seq_len` (approximated by 2.5 * n * log2(n) FLOPs) of the inputs and kernels,
+    # followed by the complex product of the spectra, the inverse FFT and the skip connection (`D` term)
+    fft_size = 2 * seq_len
+    fft_flops = int(2.5 * fft_size * math.log2(fft_size))
+    num_ffts = 2 * batch_size * num_channels + kernel_channels
+    num_outputs = batch_size * num_channels * seq_len
+
+    return AnalyticCost(0, num_ffts * fft_flops + 6 * (num_outputs + batch_size * num_channels) + 2 * num_outputs, 0)
+
+
+def _gconv_kernel_params(channels: int, kernel_size: int, max_length: int) -> int:
+    # Multi-scale kernels of `GConv`, which are doubled in length until they cover `max_length`
+    num_scales = 1 + math.ceil(math.log2(max_length / kernel_size))
+    return num_scales * channels * kernel_size
+
+
+def _lsh_num_rotations(seq_len: int, bucket_size: int, max_position_embeddings: Optional[int] = 4096) -> int:
+    # Mirrors `LSHSelfAttention._set_num_buckets`, where factorized buckets are hashed with
+    # a rotation per factor
+    num_buckets_pow_2 = (2 * (seq_len // bucket_size)).bit_length() - 1
+    num_buckets_limit = 2 * max(int((max_position_embeddings // bucket_size) ** 0.5), bucket_size)
+
+    if 2**num_buckets_pow_2 > num_buckets_limit:
+        return 2 ** (num_buckets_pow_2 // 2) + 2 ** (num_buckets_pow_2 - num_buckets_pow_2 // 2)
+
+    return 2**num_buckets_pow_2
+
+
+def _to_list(value: Union[Any, List[Any]], size: int) -> List[Any]:
+    # Mirrors the per-layer expansion of `GPT2FlexConfig`
+    if isinstance(value, (list, tuple)):
+        return list(value[:size]) + [value[0]] * max(size - len(value), 0)
+
+    return [value] * size
+
+
+@register_cost_model("gpt2")
+@register_cost_model("gpt2-flex")
+def gpt2_cost(config: Dict[str, Any], batch_size: Optional[int] = 1, seq_len: Optional[int] = None) -> AnalyticCost:
+    """Cost of a GPT-2 (or GPT-2 Flex) configuration from the Transformer-Flex search space.
+
+    Args:
+        config: Configuration with `d_model`, `d_inner`, `n_head`, `n_layer`, `vocab_size`
+            and `max_sequence_length` (see `TransformerFlexSearchSpace`).
+        batch_size: Batch size of the input.
+        seq_len: Sequence length of the input. If `None`, uses `max_sequence_length`.
+
+    Returns:
+        Cost of the architecture, with the language modeling head tied to the input embeddings.
+
+    """
+
+    d_model, n_layer = config["d_model"], config["n_layer"]
+    seq_len = seq_len or config["max_sequence_length"]
+    num_tokens = batch_size * seq_len
+
+    d_inners = _to_list(config.get("d_inner") or 4 * d_model, n_layer)
+    n_heads = _to_list(config["n_head"], n_layer)
+
+    # Token and position embeddings
+    costs = [AnalyticCost((config["vocab_size"] + config["max_sequence_length"]) * d_model, 0, 0)]
+
+    for d_inner, n_head in zip(d_inners, n_heads):
+        costs += [
+            _layer_norm_cost(d_model, num_tokens),
+            _linear_cost(d_model, 3 * d_model, num_tokens),
+            _attention_cost(n_head, d_model // n_head, seq_len, seq_len, batch_size),
+            _linear_cost(d_model, d_model, num_tokens),
+            _layer_norm_cost(d_model, num_tokens),
+            _linear_cost(d_model, d_inner, num_tokens),
+            _elementwise_cost(num_tokens * d_inner),
+            _linear_cost(d_inner, d_model, num_tokens),
+            _elementwise_cost(2 * num_tokens * d_model),
+        ]
+
+    # Final layer normalization and tied language modeling head
+    lm_head = _linear_cost(d_model, config["vocab_size"], num_tokens, bias=False)
+    costs += [_layer_norm_cost(d_model, num_tokens), lm_head._replace(params=0)]
+
+    return _sum_costs(*costs)
+
+
+@register_cost_model("mem-transformer")
+def mem_transformer_cost(
+    config: Dict[str, Any], batch_size: Optional[int] = 1, seq_len: Optional[int] = None, **hf_config_kwargs
+) -> AnalyticCost:
+    """Cost of a Memory Transformer configuration from the Transformer-Flex search space.
+
+    Args:
+        config: Configuration with `d_model`, `d_inner`, `n_head`, `n_layer` and `vocab_size`
+            (see `TransformerFlexSearchSpace`).
+        batch_size: Batch size of the input.
+        seq_len: Sequence length of the input (without memory). If `None`, uses `max_sequence_length`.
+        hf_config_kwargs: Additional arguments of `MemTransformerConfig` (e.g., `div_val`, `cutoffs`).
+
+    Returns:
+        Cost of the architecture.
+
+    """
+
+    from archai.discrete_search.search_spaces.nlp.transformer_flex.models.configuration_mem_transformer import (
+        MemTransformerConfig,
+    )
+
+    hf_config = MemTransformerConfig(
+        **{
+            "d_model": config["d_model"],
+            "d_inner": config["d_inner"],
+            "n_head": config["n_head"],
+            "n_layer": config["n_layer"],
+            "vocab_size": config["vocab_size"],
+            **hf_config_kwargs,
+        }
+    )
+    assert not hf_config.primer_conv, "Analytic cost of `primer_conv` is not supported."
+
+    d_model, d_embed, d_head, n_head = hf_config.d_model, hf_config.d_embed, hf_config.d_head, hf_config.n_head
+    seq_len = seq_len or config["max_sequence_length"]
+    num_tokens = batch_size * seq_len
+
+    cutoff_ends = [0] + hf_config.cutoffs + [hf_config.vocab_size]
+    cluster_sizes = [right - left for left, right in zip(cutoff_ends[:-1], cutoff_ends[1:])]
+    emb_dims = [d_embed // (hf_config.div_val**i) for i in range(len(cluster_sizes))]
+
+    # Adaptive input embeddings, whose projections are shared with the adaptive softmax if `tie_projs`.
+    # Only the projection of the head cluster is counted, as the cluster of each token depends on the input
+    if hf_config.div_val == 1:
+        costs = [AnalyticCost(hf_config.vocab_size * d_embed, 0, 0)]
+        if d_model != d_embed:
+            costs += [_linear_cost(d_embed, d_model, num_tokens, bias=False)]
+    else:
+        costs = [
+            AnalyticCost(sum(size * dim + d_model * dim for size, dim in zip(cluster_sizes, emb_dims)), 0, 0),
+            _linear_cost(emb_dims[0], d_model, num_tokens, bias=False)._replace(params=0),
+        ]
+
+    # Keys and values also attend to the memory, which is zero-initialized in the first forward pass
+    key_len = seq_len + hf_config.mem_len
+
+    for _ in range(hf_config.n_layer):
+        costs += [
+            _linear_cost(d_model, 3 * n_head * d_head, batch_size * key_len, bias=False),
+            # Projection of the relative positional embeddings
+            _linear_cost(d_model, n_head * d_head, key_len, bias=False),
+            # Content-based and position-based attention scores
+            _attention_cost(n_head, d_head, seq_len, key_len, batch_size),
+            AnalyticCost(
+                2 * n_head * d_head if hf_config.untie_r else 0,
+                2 * batch_size * n_head * seq_len * key_len * d_head,
+                batch_size * n_head * seq_len * key_len * d_head,
+            ),
+            _linear_cost(n_head * d_head, d_model, num_tokens, bias=False),
+            _layer_norm_cost(d_model, num_tokens),
+            _linear_cost(d_model, hf_config.d_inner, num_tokens),
+            _elementwise_cost(num_tokens * hf_config.d_inner),
+            _linear_cost(hf_config.d_inner, d_model, num_tokens),
+            _layer_norm_cost(d_model, num_tokens),
+        ]
+
+    if not hf_config.untie_r:
+        costs += [AnalyticCost(2 * n_head * d_head, 0, 0)]
+
+    # Adaptive softmax, whose output layers are tied to the input embeddings
+    num_clusters = len(cluster_sizes) - 1
+    out_projs_params = sum(
+        d_model * dim for dim, tie_proj in zip(emb_dims, hf_config.tie_projs) if not tie_proj or hf_config.div_val == 1
+    )
+    costs += [AnalyticCost(num_clusters * (emb_dims[0] + 1) + hf_config.vocab_size + out_projs_params, 0, 0)]
+
+    # Without labels, log-probabilities are computed for all clusters, where the head cluster
+    # also predicts the remaining clusters
+    for i, (cluster_size, dim) in enumerate(zip(cluster_sizes, emb_dims)):
+        costs += [
+            _linear_cost(d_model, dim, num_tokens, bias=False)._replace(params=0),
+            _linear_cost(dim, cluster_size + (num_clusters if i == 0 else 0), num_tokens)._replace(params=0),
+        ]
+
+    return _sum_costs(*costs)
+
+
+# Operations of `TfppSearchSpace` supported by `_tfpp_op_cost`
+TFPP_SUPPORTED_OPS = [
+    "mha",
+    "flash_mha",
+    "causal_self_attn",
+    "local_attn",
+    "sep_conv1d",
+    "sgconv",
+    "sgconv3",
+    "lsh_attn",
+]
+
+
+def _tfpp_op_cost(
+    op_name: str,
+    op_config: Dict[str, Any],
+    hidden_size: int,
+    total_heads: int,
+    op_heads: int,
+    batch_size: int,
+    seq_len: int,
+    max_position_embeddings: int,
+) -> AnalyticCost:
+    head_size = hidden_size // total_heads
+    op_size = head_size * op_heads
+    num_tokens = batch_size * seq_len
+
+    if op_name in ["mha", "flash_mha"]:
+        return _sum_costs(
+            _linear_cost(hidden_size, 3 * op_size, num_tokens),
+            _attention_cost(op_heads, head_size, seq_len, seq_len, batch_size),
+        )
+
+    if op_name == "causal_self_attn":
+        return _sum_costs(
+            _linear_cost(hidden_size, 3 * op_size, num_tokens, bias=False),
+            _attention_cost(op_heads, head_size, seq_len, seq_len, batch_size),
+        )
+
+    if op_name == "local_attn":
+        # Each query attends to its own window and the previous one
+        window_size = op_config["window_size"]
+        return _sum_costs(
+            _linear_cost(hidden_size, 3 * op_size, num_tokens, bias=False),
+            _attention_cost(op_heads, head_size, seq_len, min(2 * window_size, seq_len), batch_size),
+        )
+
+    if op_name == "sep_conv1d":
+        # Depthwise convolution padded with `kernel_size - 1` elements on both sides
+        kernel_size = op_config["kernel_size"]
+        conv_macs = batch_size * (seq_len + kernel_size - 1) * op_size * kernel_size
+        return _sum_costs(
+            _linear_cost(hidden_size, op_size, num_tokens),
+            AnalyticCost(op_size * kernel_size + op_size, 2 * conv_macs, conv_macs),
+            _elementwise_cost(2 * num_tokens * op_size),
+        )
+
+    if op_name in ["sgconv", "sgconv3"]:
+        # Gated input projection and (non-fused) FFT convolutions, followed by the GELU activations
+        # and the output projection. Kernels are built once per forward pass, so their cost is not counted
+        kernel_size = op_config["kernel_size"]
+        costs = [
+            _linear_cost(hidden_size, 2 * op_size, num_tokens),
+            _elementwise_cost(num_tokens * op_size),
+            _elementwise_cost(num_tokens * op_size),
+            _linear_cost(op_size, op_size, num_tokens),
+            _elementwise_cost(num_tokens * op_size),
+        ]
+
+        if op_name == "sgconv":
+            return _sum_costs(
+                *costs,
+                AnalyticCost(op_size + _gconv_kernel_params(op_size, kernel_size, max_position_embeddings), 0, 0),
+                _fft_conv_cost(op_size, op_size, seq_len, batch_size),
+            )
+
+        # Keys are convolved before their outer product with the values (`op_heads` x `op_heads` per head),
+        # which is convolved and contracted with the queries. `pw_linear` is created but not used
+        kv_channels = op_heads * op_size
+        return _sum_costs(
+            *costs,
+            AnalyticCost(
+                op_size
+                + head_size
+                + _gconv_kernel_params(op_size, kernel_size, max_position_embeddings)
+                + _gconv_kernel_params(head_size, kernel_size, max_position_embeddings),
+                0,
+                0,
+            ),
+            _linear_cost(op_size, 3 * op_size, num_tokens),
+            AnalyticCost(op_size * op_size + op_size, 0, 0),
+            _fft_conv_cost(op_size, op_size, seq_len, batch_size),
+            _elementwise_cost(num_tokens * kv_channels),
+            _fft_conv_cost(kv_channels, head_size, seq_len, batch_size),
+            _elementwise_cost(2 * num_tokens * kv_channels),
+        )
+
+    if op_name == "lsh_attn":
+        # Inputs are padded to a multiple of the bucket size and normalized before the projections
+        # and rotary embeddings, while the output projection is replaced by the identity
+        bucket_size, num_hashes = op_config["bucket_size"], op_config["num_hashes"]
+        padded_len = -(-seq_len // bucket_size) * bucket_size
+        padded_tokens = batch_size * padded_len
+
+        costs = [
+            _layer_norm_cost(hidden_size, padded_tokens),
+            _linear_cost(hidden_size, 2 * op_size, padded_tokens, bias=False),
+            _elementwise_cost(3 * padded_tokens * op_size),
+        ]
+
+        if padded_len <= bucket_size:
+            return _sum_costs(
+                *costs,
+                _elementwise_cost(2 * padded_tokens * op_size),
+                _attention_cost(op_heads, head_size, padded_len, padded_len, batch_size),
+            )
+
+        # Keys are hashed with random rotations and sorted by bucket, so each hash round attends within
+        # its chunk and the previous one, and hash rounds are combined by their log-sum-exp weights
+        num_rotations = _lsh_num_rotations(padded_len, bucket_size)
+        hash_macs = num_hashes * padded_tokens * op_size * (num_rotations // 2)
+        costs += [
+            AnalyticCost(0, 2 * hash_macs, hash_macs),
+            _elementwise_cost(2 * num_hashes * padded_tokens * op_size),
+            _attention_cost(op_heads, head_size, num_hashes * padded_len, 2 * bucket_size, batch_size),
+        ]
+
+        if num_hashes > 1:
+            costs += [_elementwise_cost(3 * num_hashes * padded_tokens * op_size)]
+
+        return _sum_costs(*costs)
+
+    raise ValueError(f"Analytic cost of `{op_name}` is not supported.")
+
+
+@register_cost_model("tfpp")
+def tfpp_cost(
+    config: Any, batch_size: Optional[int] = 1, seq_len: Optional[int] = None, **hf_config_kwargs
+) -> AnalyticCost:
+    """Cost of a configuration from the Transformer++ (`TfppSearchSpace`) search space.
+
+    Supports the `gpt2` and `codegen` backbones with all operations of `TfppSearchSpace`. FFT convolutions
+    (`sgconv` and `sgconv3`) assume the non-fused implementation.
+
+    Args:
+        config: Architecture configuration (`ArchConfig` or dictionary).
+        batch_size: Batch size of the input.
+        seq_len: Sequence length of the input. If `None`, uses the maximum number of positions.
+        hf_config_kwargs: Additional arguments of the backbone configuration, which should match
+            the ones passed to `TfppSearchSpace` (e.g., `vocab_size`, `n_positions`).
+
+    Returns:
+        Cost of the architecture.
+
+    """
+
+    from archai.discrete_search.search_spaces.nlp.tfpp.backbones import CONFIGS
+
+    # Converts to a dictionary, so parameters are not recorded as used by the model
+    if hasattr(config, "to_dict"):
+        config = config.to_dict(remove_metadata_info=True)
+
+    backbone = config.get("backbone", "codegen")
+    assert backbone in ["codegen", "gpt2"], f"Analytic cost of `{backbone}` backbone is not supported."
+
+    hf_config = CONFIGS[backbone](**hf_config_kwargs)
+    hidden_size = config["hidden_size"]
+    seq_len = seq_len or hf_config.max_position_embeddings
+    num_tokens = batch_size * seq_len
+
+    costs = [AnalyticCost(hf_config.vocab_size * hidden_size, 0, 0)]
+    if backbone == "gpt2":
+        costs += [AnalyticCost(hf_config.max_position_embeddings * hidden_size, 0, 0)]
+
+    for layer_config in config["hidden_layers"]:
+        total_heads = layer_config["total_heads"]
+
+        for op_name, op_prop in layer_config["op_allocation"]:
+            op_heads = round(total_heads * op_prop)
+
+            if op_heads > 0:
+                costs += [
+                    _tfpp_op_cost(
+                        op_name,
+                        layer_config.get(op_name, {}),
+                        hidden_size,
+                        total_heads,
+                        op_heads,
+                        batch_size,
+                        seq_len,
+                        hf_config.max_position_embeddings,
+                    )
+                ]
+
+        costs += [
+            _linear_cost(hidden_size, hidden_size, num_tokens),
+            _layer_norm_cost(hidden_size, num_tokens),
+            _linear_cost(hidden_size, layer_config["d_inner"], num_tokens),
+            _elementwise_cost(num_tokens * layer_config["d_inner"]),
+            _linear_cost(layer_config["d_inner"], hidden_size, num_tokens),
+            _elementwise_cost(2 * num_tokens * hidden_size),
+        ]
+
+        # GPT-2 blocks normalize before the attention and MLP, while CodeGen blocks share a single normalization
+        if backbone == "gpt2":
+            costs += [_layer_norm_cost(hidden_size, num_tokens)]
+
+    # CodeGen has an untied language modeling head with bias
+    lm_head = _linear_cost(hidden_size, hf_config.vocab_size, num_tokens, bias=(backbone == "codegen"))
+    if backbone == "gpt2":
+        lm_head = lm_head._replace(params=0)
+
+    costs += [_layer_norm_cost(hidden_size, num_tokens), lm_head]
+
+    return _sum_costs(*costs)
+
+
+def _segmentation_op_cost(
+    op_name: str, in_ch: int, out_ch: int, stride: int, out_size: Tuple[int, int], batch_size: int
+) -> AnalyticCost:
+    kernel_size = int(op_name[-1]) if op_name.startswith("conv") else int(op_name.split("x")[1].split("_")[0])
+    num_outputs = batch_size * out_size[0] * out_size[1]
+
+    if op_name.startswith("conv"):
+        return _sum_costs(
+            _conv2d_cost(in_ch, out_ch, kernel_size, out_size, batch_size),
+            # Batch normalization (2 FLOPs per element in evaluation mode, 4 parameters with running statistics)
+            AnalyticCost(2 * out_ch, 2 * num_outputs * out_ch, 0),
+            _elementwise_cost(num_outputs * out_ch),
+        )
+
+    expand_ratio = int(op_name.split("_e")[1])
+    exp_ch = in_ch * expand_ratio
+    in_size = (out_size[0] * stride, out_size[1] * stride)
+
+    costs = []
+    if expand_ratio != 1:
+        costs += [
+            _conv2d_cost(in_ch, exp_ch, 1, in_size, batch_size),
+            AnalyticCost(2 * exp_ch, 2 * batch_size * in_size[0] * in_size[1] * exp_ch, 0),
+        ]
+
+    costs += [
+        _conv2d_cost(exp_ch, exp_ch, kernel_size, out_size, batch_size, groups=exp_ch),
+        AnalyticCost(2 * exp_ch, 3 * num_outputs * exp_ch, 0),
+        _conv2d_cost(exp_ch, out_ch, 1, out_size, batch_size),
+        AnalyticCost(2 * out_ch, 2 * num_outputs * out_ch, 0),
+    ]
+
+    return _sum_costs(*costs)
+
+
+@register_cost_model("segmentation-dag")
+def segmentation_dag_cost(
+    config: Dict[str, Any],
+    img_size: Optional[Tuple[int, int]] = (256, 256),
+    nb_classes: Optional[int] = 19,
+    stem_stride: Optional[int] = 2,
+    batch_size: Optional[int] = 1,
+) -> AnalyticCost:
+    """Cost of a configuration from the segmentation DAG search space.
+
+    Args:
+        config: Configuration with `architecture`, `channels_per_scale` and `post_upsample_layers`
+            (see `SegmentationDagModel.to_config`).
+        img_size: Image size (width, height).
+        nb_classes: Number of classes for segmentation.
+        stem_stride: Stride of the first convolution.
+        batch_size: Batch size of the input.
+
+    Returns:
+        Cost of the architecture.
+
+    """
+
+    from archai.discrete_search.search_spaces.cv.segmentation_dag.model import (
+        SegmentationDagModel,
+    )
+
+    graph = {node["name"]: node for node in config["architecture"]}
+    ch_per_scale = SegmentationDagModel._get_channels_per_scale(config["channels_per_scale"])
+
+    width, height = img_size
+    res = (height // stem_stride, width // stem_stride)
+
+    stem_ch = ch_per_scale[graph["input"]["scale"]]
+    costs = [_segmentation_op_cost("conv3x3", 3, stem_ch, stem_stride, res, batch_size)]
+
+    for node in graph.values():
+        out_scale = node["scale"]
+        out_ch = ch_per_scale[out_scale]
+
+        for in_node in node["inputs"] or []:
+            in_scale, op_name = graph[in_node]["scale"], graph[in_node]["op"]
+            in_ch = ch_per_scale[in_scale]
+
+            # Downsampling edges use a strided operation, while upsampling edges use nearest interpolation
+            stride = max(out_scale // in_scale, 1)
+            op_scale = max(out_scale, in_scale) if stride > 1 else in_scale
+            op_size = (res[0] // op_scale, res[1] // op_scale)
+
+            costs += [
+                _segmentation_op_cost(op_name, in_ch, out_ch, stride, op_size, batch_size),
+                _elementwise_cost(batch_size * out_ch * (res[0] // out_scale) * (res[1] // out_scale)),
+            ]
+
+    output_ch = ch_per_scale[graph["output"]["scale"]]
+    for i in range(config.get("post_upsample_layers", 1)):
+        in_ch = output_ch if i == 0 else ch_per_scale[1]
+        costs += [_segmentation_op_cost("conv3x3", in_ch, ch_per_scale[1], 1, (height, width), batch_size)]
+
+    costs += [_conv2d_cost(stem_ch, nb_classes, 1, (height, width), batch_size)]
+
+    return _sum_costs(*costs)
+
+
+class AnalyticNumParameters(ModelEvaluator):
+    """Total number of parameters, computed analytically from the architecture configuration."""
+
+    model_input = "config"
+
+    def __init__(self, cost_model: str, **cost_model_kwargs) -> None:
+        """Initialize the evaluator.
+
+        Args:
+            cost_model: Name of a registered cost model (e.g., `gpt2`, `mem-transformer`,
+                `tfpp` or `segmentation-dag`).
+            cost_model_kwargs: Additional arguments passed to the cost model.
+
+        """
+
+        assert cost_model in ANALYTIC_COST_MODELS, f"Cost model {cost_model} is not registered."
+
+        # Fails before the search starts if some of the architectures can not be costed
+        if cost_model == "tfpp":
+            from archai.discrete_search.search_spaces.nlp.tfpp.ops import OPS
+
+            unsupported_ops = [op_name for op_name in OPS if op_name not in TFPP_SUPPORTED_OPS]
+            if unsupported_ops:
+                raise ValueError(f"Analytic cost of {unsupported_ops} is not supported.")
+
+        if cost_model == "mem-transformer" and cost_model_kwargs.get("primer_conv", False):
+            raise ValueError("Analytic cost of `primer_conv` is not supported.")
+
+        self.cost_model = cost_model
+        self.cost_model_kwargs = cost_model_kwargs
+
+    def _get_cost(self, model: ArchaiModel) -> AnalyticCost:
+        return get_analytic_cost(self.cost_model, model.metadata["config"], **self.cost_model_kwargs)
+
+    @overrides
+    def evaluate(self, model: ArchaiModel, budget: Optional[float] = None) -> float:
+        return self._get_cost(model).params
+
+
+class AnalyticFlops(AnalyticNumParameters):
+    """Total number of FLOPs, computed analytically from the architecture configuration."""
+
+    @overrides
+    def evaluate(self, model: ArchaiModel, budget: Optional[float] = None) -> float:
+        return self._get_cost(model).flops
+
+
+class AnalyticMacs(AnalyticNumParameters):
+    """Total number of MACs, computed analytically from the architecture configuration."""
+
+    @overrides
+    def evaluate(self, model: ArchaiModel, budget: Optional[float] = None) -> float:
+        return self._get_cost(model).macs
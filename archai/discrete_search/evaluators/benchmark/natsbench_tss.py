@@ -17,6 +17,9 @@ from archai.discrete_search.search_spaces.benchmark.natsbench_tss import (
 class NatsbenchMetric(ModelEvaluator):
     """Evaluate a model using a metric from the NATS-Bench API."""
 
+    # Metrics are looked up by `archid`, so `arch` is never read
+    model_input = "config"
+
     def __init__(
         self,
         search_space: NatsbenchTssSearchSpace,
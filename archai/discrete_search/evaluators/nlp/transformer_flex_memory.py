@@ -24,6 +24,9 @@ TMP_FOLDER = pathlib.Path("tmp")
 class TransformerFlexOnnxMemory(ModelEvaluator):
     """Measure the memory usage of models from the Transformer-Flex search space."""
 
+    # Models are rebuilt from `metadata['config']`, so `arch` is never read
+    model_input = "config"
+
     def __init__(
         self,
         search_space: TransformerFlexSearchSpace,
@@ -0,0 +1,119 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT license.
+
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Dict, List, Optional, Union
+
+from overrides import overrides
+
+from archai.discrete_search.api.archai_model import ArchaiModel
+from archai.discrete_search.api.model_evaluator import (
+    AsyncModelEvaluator,
+    ModelEvaluator,
+)
+
+
+def _evaluate(obj: ModelEvaluator, arch: ArchaiModel, budget: Optional[float] = None) -> float:
+    return obj.evaluate(arch, budget)
+
+
+def _get_result(future: Future) -> Optional[float]:
+    # Cancelled jobs are fetched with `None` results
+    return None if future.cancelled() else future.result()
+
+
+class ProcessParallelEvaluator(AsyncModelEvaluator):
+    """Wraps a `ModelEvaluator` object into an `AsyncModelEvaluator` with parallel execution
+    using a local pool of processes.
+
+    `ProcessParallelEvaluator` is an alternative to `RayParallelEvaluator` for machines without Ray.
+    It also expects a stateless objective function as input, and both `obj` and the evaluated
+    models must be picklable, since they are sent to the worker processes.
+
+    """
+
+    def __init__(
+        self,
+        obj: ModelEvaluator,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        mp_context: Optional[str] = None,
+    ) -> None:
+        """Initialize the evaluator.
+
+        Args:
+            obj: A `ModelEvaluator` object.
+            max_workers: Maximum number of worker processes. If `None`, uses the number of processors.
+            timeout: Timeout for receiving results in `fetch_all`. If None, waits indefinitely
+                for results. If timeout is reached, then incomplete tasks are canceled and returned
+                as None. Tasks that already started can not be stopped and keep running in the background.
+            mp_context: Start method of the worker processes (`fork`, `spawn` or `forkserver`).
+                If `None`, uses the default start method of the platform.
+
+        """
+
+        assert isinstance(obj, ModelEvaluator)
+
+        self.obj = obj
+        self.timeout = timeout
+
+        self.executor = ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context(mp_context) if mp_context else None
+        )
+        self.futures = []
+
+        # Jobs not yet returned by `fetch_ready`, mapped to their position in `futures`
+        self.pending_futures = {}
+
+    @overrides
+    def send(self, arch: ArchaiModel, budget: Optional[float] = None) -> int:
+        future = self.executor.submit(_evaluate, self.obj, arch, budget)
+
+        self.pending_futures[future] = len(self.futures)
+        self.futures.append(future)
+
+        return self.pending_futures[future]
+
+    @overrides
+    def fetch_all(self) -> List[Union[float, None]]:
+        complete_futures, incomplete_futures = wait(self.futures, timeout=self.timeout)
+
+        # Cancels incomplete jobs
+        for future in incomplete_futures:
+            future.cancel()
+
+        results = [_get_result(future) if future in complete_futures else None for future in self.futures]
+
+        # Resets evaluator state
+        self.futures = []
+        self.pending_futures = {}
+
+        return results
+
+    @overrides
+    def fetch_ready(self, timeout: Optional[float] = None) -> Dict[int, Optional[float]]:
+        if not self.pending_futures:
+            return {}
+
+        complete_futures, _ = wait(list(self.pending_futures), timeout=timeout, return_when=FIRST_COMPLETED)
+        results = {self.pending_futures.pop(future): _get_result(future) for future in complete_futures}
+
+        # Resets evaluator state once all jobs are fetched
+        if not self.pending_futures:
+            self.futures = []
+
+        return results
+
+    @overrides
+    def pending_jobs(self) -> List[int]:
+        return sorted(self.pending_futures.values())
+
+    @overrides
+    def cancel(self, job_idx: int) -> bool:
+        future = self.futures[job_idx] if job_idx < len(self.futures) else None
+        if future not in self.pending_futures:
+            return False
+
+        # Jobs that already started can not be cancelled
+        return future.cancel()
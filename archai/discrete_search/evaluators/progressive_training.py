@@ -13,6 +13,7 @@ from archai.discrete_search.api.model_evaluator import (
     ModelEvaluator,
 )
 from archai.discrete_search.api.search_space import DiscreteSearchSpace
+from archai.discrete_search.evaluators.ray import _get_results
 from archai.common.file_utils import TemporaryFiles
 
 
@@ -97,16 +98,45 @@ class RayProgressiveTraining(AsyncModelEvaluator):
         # Ray training job object refs
         self.results_ref = []
 
+        # Jobs not yet returned by `fetch_ready`, mapped to their position in `results_ref`
+        self.pending_refs = {}
+
         # Training state buffer (e.g optimizer state) for each architecture id
         self.training_states = {}
 
     @overrides
-    def send(self, arch: ArchaiModel, budget: Optional[float] = None) -> None:
+    def send(self, arch: ArchaiModel, budget: Optional[float] = None) -> int:
         # Stores original model reference
         self.models.append(arch)
 
         current_tr_state = self.training_states.get(arch.archid, None)
-        self.results_ref.append(self.compute_fn.remote(arch, self.dataset, budget, current_tr_state))
+        ref = self.compute_fn.remote(arch, self.dataset, budget, current_tr_state)
+
+        self.pending_refs[ref] = len(self.results_ref)
+        self.results_ref.append(ref)
+
+        return self.pending_refs[ref]
+
+    def _sync_job_results(
+        self, job_id: int, job_results: Optional[Tuple[ArchaiModel, float, Dict[str, Any]]]
+    ) -> Optional[float]:
+        if not job_results:
+            return None
+
+        trained_model, job_metric, training_state = job_results
+
+        # Syncs model weights
+        # On windows you cannot open a named temporary file a second time.
+        temp_file_name = None
+        with TemporaryFiles() as tmp:
+            temp_file_name = tmp.get_temp_file()
+            self.search_space.save_model_weights(trained_model, temp_file_name)
+            self.search_space.load_model_weights(self.models[job_id], temp_file_name)
+
+        # Syncs training state
+        self.training_states[trained_model.archid] = training_state
+
+        return job_metric
 
     @overrides
     def fetch_all(self) -> List[Union[float, None]]:
@@ -132,27 +162,48 @@ class RayProgressiveTraining(AsyncModelEvaluator):
                 ray.cancel(incomplete_obj, force=self.force_stop)
 
         # Gathers metrics and syncs local references
-        metric_results = []
+        metric_results = [self._sync_job_results(job_id, job_results) for job_id, job_results in enumerate(results)]
 
-        for job_id, job_results in enumerate(results):
-            if job_results:
-                trained_model, job_metric, training_state = job_results
+        # Resets model and job buffers
+        self.models = []
+        self.results_ref = []
+        self.pending_refs = {}
 
-                # Syncs model weights
-                # On windows you cannot open a named temporary file a second time.
-                temp_file_name = None
-                with TemporaryFiles() as tmp:
-                    temp_file_name = tmp.get_temp_file()
-                    self.search_space.save_model_weights(trained_model, temp_file_name)
-                    self.search_space.load_model_weights(self.models[job_id], temp_file_name)
+        return metric_results
 
-                # Syncs training state
-                self.training_states[trained_model.archid] = training_state
+    @overrides
+    def fetch_ready(self, timeout: Optional[float] = None) -> Dict[int, Optional[float]]:
+        if not self.pending_refs:
+            return {}
 
-                metric_results.append(job_metric)
+        pending_refs = list(self.pending_refs)
 
-        # Resets model and job buffers
-        self.models = []
-        self.results_ref = []
+        # Waits for the first job, and then gathers every other job that is already complete
+        complete_objs, incomplete_objs = ray.wait(pending_refs, num_returns=1, timeout=timeout)
+        if incomplete_objs:
+            complete_objs += ray.wait(incomplete_objs, num_returns=len(incomplete_objs), timeout=0)[0]
+
+        metric_results = {}
+        for ref, job_results in zip(complete_objs, _get_results(complete_objs)):
+            job_id = self.pending_refs.pop(ref)
+            metric_results[job_id] = self._sync_job_results(job_id, job_results)
+
+        # Resets model and job buffers once all jobs are fetched
+        if not self.pending_refs:
+            self.models = []
+            self.results_ref = []
 
         return metric_results
+
+    @overrides
+    def pending_jobs(self) -> List[int]:
+        return sorted(self.pending_refs.values())
+
+    @overrides
+    def cancel(self, job_idx: int) -> bool:
+        ref = self.results_ref[job_idx] if job_idx < len(self.results_ref) else None
+        if ref not in self.pending_refs:
+            return False
+
+        ray.cancel(ref, force=self.force_stop)
+        return True
@@ -1,7 +1,7 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT license.
 
-from typing import Callable, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 
 import ray
 from overrides import overrides
@@ -13,6 +13,19 @@ from archai.discrete_search.api.model_evaluator import (
 )
 
 
+def _get_results(object_refs: List[ray.ObjectRef]) -> List[Any]:
+    results = []
+
+    # Cancelled jobs are fetched with `None` results
+    for ref in object_refs:
+        try:
+            results.append(ray.get(ref))
+        except ray.exceptions.TaskCancelledError:
+            results.append(None)
+
+    return results
+
+
 def _wrap_metric_calculate(class_method) -> Callable:
     def _calculate(arch: ArchaiModel, budget: Optional[float] = None) -> Callable:
         return class_method(arch, budget)
@@ -56,9 +69,17 @@ class RayParallelEvaluator(AsyncModelEvaluator):
         self.force_stop = force_stop
         self.object_refs = []
 
+        # Jobs not yet returned by `fetch_ready`, mapped to their position in `object_refs`
+        self.pending_refs = {}
+
     @overrides
-    def send(self, arch: ArchaiModel, budget: Optional[float] = None) -> None:
-        self.object_refs.append(self.compute_fn.remote(arch, budget))
+    def send(self, arch: ArchaiModel, budget: Optional[float] = None) -> int:
+        ref = self.compute_fn.remote(arch, budget)
+
+        self.pending_refs[ref] = len(self.object_refs)
+        self.object_refs.append(ref)
+
+        return self.pending_refs[ref]
 
     @overrides
     def fetch_all(self) -> List[Union[float, None]]:
@@ -86,5 +107,41 @@ class RayParallelEvaluator(AsyncModelEvaluator):
 
         # Resets metric state
         self.object_refs = []
+        self.pending_refs = {}
+
+        return results
+
+    @overrides
+    def fetch_ready(self, timeout: Optional[float] = None) -> Dict[int, Optional[float]]:
+        if not self.pending_refs:
+            return {}
+
+        pending_refs = list(self.pending_refs)
+
+        # Waits for the first job, and then gathers every other job that is already complete
+        complete_objs, incomplete_objs = ray.wait(pending_refs, num_returns=1, timeout=timeout)
+        if incomplete_objs:
+            complete_objs += ray.wait(incomplete_objs, num_returns=len(incomplete_objs), timeout=0)[0]
+
+        results = {
+            self.pending_refs.pop(ref): result for ref, result in zip(complete_objs, _get_results(complete_objs))
+        }
+
+        # Resets metric state once all jobs are fetched
+        if not self.pending_refs:
+            self.object_refs = []
 
         return results
+
+    @overrides
+    def pending_jobs(self) -> List[int]:
+        return sorted(self.pending_refs.values())
+
+    @overrides
+    def cancel(self, job_idx: int) -> bool:
+        ref = self.object_refs[job_idx] if job_idx < len(self.object_refs) else None
+        if ref not in self.pending_refs:
+            return False
+
+        ray.cancel(ref, force=self.force_stop)
+        return True
@@ -70,6 +70,11 @@ class RemoteAzureBenchmarkEvaluator(AsyncModelEvaluator):
         # Architecture list
         self.archids = []
 
+        # Jobs not yet returned by `fetch_ready`, and jobs that failed before
+        # reaching the remote benchmark or were cancelled
+        self.pending_archids = {}
+        self.failed_jobs = set()
+
         # Test connection string works
         unknown_id = str(uuid.uuid4())
         _ = self.store.get_existing_status(unknown_id)
@@ -84,8 +89,32 @@ class RemoteAzureBenchmarkEvaluator(AsyncModelEvaluator):
         if changed:
             self.store.update_status_entity(entity)
 
+    def _add_job(self, archid: str) -> int:
+        self.pending_archids[len(self.archids)] = archid
+        self.archids.append(archid)
+
+        return len(self.archids) - 1
+
+    def _get_job_result(self, archid: str) -> Tuple[bool, Optional[float]]:
+        entity = self.store.get_existing_status(archid)
+        if entity is None:
+            return False, None
+
+        result = entity[self.metric_key] if self.metric_key in entity and entity[self.metric_key] else None
+
+        if "error" in entity:
+            error = entity["error"]
+            print(f"Skipping architecture {archid} because of remote error: {error}")
+            return True, result
+
+        if entity["status"] == "complete":
+            print(f"Architecture {archid} is complete with {self.metric_key}={result}")
+            return True, result
+
+        return False, result
+
     @overrides
-    def send(self, arch: ArchaiModel, budget: Optional[float] = None) -> None:
+    def send(self, arch: ArchaiModel, budget: Optional[float] = None) -> int:
         # bug in azure ml sdk requires blob store folder names not begin with digits, so we prefix with 'id_'
         archid = f'id_{arch.archid}'
 
@@ -96,9 +125,8 @@ class RemoteAzureBenchmarkEvaluator(AsyncModelEvaluator):
                 if self.metric_key in entity:
                     if self.verbose:
                         value = entity[self.metric_key]
-                        self.archids.append(archid)
                         print(f"Entry for {archid} already exists with {self.metric_key} = {value}")
-                    return
+                    return self._add_job(archid)
                 else:
                     # force quantization to happen again in case the model has been retrained.
                     self._reset(entity)
@@ -106,8 +134,7 @@ class RemoteAzureBenchmarkEvaluator(AsyncModelEvaluator):
                 # job is still running, let it continue
                 if self.verbose:
                     print(f"Job for {archid} is running...")
-                self.archids.append(archid)
-                return
+                return self._add_job(archid)
 
         entity = self.store.get_status(archid)  # this is a get or create operation.
         if self.benchmark_only:
@@ -146,20 +173,26 @@ class RemoteAzureBenchmarkEvaluator(AsyncModelEvaluator):
             blobs = self.store.list_blobs(f'{self.experiment_name}/{archid}/model.onnx')
             if len(blobs) < 1:
                 print(f"model.onnx is missing for architecture {archid}")
-                return
+
+                job_idx = self._add_job(archid)
+                self.failed_jobs.add(job_idx)
+
+                return job_idx
             else:
                 entity['status'] = 'ready'
 
         self.store.unlock_entity(entity)
-        self.archids.append(archid)
+        job_idx = self._add_job(archid)
 
         if self.verbose:
             print(f"Sent {archid} to Remote Benchmark")
 
+        return job_idx
+
     @overrides
     def fetch_all(self) -> List[Union[float, None]]:
         results = [None] * len(self.archids)
-        completed = [False] * len(self.archids)
+        completed = [i in self.failed_jobs for i in range(len(self.archids))]
 
         # retries defines how long we wait for progress, as soon as we see something complete we
         # reset this counter because we are making progress.
@@ -169,19 +202,9 @@ class RemoteAzureBenchmarkEvaluator(AsyncModelEvaluator):
         while retries > 0:
             for i, archid in enumerate(self.archids):
                 if not completed[i]:
-                    entity = self.store.get_existing_status(archid)
-                    if entity is not None:
-                        if self.metric_key in entity and entity[self.metric_key]:
-                            results[i] = entity[self.metric_key]
-                        if "error" in entity:
-                            error = entity["error"]
-                            print(f"Skipping architecture {archid} because of remote error: {error}")
-                            completed[i] = True
-                            retries = self.max_retries
-                        elif entity["status"] == "complete":
-                            print(f"Architecture {archid} is complete with {self.metric_key}={ results[i]}")
-                            completed[i] = True
-                            retries = self.max_retries
+                    completed[i], results[i] = self._get_job_result(archid)
+                    if completed[i]:
+                        retries = self.max_retries
 
             if all(completed):
                 break
@@ -212,4 +235,49 @@ class RemoteAzureBenchmarkEvaluator(AsyncModelEvaluator):
 
         # Resets state
         self.archids = []
+        self.pending_archids = {}
+        self.failed_jobs = set()
+        return results
+
+    @overrides
+    def fetch_ready(self, timeout: Optional[float] = None) -> Dict[int, Optional[float]]:
+        deadline = time.time() + timeout if timeout is not None else None
+        results = {}
+
+        while self.pending_archids:
+            for job_idx, archid in self.pending_archids.items():
+                if job_idx in self.failed_jobs:
+                    results[job_idx] = None
+                else:
+                    completed, result = self._get_job_result(archid)
+                    if completed:
+                        results[job_idx] = result
+
+            if results or (deadline is not None and time.time() >= deadline):
+                break
+
+            remaining_time = max(deadline - time.time(), 0) if deadline is not None else self.retry_interval
+            time.sleep(min(self.retry_interval, remaining_time))
+
+        for job_idx in results:
+            self.pending_archids.pop(job_idx)
+
+        # Resets state once all jobs are fetched
+        if not self.pending_archids:
+            self.archids = []
+            self.failed_jobs = set()
+
         return results
+
+    @overrides
+    def pending_jobs(self) -> List[int]:
+        return sorted(self.pending_archids)
+
+    @overrides
+    def cancel(self, job_idx: int) -> bool:
+        # Remote benchmarks can not be stopped, so their results are just discarded
+        if job_idx not in self.pending_archids or job_idx in self.failed_jobs:
+            return False
+
+        self.failed_jobs.add(job_idx)
+        return True
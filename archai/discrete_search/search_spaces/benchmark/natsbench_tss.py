@@ -4,8 +4,9 @@
 import random
 import re
 import warnings
+from functools import partial
 from pathlib import Path
-from typing import Any, List, Optional
+from typing import Any, Callable, List, Optional
 
 import nats_bench
 import numpy as np
@@ -96,6 +97,12 @@ class NatsbenchTssSearchSpace(EvolutionarySearchSpace, BayesOptSearchSpace):
         config = self.api.get_net_config(natsbench_id, self.base_dataset)
         return self.get_cell_based_tiny_net(config)
 
+    def _get_model_builder(self, natsbench_id: int) -> Callable[[], Any]:
+        # Builder only captures the network configuration, so lazy models can be
+        # pickled (e.g., sent to other processes) without the NATS-Bench API
+        config = self.api.get_net_config(natsbench_id, self.base_dataset)
+        return partial(NatsbenchTssSearchSpace.get_cell_based_tiny_net, config)
+
     @overrides
     def save_arch(self, model: ArchaiModel, path: str) -> None:
         yaml.safe_dump({"archid": model.archid, **model.metadata}, open(path, "w", encoding="utf-8"))
@@ -117,9 +124,10 @@ class NatsbenchTssSearchSpace(EvolutionarySearchSpace, BayesOptSearchSpace):
         idx = int(natsbenchid.group(1))
 
         return ArchaiModel(
-            arch=self.model_from_natsbench_tss(idx),
+            arch=None,
             archid=f"natsbench-tss-{idx}",
             metadata={"dataset": self.base_dataset},
+            builder=self._get_model_builder(idx),
         )
 
     @overrides
@@ -135,9 +143,10 @@ class NatsbenchTssSearchSpace(EvolutionarySearchSpace, BayesOptSearchSpace):
         idx = self.rng.randint(0, len(self.api))
 
         return ArchaiModel(
-            arch=self.model_from_natsbench_tss(idx),
+            arch=None,
             archid=f"natsbench-tss-{idx}",
             metadata={"dataset": self.base_dataset},
+            builder=self._get_model_builder(idx),
         )
 
     @overrides
@@ -170,9 +179,10 @@ class NatsbenchTssSearchSpace(EvolutionarySearchSpace, BayesOptSearchSpace):
         mutation_natsbenchid = self.api.archstr2index[mutation_str]
 
         return ArchaiModel(
-            arch=self.model_from_natsbench_tss(mutation_natsbenchid),
+            arch=None,
             archid=f"natsbench-tss-{mutation_natsbenchid}",
             metadata={"dataset": self.base_dataset},
+            builder=self._get_model_builder(mutation_natsbenchid),
         )
 
     @overrides
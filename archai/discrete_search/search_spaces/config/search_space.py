@@ -2,6 +2,7 @@
 # Licensed under the MIT license.
 
 import hashlib
+from functools import partial
 from random import Random
 from typing import Any, Callable, Dict, List, Optional, Type, Union
 
@@ -47,6 +48,7 @@ class ConfigSearchSpace(EvolutionarySearchSpace, BayesOptSearchSpace):
             seed (int, optional): Random seed used for sampling, mutations and crossovers. Defaults to None.
             mutation_prob (float, optional): Probability of mutating a parameter. Defaults to 0.3.
             track_unused_params (bool, optional): Whether to track unused parameters. Defaults to True.
+                If False, models are only built when `ArchaiModel.arch` is first accessed.
             unused_param_value (int, optional): Value to use for unused parameters. Defaults to `float('NaN')`.
             hash_archid (bool, optional): Weather to hash architecture identifiers. Defaults to True.
             model_kwargs: Additional arguments to pass to `model_cls` constructor.
@@ -86,6 +88,20 @@ class ConfigSearchSpace(EvolutionarySearchSpace, BayesOptSearchSpace):
 
         return archid
 
+    def _get_model(self, arch_config: ArchConfig) -> ArchaiModel:
+        builder = partial(self.model_cls, arch_config, **self.model_kwargs)
+
+        # Unused parameters are only known after the model is built, thus it needs to be
+        # built before the architecture identifier is computed
+        if self.track_unused_params:
+            return ArchaiModel(arch=builder(), archid=self.get_archid(arch_config), metadata={"config": arch_config})
+
+        # Otherwise, models are only built when `ArchaiModel.arch` is accessed, so candidates
+        # discarded by constraints or deduplication never allocate their weights
+        return ArchaiModel(
+            arch=None, archid=self.get_archid(arch_config), metadata={"config": arch_config}, builder=builder
+        )
+
     @overrides
     def save_arch(self, model: ArchaiModel, path: str) -> None:
         model.metadata["config"].to_file(path)
@@ -93,9 +109,7 @@ class ConfigSearchSpace(EvolutionarySearchSpace, BayesOptSearchSpace):
     @overrides
     def load_arch(self, path: str) -> ArchaiModel:
         config = ArchConfig.from_file(path)
-        model = self.model_cls(config, **self.model_kwargs)
-
-        return ArchaiModel(arch=model, archid=self.get_archid(config), metadata={"config": config})
+        return self._get_model(config)
 
     @overrides
     def save_model_weights(self, model: ArchaiModel, path: str) -> None:
@@ -108,9 +122,7 @@ class ConfigSearchSpace(EvolutionarySearchSpace, BayesOptSearchSpace):
     @overrides
     def random_sample(self) -> ArchaiModel:
         config = self.arch_param_tree.sample_config(self.rng)
-        model = self.model_cls(config, **self.model_kwargs)
-
-        return ArchaiModel(arch=model, archid=self.get_archid(config), metadata={"config": config})
+        return self._get_model(config)
 
     @overrides
     def mutate(self, model: ArchaiModel) -> ArchaiModel:
@@ -126,11 +138,7 @@ class ConfigSearchSpace(EvolutionarySearchSpace, BayesOptSearchSpace):
         )
 
         mutated_config = build_arch_config(mutated_dict)
-        mutated_model = self.model_cls(mutated_config, **self.model_kwargs)
-
-        return ArchaiModel(
-            arch=mutated_model, archid=self.get_archid(mutated_config), metadata={"config": mutated_config}
-        )
+        return self._get_model(mutated_config)
 
     @overrides
     def crossover(self, model_list: List[ArchaiModel]) -> ArchaiModel:
@@ -152,9 +160,7 @@ class ConfigSearchSpace(EvolutionarySearchSpace, BayesOptSearchSpace):
         )
 
         cross_config = build_arch_config(cross_dict)
-        cross_model = self.model_cls(cross_config, **self.model_kwargs)
-
-        return ArchaiModel(arch=cross_model, archid=self.get_archid(cross_config), metadata={"config": cross_config})
+        return self._get_model(cross_config)
 
     @overrides
     def encode(self, model: ArchaiModel) -> np.ndarray:
@@ -3,6 +3,7 @@
 
 import json
 from copy import deepcopy
+from functools import partial
 from hashlib import sha1
 from random import Random
 from typing import Any, Dict, List, Optional
@@ -180,9 +181,19 @@ class TransformerFlexSearchSpace(EvolutionarySearchSpace, BayesOptSearchSpace):
         arch_str = json.dumps(pruned_config, sort_keys=True, ensure_ascii=True)
         return f'{self.arch_type}_{sha1(arch_str.encode("ascii")).hexdigest()}'
 
+    def _get_model(self, config: Dict[str, Any]) -> ArchaiModel:
+        # Models are only built when `ArchaiModel.arch` is accessed, so candidates discarded
+        # by constraints or deduplication never allocate their weights
+        return ArchaiModel(
+            arch=None,
+            archid=self.get_archid(config),
+            metadata={"config": config},
+            builder=partial(self._load_model_from_config, deepcopy(config)),
+        )
+
     @overrides
     def random_sample(self) -> ArchaiModel:
-        model = None
+        is_valid = False
 
         # Fixed params
         config = {
@@ -191,7 +202,7 @@ class TransformerFlexSearchSpace(EvolutionarySearchSpace, BayesOptSearchSpace):
             "max_sequence_length": self.max_sequence_length,
         }
 
-        while model is None:
+        while not is_valid:
             config["n_layer"] = self.rng.randint(self.min_layers, self.max_layers)
 
             for param, param_opts in self.options.items():
@@ -200,10 +211,9 @@ class TransformerFlexSearchSpace(EvolutionarySearchSpace, BayesOptSearchSpace):
                 else:
                     config[param] = [self.rng.choice(param_opts["values"]) for _ in range(self.max_layers)]
 
-            if config["d_model"] % config["n_head"] == 0:
-                model = self._load_model_from_config(config)
+            is_valid = config["d_model"] % config["n_head"] == 0
 
-        return ArchaiModel(arch=model, archid=self.get_archid(config), metadata={"config": config})
+        return self._get_model(config)
 
     @overrides
     def save_arch(self, model: ArchaiModel, path: str) -> None:
@@ -223,11 +233,7 @@ class TransformerFlexSearchSpace(EvolutionarySearchSpace, BayesOptSearchSpace):
             f"Arch type value ({arch_type}) is different from the search space" f"arch type ({self.arch_type})."
         )
 
-        return ArchaiModel(
-            arch=self._load_model_from_config(arch_config),
-            archid=self.get_archid(arch_config),
-            metadata={"config": arch_config},
-        )
+        return self._get_model(arch_config)
 
     @overrides
     def save_model_weights(self, model: ArchaiModel, path: str) -> None:
@@ -254,9 +260,7 @@ class TransformerFlexSearchSpace(EvolutionarySearchSpace, BayesOptSearchSpace):
                     for c in config[param]
                 ]
 
-        return ArchaiModel(
-            arch=self._load_model_from_config(config), archid=self.get_archid(config), metadata={"config": config}
-        )
+        return self._get_model(config)
 
     @overrides
     def crossover(self, arch_list: List[ArchaiModel]) -> ArchaiModel:
@@ -274,7 +278,7 @@ class TransformerFlexSearchSpace(EvolutionarySearchSpace, BayesOptSearchSpace):
                 for layer in range(self.max_layers):
                     c0[param][layer] = self.rng.choice([c0[param][layer], c1[param][layer]])
 
-        return ArchaiModel(arch=self._load_model_from_config(c0), archid=self.get_archid(c0), metadata={"config": c0})
+        return self._get_model(c0)
 
     @overrides
     def encode(self, model: ArchaiModel) -> List[float]:
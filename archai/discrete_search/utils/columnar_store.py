@@ -0,0 +1,238 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT license.
+
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# Numeric array kinds (boolean, signed, unsigned and floating point) stored with their own dtype
+_NUMERIC_KINDS = "biuf"
+
+
+def _to_column(values: Any) -> np.ndarray:
+    """Converts a sequence of values to a one-dimensional column.
+
+    Args:
+        values: Sequence of values.
+
+    Returns:
+        Numeric array if all values are numbers, otherwise an object array.
+
+    """
+
+    array = np.asarray(values)
+    if array.ndim == 1 and array.dtype.kind in _NUMERIC_KINDS:
+        return array
+
+    # Values such as strings or lists are kept as Python objects
+    column = np.empty(len(values), dtype=object)
+    for i, value in enumerate(values):
+        column[i] = value
+
+    return column
+
+
+def _common_dtype(dtype: np.dtype, other_dtype: np.dtype) -> np.dtype:
+    if dtype.kind in _NUMERIC_KINDS and other_dtype.kind in _NUMERIC_KINDS:
+        return np.result_type(dtype, other_dtype)
+
+    return np.dtype(object)
+
+
+class ColumnarStore:
+    """Append-only columnar storage.
+
+    Columns are stored as preallocated NumPy arrays that grow geometrically, so appending
+    rows is amortized proportional to the number of appended rows. Rows can be saved as a
+    sequence of Parquet segments, where each segment only holds the rows appended since the
+    previous one, and loaded back with :meth:`load`.
+
+    """
+
+    def __init__(self, initial_capacity: Optional[int] = 1024) -> None:
+        """Initialize the store.
+
+        Args:
+            initial_capacity: Number of rows preallocated for each column.
+
+        """
+
+        self.num_rows = 0
+        self.num_saved_rows = 0
+        self.num_segments = 0
+
+        # Directory the saved rows belong to, set by `save_segment` and `load`
+        self._segments_directory = None
+
+        self._capacity = max(1, initial_capacity)
+        self._columns = {}
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._columns
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._columns[name][: self.num_rows]
+
+    @property
+    def column_names(self) -> List[str]:
+        """Return the column names, in order of creation."""
+
+        return list(self._columns.keys())
+
+    def _grow(self, num_rows: int) -> None:
+        if num_rows <= self._capacity:
+            return
+
+        self._capacity = max(num_rows, 2 * self._capacity)
+
+        for name, column in self._columns.items():
+            new_column = np.empty(self._capacity, dtype=column.dtype)
+            new_column[: self.num_rows] = column[: self.num_rows]
+            self._columns[name] = new_column
+
+    def _fill_missing(self, name: str, start: int, end: int) -> None:
+        # Missing numeric values are represented as NaN, thus non-float columns are promoted
+        if start == end:
+            return
+
+        column = self._columns[name]
+
+        if column.dtype.kind == "f":
+            column[start:end] = np.nan
+            return
+
+        if column.dtype.kind in _NUMERIC_KINDS:
+            column = column.astype(np.float64)
+            column[start:end] = np.nan
+        else:
+            column = column.astype(object)
+            column[start:end] = None
+
+        self._columns[name] = column
+
+    def append(self, columns: Dict[str, Any]) -> None:
+        """Append rows to the store.
+
+        Columns that were not previously seen are created and filled with missing values
+        for the previous rows. Likewise, existing columns absent from `columns` are filled
+        with missing values for the appended rows.
+
+        Args:
+            columns: Dictionary mapping column names to sequences of values with the same length.
+
+        """
+
+        new_columns = {name: _to_column(values) for name, values in columns.items()}
+
+        num_new_rows = {len(values) for values in new_columns.values()}
+        assert len(num_new_rows) <= 1, "All columns must have the same number of rows."
+        num_new_rows = num_new_rows.pop() if num_new_rows else 0
+
+        start, end = self.num_rows, self.num_rows + num_new_rows
+        self._grow(end)
+
+        for name, values in new_columns.items():
+            if name not in self._columns:
+                self._columns[name] = np.empty(self._capacity, dtype=values.dtype)
+                self._fill_missing(name, 0, start)
+
+            column = self._columns[name]
+            dtype = _common_dtype(column.dtype, values.dtype)
+
+            if dtype != column.dtype:
+                column = self._columns[name] = column.astype(dtype)
+
+            column[start:end] = values
+
+        for name in self._columns:
+            if name not in new_columns:
+                self._fill_missing(name, start, end)
+
+        self.num_rows = end
+
+    def to_pandas(self, start: Optional[int] = 0, end: Optional[int] = None) -> pd.DataFrame:
+        """Convert rows to a data frame.
+
+        Args:
+            start: First row.
+            end: Last row (exclusive). If `None`, uses all rows.
+
+        Returns:
+            Data frame with a column for each column of the store.
+
+        """
+
+        end = self.num_rows if end is None else end
+        return pd.DataFrame({name: column[start:end] for name, column in self._columns.items()})
+
+    def save_segment(self, directory: Union[str, Path]) -> Optional[Path]:
+        """Save the rows appended since the last saved segment as a new Parquet segment.
+
+        Segments are written to a temporary file and renamed, so an interrupted write
+        never leaves a partial segment behind. The first time a store saves to a directory
+        it was not loaded from, segments left there by a previous store are removed and
+        all rows are saved, so the directory only holds the rows of this store. Requires `pyarrow`.
+
+        Args:
+            directory: Directory of segments.
+
+        Returns:
+            Path to the segment, or `None` if there are no new rows.
+
+        """
+
+        directory = Path(directory)
+        directory.mkdir(exist_ok=True, parents=True)
+
+        if self._segments_directory != directory.resolve():
+            for stale_segment_path in directory.glob("segment_*.parquet"):
+                stale_segment_path.unlink()
+
+            self.num_saved_rows = 0
+            self.num_segments = 0
+            self._segments_directory = directory.resolve()
+
+        if self.num_saved_rows == self.num_rows:
+            return None
+
+        segment_path = directory / f"segment_{self.num_segments:06d}.parquet"
+        tmp_segment_path = directory / f".{segment_path.name}.tmp"
+
+        self.to_pandas(self.num_saved_rows, self.num_rows).to_parquet(tmp_segment_path, index=False)
+        os.replace(tmp_segment_path, segment_path)
+
+        self.num_saved_rows = self.num_rows
+        self.num_segments += 1
+
+        return segment_path
+
+    @classmethod
+    def load(cls, directory: Union[str, Path]) -> "ColumnarStore":
+        """Load a store from a directory of Parquet segments.
+
+        Args:
+            directory: Directory of segments.
+
+        Returns:
+            Store with the rows of all segments, which are marked as saved.
+
+        """
+
+        segment_paths = sorted(Path(directory).glob("segment_*.parquet"))
+        segments = [pd.read_parquet(segment_path) for segment_path in segment_paths]
+
+        store = cls(initial_capacity=sum(len(segment) for segment in segments))
+        for segment in segments:
+            store.append({name: segment[name].to_numpy() for name in segment.columns})
+
+        store.num_saved_rows = store.num_rows
+        store.num_segments = len(segment_paths)
+        store._segments_directory = Path(directory).resolve()
+
+        return store
@@ -1,13 +1,20 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT license.
 
-from typing import Any, Dict, List
+import bisect
+from typing import Any, Dict, List, Optional
 
 import numpy as np
 
 from archai.discrete_search.api.archai_model import ArchaiModel
 from archai.discrete_search.api.search_objectives import SearchObjectives
 
+# Maximum number of elements of the boolean arrays created when comparing blocks of points
+_DOMINANCE_BLOCK_ELEMENTS = 2**20
+
+# Number of points below which the divide-and-conquer Pareto search compares points directly
+_DIVIDE_AND_CONQUER_LEAF_SIZE = 256
+
 
 def get_pareto_frontier(
     models: List[ArchaiModel], evaluation_results: Dict[str, np.ndarray], objectives: SearchObjectives
@@ -88,11 +95,143 @@ def get_non_dominated_sorting(
     ]
 
 
+def _find_dominated_points(candidates: np.ndarray, reference: np.ndarray) -> np.ndarray:
+    """Checks which candidate points are dominated by at least one reference point.
+
+    A point `r` dominates a point `c` if `r <= c` on every dimension and `r < c` on at
+    least one of them. Comparisons are broadcasted over blocks of candidates to bound memory usage.
+
+    Args:
+        candidates: N-dimensional points, one per row.
+        reference: N-dimensional points, one per row.
+
+    Returns:
+        Boolean mask with the same length as `candidates`.
+
+    """
+
+    dominated = np.zeros(candidates.shape[0], dtype=bool)
+
+    if candidates.shape[0] == 0 or reference.shape[0] == 0:
+        return dominated
+
+    block_size = max(1, _DOMINANCE_BLOCK_ELEMENTS // reference.shape[0])
+
+    for start in range(0, candidates.shape[0], block_size):
+        block = candidates[start : start + block_size]
+
+        # Accumulates comparisons one dimension at a time to avoid (block, reference, dim) arrays
+        weakly_dominates = reference[None, :, 0] <= block[:, None, 0]
+        strictly_better = reference[None, :, 0] < block[:, None, 0]
+
+        for d in range(1, reference.shape[1]):
+            weakly_dominates &= reference[None, :, d] <= block[:, None, d]
+            strictly_better |= reference[None, :, d] < block[:, None, d]
+
+        dominated[start : start + block_size] = (weakly_dominates & strictly_better).any(axis=1)
+
+    return dominated
+
+
+def _find_non_dominated_mask_2d(sorted_points: np.ndarray) -> np.ndarray:
+    """Sweep-line Pareto search for two-dimensional points.
+
+    Args:
+        sorted_points: Unique two-dimensional points in lexicographic order.
+
+    Returns:
+        Boolean mask of non-dominated points.
+
+    """
+
+    # Previous points are never worse on the first dimension, so a point is
+    # non-dominated only if it improves the best second dimension seen so far
+    y = sorted_points[:, 1]
+
+    mask = np.ones(sorted_points.shape[0], dtype=bool)
+    mask[1:] = y[1:] < np.minimum.accumulate(y)[:-1]
+
+    return mask
+
+
+def _find_non_dominated_mask_3d(sorted_points: np.ndarray) -> np.ndarray:
+    """Sweep-line Pareto search for three-dimensional points.
+
+    Keeps the two-dimensional staircase of the (y, z) projections from the points
+    already visited, which answers each dominance query with a binary search.
+
+    Args:
+        sorted_points: Unique three-dimensional points in lexicographic order.
+
+    Returns:
+        Boolean mask of non-dominated points.
+
+    """
+
+    mask = np.zeros(sorted_points.shape[0], dtype=bool)
+
+    # Staircase with strictly increasing `y` and strictly decreasing `z`
+    stair_y, stair_z = [], []
+
+    for idx, (_, y, z) in enumerate(sorted_points.tolist()):
+        pos = bisect.bisect_right(stair_y, y)
+        if pos > 0 and stair_z[pos - 1] <= z:
+            continue
+
+        mask[idx] = True
+
+        # Removes staircase points that are dominated by the new point
+        start = end = bisect.bisect_left(stair_y, y)
+        while end < len(stair_y) and stair_z[end] >= z:
+            end += 1
+
+        stair_y[start:end] = [y]
+        stair_z[start:end] = [z]
+
+    return mask
+
+
+def _find_non_dominated_mask_nd(sorted_points: np.ndarray) -> np.ndarray:
+    """Divide-and-conquer Pareto search for points with an arbitrary number of dimensions.
+
+    Args:
+        sorted_points: Unique N-dimensional points in lexicographic order.
+
+    Returns:
+        Boolean mask of non-dominated points.
+
+    Reference:
+        H. T. Kung, F. Luccio and F. P. Preparata,
+        On finding the maxima of a set of vectors,
+        Journal of the ACM, 1975, 22(4): 469-476.
+
+    """
+
+    num_points = sorted_points.shape[0]
+
+    if num_points <= _DIVIDE_AND_CONQUER_LEAF_SIZE:
+        return ~_find_dominated_points(sorted_points, sorted_points)
+
+    # Points can only be dominated by points that come before them in lexicographic order,
+    # thus the bottom half only needs to be compared against the frontier of the top half
+    mid = num_points // 2
+    top, bottom = sorted_points[:mid], sorted_points[mid:]
+
+    top_mask = _find_non_dominated_mask_nd(top)
+    bottom_mask = _find_non_dominated_mask_nd(bottom)
+
+    bottom_front = np.flatnonzero(bottom_mask)
+    bottom_mask[bottom_front] = ~_find_dominated_points(bottom[bottom_front], top[top_mask])
+
+    return np.concatenate([top_mask, bottom_mask])
+
+
 def _find_pareto_frontier_points(all_points: np.ndarray) -> List[int]:
     """Takes in a list of n-dimensional points, one per row, returns the list of row indices
     which are Pareto-frontier points.
 
-    Assumes that lower values on every dimension are better.
+    Assumes that lower values on every dimension are better. Duplicated points are
+    only reported once, using the index of their first occurrence.
 
     Args:
         all_points: N-dimensional points.
@@ -102,40 +241,27 @@ def _find_pareto_frontier_points(all_points: np.ndarray) -> List[int]:
 
     """
 
-    # For each point see if there exists  any other point which dominates it on all dimensions
-    # If that is true, then it is not a pareto point and vice-versa
-
     # Inputs should alwyas be a two-dimensional array
     assert len(all_points.shape) == 2
 
-    pareto_inds = []
+    # Gets the unique points, which are already sorted in lexicographic order
+    unique_points, unique_indices = np.unique(all_points, axis=0, return_index=True)
+    dim = unique_points.shape[1]
 
-    dim = all_points.shape[1]
+    if unique_points.shape[0] == 0:
+        return []
 
-    # Gets the indices of unique points
-    _, unique_indices = np.unique(all_points, axis=0, return_index=True)
+    if dim == 1:
+        pareto_mask = np.zeros(unique_points.shape[0], dtype=bool)
+        pareto_mask[0] = True
+    elif dim == 2:
+        pareto_mask = _find_non_dominated_mask_2d(unique_points)
+    elif dim == 3:
+        pareto_mask = _find_non_dominated_mask_3d(unique_points)
+    else:
+        pareto_mask = _find_non_dominated_mask_nd(unique_points)
 
-    for i in unique_indices:
-        this_point = all_points[i, :]
-        is_pareto = True
-
-        for j in unique_indices:
-            if j == i:
-                continue
-
-            other_point = all_points[j, :]
-            diff = this_point - other_point
-
-            if sum(diff >= 0) == dim:
-                # Other point is smaller/larger on all dimensions
-                # so we have found at least one dominating point
-                is_pareto = False
-                break
-
-        if is_pareto:
-            pareto_inds.append(i)
-
-    return pareto_inds
+    return unique_indices[pareto_mask].tolist()
 
 
 def _find_non_dominated_sorting(all_points: np.ndarray) -> List[List[int]]:
@@ -160,26 +286,67 @@ def _find_non_dominated_sorting(all_points: np.ndarray) -> List[List[int]]:
     lex_sorting = np.lexsort(all_points.T[::-1])
     all_points = all_points.copy()[lex_sorting]
 
-    fronts = []
+    if all_points.shape[1] == 2:
+        ranks = _find_front_ranks_2d(all_points)
+    else:
+        fronts = []
+        ranks = np.zeros(all_points.shape[0], dtype=np.int64)
+
+        for idx in range(all_points.shape[0]):
+            front_rank = _find_front_rank(all_points, idx, fronts)
 
-    for idx in range(all_points.shape[0]):
-        front_rank = _find_front_rank(all_points, idx, fronts)
+            if front_rank >= len(fronts):
+                fronts.append([])
 
-        if front_rank >= len(fronts):
-            fronts.append([])
+            fronts[front_rank].append(idx)
+            ranks[idx] = front_rank
 
-        fronts[front_rank].append(idx)
+    # Groups points by rank while preserving their lexicographic order
+    order = np.argsort(ranks, kind="stable")
+    boundaries = np.flatnonzero(np.diff(ranks[order])) + 1
 
-    ret = []
-    for front in fronts:
-        ret.append(lex_sorting[front])
+    return [lex_sorting[front] for front in np.split(order, boundaries) if len(front) > 0]
 
-    return ret
+
+def _find_front_ranks_2d(sorted_points: np.ndarray) -> np.ndarray:
+    """Finds the front ranks of lexicographically sorted two-dimensional points.
+
+    The rank of a point is the length of the longest chain of points dominating it, which
+    is the length of the longest non-decreasing subsequence of the second dimension
+    ending right before that point.
+
+    Args:
+        sorted_points: Two-dimensional points in lexicographic order.
+
+    Returns:
+        Front rank of each point.
+
+    """
+
+    ranks = np.zeros(sorted_points.shape[0], dtype=np.int64)
+
+    # `tails[k]` holds the smallest second dimension of the last point added to front `k`
+    tails = []
+
+    for idx, y in enumerate(sorted_points[:, 1].tolist()):
+        rank = bisect.bisect_right(tails, y)
+
+        if rank == len(tails):
+            tails.append(y)
+        else:
+            tails[rank] = y
+
+        ranks[idx] = rank
+
+    return ranks
 
 
 def _find_front_rank(all_points: np.ndarray, idx: int, fronts: List[List[int]]) -> int:
     """Finds the front rank for all_points[idx] given `fronts`.
 
+    Since points are visited in lexicographic order, if a front does not dominate the
+    current point, none of the following fronts do, which allows a binary search over fronts.
+
     Args:
         all_points: N-dimensional points.
         idx: Point index.
@@ -193,33 +360,190 @@ def _find_front_rank(all_points: np.ndarray, idx: int, fronts: List[List[int]])
 
     """
 
-    def dominates(x, y):
-        for i in range(len(x)):
-            if y[i] < x[i]:
-                return False
+    current = all_points[idx]
+    low, high = 0, len(fronts)
 
-        return True
+    while low < high:
+        rank = (low + high) // 2
+        solutions = all_points[fronts[rank]]
 
-    num_found_fronts = len(fronts)
-    rank = 0
-    current = all_points[idx]
+        if np.all(solutions <= current, axis=1).any():
+            low = rank + 1
+        else:
+            high = rank
+
+    return low
+
+
+class ParetoArchive:
+    """Incremental non-dominated sorting archive.
+
+    Points are added in batches and the non-dominated sorting fronts are updated in place,
+    so the cost of adding a batch depends on the batch and on the fronts it affects, but not
+    on the total number of points. A snapshot of the Pareto frontier is kept after every batch.
+
+    Ranks follow the same convention as `get_non_dominated_sorting`: a point is dominated by
+    another if it is not better on any dimension, and duplicated points are ranked
+    by their insertion order.
+
+    """
+
+    def __init__(self, num_dims: int) -> None:
+        """Initialize the archive.
+
+        Args:
+            num_dims: Number of dimensions of the points.
+
+        """
+
+        self.num_dims = num_dims
+        self.num_points = 0
+
+        self._points = np.empty((0, num_dims), dtype=np.float64)
+        self._ranks = np.empty(0, dtype=np.int64)
+        self._fronts = []
+        self._frontier_snapshots = []
+
+    @property
+    def points(self) -> np.ndarray:
+        """Return all points added to the archive."""
+
+        return self._points[: self.num_points]
+
+    @property
+    def ranks(self) -> np.ndarray:
+        """Return the non-dominated sorting rank of every point."""
+
+        return self._ranks[: self.num_points]
+
+    @property
+    def num_batches(self) -> int:
+        """Return the number of batches added to the archive."""
+
+        return len(self._frontier_snapshots)
+
+    def _grow(self, num_points: int) -> None:
+        capacity = self._points.shape[0]
+        if num_points <= capacity:
+            return
 
-    while True:
-        if num_found_fronts == 0:
-            return 0
+        new_capacity = max(num_points, 2 * capacity)
 
-        fk_indices = fronts[rank]
-        solutions = all_points[fk_indices[::-1]]
-        non_dominated = True
+        points = np.empty((new_capacity, self.num_dims), dtype=np.float64)
+        points[: self.num_points] = self.points
+        ranks = np.empty(new_capacity, dtype=np.int64)
+        ranks[: self.num_points] = self.ranks
 
-        for s in solutions:
-            if dominates(s, current):
-                non_dominated = False
+        self._points, self._ranks = points, ranks
+
+    def _find_dominated(self, sources: np.ndarray, targets: np.ndarray) -> np.ndarray:
+        """Checks which `targets` indices are dominated by at least one of `sources` indices."""
+
+        if len(sources) == 0 or len(targets) == 0:
+            return np.zeros(len(targets), dtype=bool)
+
+        source_points = self._points[sources][:, None, :]
+        target_points = self._points[targets][None, :, :]
+
+        # Ties between identical points are broken by their insertion order
+        weakly_dominates = np.all(source_points <= target_points, axis=2)
+        strictly_better = np.any(source_points < target_points, axis=2) | (sources[:, None] < targets[None, :])
+
+        return (weakly_dominates & strictly_better).any(axis=0)
+
+    def _insert(self, idx: int) -> None:
+        point = self._points[idx]
+
+        # Fronts are ordered, so the first front without a point dominating `point` is
+        # found with a binary search (see `_find_front_rank`)
+        low, high = 0, len(self._fronts)
+        while low < high:
+            rank = (low + high) // 2
+            if np.all(self._points[self._fronts[rank]] <= point, axis=1).any():
+                low = rank + 1
+            else:
+                high = rank
+
+        # Points dominated by the moved ones are pushed to the next front, cascading
+        # until no point is moved
+        moved, rank = np.array([idx]), low
+        while len(moved) > 0:
+            if rank == len(self._fronts):
+                self._fronts.append(moved)
+                self._ranks[moved] = rank
                 break
 
-        if non_dominated:
-            return rank
-        else:
-            rank += 1
-            if rank >= num_found_fronts:
-                return num_found_fronts
+            front = self._fronts[rank]
+            dominated = self._find_dominated(moved, front)
+
+            self._fronts[rank] = np.concatenate([front[~dominated], moved])
+            self._ranks[moved] = rank
+
+            moved, rank = front[dominated], rank + 1
+
+    def add(self, points: np.ndarray) -> None:
+        """Add a batch of points to the archive.
+
+        Args:
+            points: Points of shape (num_points, num_dims), where lower values are better.
+
+        """
+
+        points = np.asarray(points, dtype=np.float64).reshape(-1, self.num_dims)
+
+        start = self.num_points
+        self._grow(start + points.shape[0])
+        self._points[start : start + points.shape[0]] = points
+        self.num_points += points.shape[0]
+
+        for idx in range(start, self.num_points):
+            self._insert(idx)
+
+        self._frontier_snapshots.append(self._sort_lexicographically(self.get_front(0)))
+
+    def _sort_lexicographically(self, indices: np.ndarray) -> np.ndarray:
+        order = np.lexsort(np.vstack([indices, self._points[indices].T[::-1]]))
+        return indices[order]
+
+    def get_front(self, rank: int) -> np.ndarray:
+        """Get the indices of the points in a non-dominated sorting front.
+
+        Args:
+            rank: Front rank.
+
+        Returns:
+            Point indices.
+
+        """
+
+        if rank >= len(self._fronts):
+            return np.empty(0, dtype=np.int64)
+
+        return self._fronts[rank]
+
+    def get_pareto_frontier(self, num_batches: Optional[int] = None) -> np.ndarray:
+        """Get the Pareto frontier after `num_batches` batches were added.
+
+        Args:
+            num_batches: Number of batches. If `None`, uses all batches.
+
+        Returns:
+            Indices of the Pareto frontier points in lexicographic order.
+
+        """
+
+        num_batches = num_batches or self.num_batches
+        if num_batches == 0:
+            return np.empty(0, dtype=np.int64)
+
+        return self._frontier_snapshots[num_batches - 1]
+
+    def get_non_dominated_sorting(self) -> List[np.ndarray]:
+        """Get the non-dominated sorting fronts.
+
+        Returns:
+            List of point indices of each front, in lexicographic order.
+
+        """
+
+        return [self._sort_lexicographically(front) for front in self._fronts]
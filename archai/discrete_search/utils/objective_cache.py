@@ -0,0 +1,285 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT license.
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+from numbers import Number
+from pathlib import Path
+from time import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# Cache key: (obj_name, archid, budget)
+CacheKey = Tuple[str, str, Optional[Any]]
+
+# Maximum number of parameters bound to a single SQLite query
+_SQLITE_MAX_QUERY_PARAMS = 500
+
+
+def _is_config_value(value: Any) -> bool:
+    if isinstance(value, (list, tuple)):
+        return all(_is_config_value(v) for v in value)
+
+    return value is None or isinstance(value, (bool, int, float, str))
+
+
+def get_evaluator_version(evaluator: Any) -> str:
+    """Get a version string of an evaluator based on its class and configuration.
+
+    The configuration is given by the evaluator attributes that hold plain values
+    (numbers, strings, booleans, `None` and lists or tuples of them), so evaluators of
+    the same class with different settings (e.g., input shape, number of trials) get
+    different versions.
+
+    Args:
+        evaluator: Model evaluator.
+
+    Returns:
+        Hash of the evaluator class and configuration.
+
+    """
+
+    config = {
+        key: value for key, value in sorted(getattr(evaluator, "__dict__", {}).items()) if _is_config_value(value)
+    }
+    evaluator_cls = type(evaluator)
+
+    return hashlib.sha1(f"{evaluator_cls.__module__}.{evaluator_cls.__qualname__}:{config!r}".encode()).hexdigest()
+
+
+class ObjectiveCache:
+    """In-memory cache of objective evaluations.
+
+    Evaluations are keyed by `(obj_name, archid, budget)`. Subclasses can override
+    `get_many` and `set_many` to store evaluations elsewhere, which allows sharing
+    evaluations across processes or search runs.
+
+    """
+
+    def __init__(self) -> None:
+        """Initialize the cache."""
+
+        self._cache: Dict[CacheKey, Any] = {}
+
+    def get_many(self, keys: List[CacheKey], version: Optional[str] = None) -> List[Optional[Any]]:
+        """Get the cached evaluations of a list of keys.
+
+        Args:
+            keys: List of `(obj_name, archid, budget)` keys.
+            version: Version of the evaluator that produced the evaluations.
+                Ignored by the in-memory cache, as it does not outlive the evaluators.
+
+        Returns:
+            Cached evaluation of each key, or `None` if the key is not cached.
+
+        """
+
+        return [self._cache.get(key) for key in keys]
+
+    def set_many(self, items: Dict[CacheKey, Any], version: Optional[str] = None) -> None:
+        """Cache the evaluations of a set of keys.
+
+        Args:
+            items: Dictionary mapping `(obj_name, archid, budget)` keys to evaluations.
+            version: Version of the evaluator that produced the evaluations.
+
+        """
+
+        self._cache.update(items)
+
+    def get(self, key: CacheKey, default: Optional[Any] = None, version: Optional[str] = None) -> Optional[Any]:
+        """Get the cached evaluation of a key.
+
+        Args:
+            key: `(obj_name, archid, budget)` key.
+            default: Value returned if the key is not cached.
+            version: Version of the evaluator that produced the evaluation.
+
+        Returns:
+            Cached evaluation.
+
+        """
+
+        value = self.get_many([key], version=version)[0]
+        return default if value is None else value
+
+    def __setitem__(self, key: CacheKey, value: Any) -> None:
+        self.set_many({key: value})
+
+    def to_dict(self) -> Dict[CacheKey, Any]:
+        """Return the cached evaluations as a dictionary."""
+
+        return dict(self._cache)
+
+    def update(self, items: Dict[CacheKey, Any]) -> None:
+        """Update the cache with the evaluations from a dictionary.
+
+        Args:
+            items: Dictionary mapping `(obj_name, archid, budget)` keys to evaluations.
+
+        """
+
+        self.set_many(items)
+
+
+class SqliteObjectiveCache(ObjectiveCache):
+    """Persistent cache of objective evaluations backed by a SQLite database.
+
+    Evaluations are written through to the database as soon as they are cached, so
+    restarted searches, or several searches running in parallel over the same database,
+    reuse evaluations computed by each other. The database uses write-ahead logging,
+    which allows concurrent readers while a process is writing.
+
+    Numeric evaluations are stored as floats, while other evaluations (e.g., tuples or
+    arrays) are pickled, so they must be picklable.
+
+    """
+
+    def __init__(
+        self,
+        file_path: Union[str, Path],
+        ttl: Optional[float] = None,
+        use_version: Optional[bool] = False,
+        timeout: Optional[float] = 60.0,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            file_path: Path to the SQLite database, which is created if it does not exist.
+            ttl: Time-to-live (in seconds) of cached evaluations. If `None`, evaluations never expire.
+            use_version: If `True`, evaluations are only reused by evaluators with the same
+                version (see `get_evaluator_version`).
+            timeout: Time (in seconds) to wait for a lock held by another process.
+
+        """
+
+        super().__init__()
+
+        self.file_path = str(file_path)
+        self.ttl = ttl
+        self.use_version = use_version
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+
+        with self._lock:
+            self._connect().execute(
+                "CREATE TABLE IF NOT EXISTS objective_cache ("
+                "obj_name TEXT NOT NULL, archid TEXT NOT NULL, budget TEXT NOT NULL, version TEXT NOT NULL, "
+                "value REAL, created_at REAL NOT NULL, PRIMARY KEY (obj_name, archid, budget, version))"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections can not be shared with forked processes, so a new one is opened when needed
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = sqlite3.connect(
+                self.file_path, timeout=self.timeout, isolation_level=None, check_same_thread=False
+            )
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._pid = os.getpid()
+
+        return self._connection
+
+    def _encode_budget(self, budget: Optional[Any]) -> str:
+        # Budgets that compare equal (e.g., 1 and 1.0) share the same key, as in a dictionary
+        if budget is None:
+            return ""
+
+        if isinstance(budget, Number):
+            return repr(float(budget))
+
+        return str(budget)
+
+    def _decode_budget(self, budget: str) -> Optional[Any]:
+        if not budget:
+            return None
+
+        try:
+            return float(budget)
+        except ValueError:
+            return budget
+
+    def _encode_value(self, value: Any) -> Union[float, sqlite3.Binary]:
+        # SQLite columns accept values of any type, so pickled values are stored as BLOBs
+        # in the `value` column without changing the schema of existing databases
+        if isinstance(value, Number) and not isinstance(value, complex):
+            return float(value)
+
+        return sqlite3.Binary(pickle.dumps(value))
+
+    def _decode_value(self, value: Union[float, bytes]) -> Any:
+        if isinstance(value, bytes):
+            return pickle.loads(value)
+
+        return value
+
+    def _encode_version(self, version: Optional[str]) -> str:
+        return (version or "") if self.use_version else ""
+
+    def get_many(self, keys: List[CacheKey], version: Optional[str] = None) -> List[Optional[Any]]:
+        version = self._encode_version(version)
+        min_created_at = time() - self.ttl if self.ttl is not None else float("-inf")
+
+        # Groups lookups by objective to query several architectures at once
+        keys_by_obj = {}
+        for key in keys:
+            keys_by_obj.setdefault(key[0], set()).add(key[1])
+
+        values = {}
+
+        with self._lock:
+            connection = self._connect()
+
+            for obj_name, archids in keys_by_obj.items():
+                archids = list(archids)
+
+                for i in range(0, len(archids), _SQLITE_MAX_QUERY_PARAMS):
+                    chunk = archids[i : i + _SQLITE_MAX_QUERY_PARAMS]
+                    placeholders = ",".join("?" * len(chunk))
+
+                    rows = connection.execute(
+                        "SELECT archid, budget, value FROM objective_cache "
+                        f"WHERE obj_name = ? AND version = ? AND created_at >= ? AND archid IN ({placeholders})",
+                        [obj_name, version, min_created_at, *chunk],
+                    )
+
+                    values.update(
+                        {(obj_name, archid, budget): self._decode_value(value) for archid, budget, value in rows}
+                    )
+
+        return [values.get((obj_name, archid, self._encode_budget(budget))) for obj_name, archid, budget in keys]
+
+    def set_many(self, items: Dict[CacheKey, Any], version: Optional[str] = None) -> None:
+        version = self._encode_version(version)
+        created_at = time()
+
+        # Failed evaluations (`None`) are not cached, so they are evaluated again
+        rows = [
+            (obj_name, archid, self._encode_budget(budget), version, self._encode_value(value), created_at)
+            for (obj_name, archid, budget), value in items.items()
+            if value is not None
+        ]
+
+        if not rows:
+            return
+
+        with self._lock:
+            connection = self._connect()
+
+            # Writes all rows in a single transaction
+            with connection:
+                connection.execute("BEGIN IMMEDIATE")
+                connection.executemany("INSERT OR REPLACE INTO objective_cache VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    def to_dict(self) -> Dict[CacheKey, Any]:
+        with self._lock:
+            rows = self._connect().execute("SELECT obj_name, archid, budget, value FROM objective_cache").fetchall()
+
+        return {
+            (obj_name, archid, self._decode_budget(budget)): self._decode_value(value)
+            for obj_name, archid, budget, value in rows
+        }
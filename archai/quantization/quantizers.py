@@ -1,13 +1,10 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT license.
 
-from typing import Optional
+from typing import Optional, Tuple
 
 import torch
 from torch._C import dtype
-from torch.quantization import MinMaxObserver
-
-from archai.quantization.observers import OnnxDynamicObserver
 
 
 class FakeDynamicQuant(torch.nn.Module):
@@ -63,52 +60,67 @@ class FakeDynamicQuant(torch.nn.Module):
             else:
                 self.qmin, self.qmax = -(2 ** (bits - 1)), 2 ** (bits - 1) - 1
 
-    def forward(self, x: torch.Tensor) -> torch.Tensor:
-        if x.dtype == torch.float32:
-            if self.bits == 8:
-                if self.dtype == torch.quint8:
-                    qscheme = torch.per_tensor_affine
-                else:
-                    qscheme = torch.per_tensor_symmetric
+        # Quantization bounds used to calculate the 8-bit scale and zero point, which follow
+        # `MinMaxObserver` (reduced range drops one bit) and `OnnxDynamicObserver` (full range)
+        if self.onnx_compatible:
+            self._observer_qmin, self._observer_qmax = (0, 255) if dtype == torch.quint8 else (-128, 127)
+        elif dtype == torch.quint8:
+            self._observer_qmin, self._observer_qmax = (0, 127) if self.reduce_range else (0, 255)
+        else:
+            self._observer_qmin, self._observer_qmax = (-64, 63) if self.reduce_range else (-128, 127)
+
+        self.eps = torch.finfo(torch.float32).eps
+
+    def _calculate_qparams(self, min_val: torch.Tensor, max_val: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        # Scale and zero point are calculated on device with the same operations as the observers,
+        # which avoids instantiating an observer and synchronizing with the host on every forward pass
+        if self.bits == 8:
+            if self.onnx_compatible and self.dtype == torch.quint8:
+                min_val_neg, max_val_pos = min_val, max_val
+            else:
+                min_val_neg, max_val_pos = min_val.clamp(max=0), max_val.clamp(min=0)
 
+            if self.dtype == torch.qint8:
+                scale = torch.max(-min_val_neg, max_val_pos)
                 if self.onnx_compatible:
-                    observer = OnnxDynamicObserver(dtype=self.dtype)
+                    scale = scale / 127
                 else:
-                    observer = MinMaxObserver(
-                        dtype=self.dtype,
-                        qscheme=qscheme,
-                        reduce_range=self.reduce_range,
-                    )
-
-                observer(x)
-                scale, zero_pointer = observer.calculate_qparams()
+                    scale = scale / (float(self._observer_qmax - self._observer_qmin) / 2)
+                scale = scale.clamp(min=self.eps)
+                zero_pointer = torch.zeros_like(scale, dtype=torch.int32)
 
             else:
-                min_val, max_val = x.min(), x.max()
-                initial_scale = (max_val - min_val) / float(self.qmax - self.qmin)
+                scale = (max_val_pos - min_val_neg) / float(self._observer_qmax - self._observer_qmin)
+                scale = scale.clamp(min=self.eps)
+                zero_pointer = self._observer_qmin - torch.round(min_val_neg / scale)
+                zero_pointer = zero_pointer.clamp(self._observer_qmin, self._observer_qmax)
+
+        else:
+            # Prevents a division by zero with constant inputs
+            scale = (max_val - min_val) / float(self.qmax - self.qmin)
+            scale = torch.where(scale > 0, scale, torch.full_like(scale, self.eps))
 
-                min_zero_pointer = self.qmin - min_val / initial_scale
-                max_zero_pointer = self.qmax - max_val / initial_scale
-                min_zero_pointer_error = abs(self.qmin) - abs(min_val / initial_scale)
-                max_zero_pointer_error = abs(self.qmax) - abs(max_val / initial_scale)
+            min_zero_pointer = self.qmin - min_val / scale
+            max_zero_pointer = self.qmax - max_val / scale
+            min_zero_pointer_error = abs(self.qmin) - (min_val / scale).abs()
+            max_zero_pointer_error = abs(self.qmax) - (max_val / scale).abs()
 
-                if min_zero_pointer_error < max_zero_pointer_error:
-                    initial_zero_pointer = min_zero_pointer
-                else:
-                    initial_zero_pointer = max_zero_pointer
-                initial_zero_pointer = initial_zero_pointer.round()
+            zero_pointer = torch.where(
+                min_zero_pointer_error < max_zero_pointer_error, min_zero_pointer, max_zero_pointer
+            ).round()
 
-                scale, zero_pointer = initial_scale, initial_zero_pointer
+        # Prevents `zero_pointer` from being outside the range of the quantized dtype
+        zero_pointer = zero_pointer.clamp(self.qmin, self.qmax).to(torch.int32)
 
-            # Prevents `zero_pointer` from being outside the range of the quantized dtype
-            if zero_pointer > self.qmax:
-                zero_pointer = torch.tensor(self.qmax)
-            elif zero_pointer < self.qmin:
-                zero_pointer = torch.tensor(self.qmin)
+        return scale, zero_pointer
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        if x.dtype == torch.float32:
+            # Minimum and maximum values are found in a single pass
+            min_val, max_val = torch.aminmax(x.detach())
+            scale, zero_pointer = self._calculate_qparams(min_val, max_val)
 
-            x = torch.fake_quantize_per_tensor_affine(
-                x, float(scale.item()), int(zero_pointer.item()), self.qmin, self.qmax
-            )
+            x = torch.fake_quantize_per_tensor_affine(x, scale, zero_pointer, self.qmin, self.qmax)
 
             self._scale, self._zero_pointer = scale, zero_pointer
 
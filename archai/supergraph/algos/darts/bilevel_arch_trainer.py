@@ -8,12 +8,19 @@ from torch import Tensor
 
 from archai.common import ml_utils
 from archai.common.config import Config
+from archai.common.ordered_dict_logger import get_global_logger
 from archai.supergraph.algos.darts.bilevel_optimizer import BilevelOptimizer
+from archai.supergraph.algos.darts.functional_bilevel_optimizer import (
+    FUNCTIONAL_AVAILABLE,
+    FunctionalBilevelOptimizer,
+)
 from archai.supergraph.datasets import data
 from archai.supergraph.nas.arch_trainer import ArchTrainer
 from archai.supergraph.nas.model import Model
 from archai.supergraph.utils.checkpoint import CheckPoint
 
+logger = get_global_logger()
+
 
 class BilevelArchTrainer(ArchTrainer):
     def __init__(self, conf_train: Config, model: Model,
@@ -23,6 +30,8 @@ class BilevelArchTrainer(ArchTrainer):
         self._conf_w_optim = conf_train['optimizer']
         self._conf_w_lossfn = conf_train['lossfn']
         self._conf_alpha_optim = conf_train['alpha_optimizer']
+        # functional bilevel step doesn't need a copy of the model
+        self._functional_bilevel = conf_train.get_val('functional_bilevel', True)
 
     @overrides
     def pre_fit(self, data_loaders:data.DataLoaders)->None:
@@ -35,7 +44,12 @@ class BilevelArchTrainer(ArchTrainer):
         w_decay = self._conf_w_optim['decay']
         lossfn = ml_utils.get_lossfn(self._conf_w_lossfn).to(self.get_device())
 
-        self._bilevel_optim = BilevelOptimizer(self._conf_alpha_optim, w_momentum,
+        if self._functional_bilevel and not FUNCTIONAL_AVAILABLE:
+            logger.warn({'functional_bilevel': 'requires PyTorch >= 2.1, falling back to BilevelOptimizer'})
+        bilevel_optim_cls = FunctionalBilevelOptimizer \
+                            if self._functional_bilevel and FUNCTIONAL_AVAILABLE \
+                            else BilevelOptimizer
+        self._bilevel_optim = bilevel_optim_cls(self._conf_alpha_optim, w_momentum,
                                                 w_decay, self.model, lossfn,
                                                 self.get_device(), self.batch_chunks)
 
@@ -41,6 +41,11 @@ class DartsModelDescBuilder(ModelDescBuilder):
         nodes:List[NodeDesc] =  []
         conv_params = ConvMacroParams(in_shape[0], out_shape[0])
 
+        # optional sparse forward of mixed ops, see MixedOp
+        sparse_params = {k: conf_cell.get_val(k, None)
+                         for k in ('sparse_top_k', 'sparse_threshold')}
+        sparse_params = {k: v for k, v in sparse_params.items() if v is not None}
+
         # add mixed op for each edge in each node
         # how does the stride works? For all ops connected to s0 and s1, we apply
         # reduction in WxH. All ops connected elsewhere automatically gets
@@ -52,7 +57,8 @@ class DartsModelDescBuilder(ModelDescBuilder):
                 op_desc = OpDesc('mixed_op',
                                     params={
                                         'conv': conv_params,
-                                        'stride': 2 if reduction and j < 2 else 1
+                                        'stride': 2 if reduction and j < 2 else 1,
+                                        **sparse_params
                                     }, in_len=1, trainables=None, children=None)
                 edge = EdgeDesc(op_desc, input_ids=[j])
                 edges.append(edge)
@@ -0,0 +1,206 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT license.
+
+from typing import Dict, Iterator, List, Optional
+
+import torch
+from torch import Tensor, autograd, nn
+from torch.nn.modules.loss import _Loss
+from torch.optim.optimizer import Optimizer
+
+from archai.common import ml_utils
+from archai.common.config import Config
+from archai.supergraph.nas.model import Model
+from archai.trainers.optimizer_utils import FOREACH_AVAILABLE
+
+# torch.func.functional_call and the foreach ops used below
+FUNCTIONAL_AVAILABLE = FOREACH_AVAILABLE
+
+
+def _get_loss(model:Model, lossfn, x, y, params_and_buffers:Optional[Dict[str, Tensor]]=None):
+    if params_and_buffers is None:
+        logits, *_ = model(x) # might also return aux tower logits
+    else:
+        logits, *_ = torch.func.functional_call(model, params_and_buffers, (x,), strict=False)
+    return lossfn(logits, y)
+
+def _get_alphas(model:Model)->Iterator[nn.Parameter]:
+    return model.all_owned().param_by_kind('alphas')
+
+class FunctionalBilevelOptimizer:
+    """Second order DARTS step which, unlike BilevelOptimizer, doesn't keep a
+    deep copy of the model (virtual model) around.
+
+    The unrolled weights w' and the perturbed weights w+, w- are written in
+    buffers allocated once and the model is called on them with
+    torch.func.functional_call, so main model weights are never modified.
+    Alphas are used as-is because ops keep their own references to them,
+    they are only perturbed in place for the hessian-vector product and
+    restored exactly afterwards. Running stats of the unrolled model are kept
+    separately, same as for the virtual model of BilevelOptimizer.
+    """
+
+    def __init__(self, conf_alpha_optim:Config, w_momentum: float, w_decay: float,
+                 model: Model, lossfn: _Loss, device, batch_chunks:int) -> None:
+        if not FUNCTIONAL_AVAILABLE:
+            raise RuntimeError('FunctionalBilevelOptimizer requires PyTorch >= 2.1')
+
+        self._w_momentum = w_momentum  # momentum for w
+        self._w_weight_decay = w_decay  # weight decay for w
+        self._lossfn = lossfn
+        self._model = model  # main model with respect to w and alpha
+        self.batch_chunks = batch_chunks
+        self.device = device
+
+        self._alphas = list(_get_alphas(self._model))
+
+        # NOTE: same as BilevelOptimizer, we use all parameters which also
+        # includes alphas. Alphas are not unrolled, so we separate them out.
+        alpha_ids = set(id(a) for a in self._alphas)
+        named_params = list(self._model.named_parameters())
+        self._weight_names = [n for n, p in named_params if id(p) not in alpha_ids]
+        self._weights = [p for _, p in named_params if id(p) not in alpha_ids]
+
+        # buffers for w' which are reused across steps
+        self._vweights = [torch.empty_like(w).requires_grad_() for w in self._weights]
+        # running stats of unrolled model
+        self._vbuffers = {n: b.detach().clone() for n, b in self._model.named_buffers()}
+
+        # this is the optimizer to optimize alphas parameter
+        self._alpha_optim = ml_utils.create_optimizer(conf_alpha_optim, self._alphas)
+
+    def state_dict(self)->dict:
+        return {
+            'alpha_optim': self._alpha_optim.state_dict(),
+            'vbuffers': self._vbuffers
+        }
+
+    def load_state_dict(self, state_dict)->None:
+        # also accept checkpoints of BilevelOptimizer which has full vmodel
+        vbuffers = state_dict['vbuffers'] if 'vbuffers' in state_dict else state_dict['vmodel']
+        with torch.no_grad():
+            for name, b in self._vbuffers.items():
+                b.copy_(vbuffers[name])
+        self._alpha_optim.load_state_dict(state_dict['alpha_optim'])
+
+    def _vparams(self, weights:List[Tensor], buffers:Optional[Dict[str, Tensor]]=None)->Dict[str, Tensor]:
+        vparams = dict(zip(self._weight_names, weights))
+        if buffers is not None:
+            vparams.update(buffers)
+        return vparams
+
+    def _update_vweights(self, x, y, lr: float, w_optim: Optimizer) -> None:
+        """ Update w' buffers (main model has w) """
+
+        loss = _get_loss(self._model, self._lossfn, x, y)
+        gradients = autograd.grad(loss, self._weights)
+
+        with torch.no_grad():
+            # simulate momentum update on model but put this update in w'
+            # w' = w - lr * (momentum * m + g + decay * w)
+            updates = torch._foreach_add(gradients, self._weights, alpha=self._w_weight_decay)
+            moms = [(u, w_optim.state[w].get('momentum_buffer', None))
+                    for u, w in zip(updates, self._weights)]
+            moms = [(u, m) for u, m in moms if m is not None]
+            if moms:
+                torch._foreach_add_([u for u, _ in moms], [m for _, m in moms],
+                                    alpha=self._w_momentum)
+
+            torch._foreach_copy_(self._vweights, self._weights)
+            torch._foreach_add_(self._vweights, updates, alpha=-lr)
+
+    def step(self, x_train: Tensor, y_train: Tensor, x_valid: Tensor, y_valid: Tensor,
+             w_optim: Optimizer) -> None:
+        # TODO: unlike darts paper, we get lr from optimizer insead of scheduler
+        lr = w_optim.param_groups[0]['lr']
+        self._alpha_optim.zero_grad()
+
+        # divide batch in to chunks if needed so it fits in GPU RAM
+        if self.batch_chunks > 1:
+            xt_chunks, yt_chunks = torch.chunk(x_train, self.batch_chunks), torch.chunk(y_train, self.batch_chunks)
+            xv_chunks, yv_chuncks = torch.chunk(x_valid, self.batch_chunks), torch.chunk(y_valid, self.batch_chunks)
+        else:
+            xt_chunks, yt_chunks = (x_train,), (y_train,)
+            xv_chunks, yv_chuncks = (x_valid,), (y_valid,)
+
+        for xtc, ytc, xvc, yvc in zip(xt_chunks, yt_chunks, xv_chunks, yv_chuncks):
+            xtc, ytc = xtc.to(self.device), ytc.to(self.device, non_blocking=True)
+            xvc, yvc = xvc.to(self.device), yvc.to(self.device, non_blocking=True)
+
+            # compute the gradient and write it into tensor.grad
+            # instead of generated by loss.backward()
+            self._backward_bilevel(xtc, ytc, xvc, yvc,lr, w_optim)
+
+        # at this point we should have model with updated gradients for w and alpha
+        self._alpha_optim.step()
+
+    def _backward_bilevel(self, x_train, y_train, x_valid, y_valid, lr, w_optim):
+        """ Compute unrolled loss and backward its gradients """
+
+        # w' = w - lr * grad, alphas are left as-is
+        self._update_vweights(x_train, y_train, lr, w_optim)
+
+        # compute loss on validation set for model with w' wrt alphas
+        vloss = _get_loss(self._model, self._lossfn, x_valid, y_valid,
+                          self._vparams(self._vweights, self._vbuffers))
+
+        v_grads = autograd.grad(vloss, tuple(self._alphas) + tuple(self._vweights))
+
+        # grad(L(w', a), a), part of Eq. 6
+        dalpha = v_grads[:len(self._alphas)]
+        # get grads for w' params which we will use it to compute w+ and w-
+        dw = v_grads[len(self._alphas):]
+
+        hessian = self._hessian_vector_product(dalpha, dw, x_train, y_train)
+
+        # update final gradient = dalpha - xi*hessian
+        # TODO: currently alphas lr is same as w lr
+        with torch.no_grad():
+            for alpha, da, h in zip(self._alphas, dalpha, hessian):
+                alpha.grad = da - lr*h
+
+    def _hessian_vector_product(self, dalpha, dw, x, y, epsilon_unit=1e-2):
+        """
+        Implements equation 8
+
+        dw = dw` {L_val(w`, alpha)}
+        w+ = w + eps * dw
+        w- = w - eps * dw
+        hessian = (dalpha {L_trn(w+, alpha)} -dalpha {L_trn(w-, alpha)})/(2*eps)
+        eps = 0.01 / ||dw||
+
+        Same as BilevelOptimizer, dw spans all parameters so alphas are
+        perturbed by dalpha as well.
+        """
+
+        dw_norm = torch.cat([g.view(-1) for g in dalpha + dw]).norm()
+        epsilon = epsilon_unit / dw_norm
+
+        alphas = [a.detach().clone() for a in self._alphas]
+
+        def perturbed_dalpha(sign:float):
+            with torch.no_grad():
+                # w+- = w +- epsilon * grad(w'), reusing w' buffers
+                torch._foreach_copy_(self._vweights, self._weights)
+                torch._foreach_add_(self._vweights, torch._foreach_mul(dw, sign * epsilon))
+                for a, a0, da in zip(self._alphas, alphas, dalpha):
+                    a.copy_(a0 + sign * epsilon * da)
+
+            # This loss needs to be on train set, not validation set
+            loss = _get_loss(self._model, self._lossfn, x, y,
+                             self._vparams(self._vweights))
+            return autograd.grad(loss, self._alphas)
+
+        try:
+            dalpha_plus = perturbed_dalpha(1.) # dalpha{L_trn(w+)}
+            dalpha_minus = perturbed_dalpha(-1.) # dalpha{L_trn(w-)}
+        finally:
+            # restore alphas
+            with torch.no_grad():
+                for a, a0 in zip(self._alphas, alphas):
+                    a.copy_(a0)
+
+        # apply eq 8, final difference to compute hessian
+        h = [(p - m) / (2. * epsilon)
+             for p, m in zip(dalpha_plus, dalpha_minus)]
+        return h
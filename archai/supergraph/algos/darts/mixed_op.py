@@ -10,6 +10,7 @@ from torch import nn
 
 from archai.common.utils import zip_eq
 from archai.supergraph.nas.arch_params import ArchParams
+from archai.supergraph.nas.mixed_op_utils import weighted_sum_ops
 from archai.supergraph.nas.model_desc import OpDesc
 from archai.supergraph.nas.operations import Op
 
@@ -46,6 +47,10 @@ class MixedOp(Op):
                 OpDesc(primitive, op_desc.params, in_len=1, trainables=None),
                 affine=affine, arch_params=None)
             self._ops.append(op)
+        # optional sparse forward which only runs top_k ops and/or ops with
+        # weight >= threshold
+        self._top_k = op_desc.params.get('sparse_top_k', None)
+        self._threshold = op_desc.params.get('sparse_threshold', None)
         # we do this at the end so that we can capture all arch params registered by
         # any previous child modules
         self._setup_arch_params(arch_params)
@@ -53,7 +58,9 @@ class MixedOp(Op):
     @overrides
     def forward(self, x):
         asm = F.softmax(self._alphas[0], dim=0)
-        return sum(w * op(x) for w, op in zip(asm, self._ops))
+        return weighted_sum_ops(x, asm, self._ops,
+                                none_index=len(self._ops)-1,
+                                top_k=self._top_k, threshold=self._threshold)
 
     @overrides
     def finalize(self) -> Tuple[OpDesc, Optional[float]]:
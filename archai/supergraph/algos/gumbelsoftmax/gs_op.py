@@ -9,6 +9,7 @@ from torch import Tensor, nn
 
 from archai.common.utils import zip_eq
 from archai.supergraph.nas.arch_params import ArchParams
+from archai.supergraph.nas.mixed_op_utils import weighted_sum_ops
 from archai.supergraph.nas.model_desc import OpDesc
 from archai.supergraph.nas.operations import Op
 
@@ -59,7 +60,8 @@ class GsOp(Op):
     @overrides
     def forward(self, x):
         assert self._sampled_weights is not None
-        return sum(w * op(x) for w, op in zip_eq(self._sampled_weights, self._ops))
+        return weighted_sum_ops(x, self._sampled_weights, self._ops,
+                                none_index=len(self._ops)-1)
 
     @overrides
     def finalize(self, sampled_weights) -> Tuple[OpDesc, Optional[float]]:
@@ -11,8 +11,8 @@ from overrides import overrides
 from torch import nn
 
 from archai.common.common import get_conf, get_expdir
-from archai.common.utils import zip_eq
 from archai.supergraph.nas.arch_params import ArchParams
+from archai.supergraph.nas.mixed_op_utils import weighted_sum_ops
 from archai.supergraph.nas.model_desc import OpDesc
 from archai.supergraph.nas.operations import Op
 
@@ -59,7 +59,9 @@ class XnasOp(Op):
 
     def update_alphas(self, eta:float, current_t:int, total_t:int, grad_clip:float):
         grad_flat = torch.flatten(self._grad)
-        rewards = torch.tensor([-torch.dot(grad_flat, torch.flatten(activ)) for activ in self._activs])
+        # skipped ops ('none' and evicted ops) have zero activations
+        rewards = torch.tensor([-torch.dot(grad_flat, torch.flatten(activ)) if activ is not None else 0.0
+                                for activ in self._activs])
         exprewards = torch.exp(eta * rewards).cuda()
         # NOTE: Will this remain registered?
         self._alphas[0] = torch.mul(self._alphas[0], exprewards)
@@ -96,8 +98,9 @@ class XnasOp(Op):
 
     @overrides
     def forward(self, x):
-        self._activs = [op(x) for op in self._ops]
-        numer = sum(w * activ for w, activ in zip_eq(self._alphas[0], self._activs))
+        self._activs = []
+        numer = weighted_sum_ops(x, self._alphas[0], self._ops,
+                                 none_index=len(self._ops)-1, activs=self._activs)
         denom = sum(self._alphas[0])
         self.pt = torch.div(numer, denom)
 
@@ -0,0 +1,307 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT license.
+
+"""Batched tensor implementation of the policies in `augmentation.py`.
+
+Ops mirror their PIL counterparts on uint8 tensors of shape (N, C, H, W), so policies can
+be applied to whole batches after collation (on CPU or GPU) instead of image-by-image in
+data loader workers. Affine ops use nearest sampling with black fill like PIL, and color ops
+reproduce PIL's lookup tables, so outputs follow the same distribution as `Augmentation`.
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+import torch
+import torch.nn.functional as F
+from torch import Tensor
+
+from archai.supergraph.datasets import augmentation
+
+# Color used by `augmentation.CutoutAbs`
+_CUTOUT_COLOR = (125, 123, 114)
+
+
+def _rand(n:int, generator:Optional[torch.Generator]=None)->Tensor:
+    return torch.rand(n, generator=generator)
+
+def _random_sign(n:int, generator:Optional[torch.Generator]=None)->Tensor:
+    # same as `random.random() > 0.5` of the PIL ops
+    return torch.where(_rand(n, generator) > 0.5, -1.0, 1.0)
+
+def _shear_x(v:Tensor, size:Tuple[int, int], generator)->Tensor:
+    v = v * _random_sign(len(v), generator)
+    return _affine_matrices(len(v), b=v)
+
+def _shear_y(v:Tensor, size:Tuple[int, int], generator)->Tensor:
+    v = v * _random_sign(len(v), generator)
+    return _affine_matrices(len(v), d=v)
+
+def _translate_x(v:Tensor, size:Tuple[int, int], generator)->Tensor:
+    v = v * _random_sign(len(v), generator)
+    return _affine_matrices(len(v), c=v * size[1])
+
+def _translate_y(v:Tensor, size:Tuple[int, int], generator)->Tensor:
+    v = v * _random_sign(len(v), generator)
+    return _affine_matrices(len(v), f=v * size[0])
+
+def _translate_x_abs(v:Tensor, size:Tuple[int, int], generator)->Tensor:
+    v = v * _random_sign(len(v), generator)
+    return _affine_matrices(len(v), c=v)
+
+def _translate_y_abs(v:Tensor, size:Tuple[int, int], generator)->Tensor:
+    v = v * _random_sign(len(v), generator)
+    return _affine_matrices(len(v), f=v)
+
+def _rotate(v:Tensor, size:Tuple[int, int], generator)->Tensor:
+    v = v * _random_sign(len(v), generator)
+
+    # same matrix as `PIL.Image.rotate`, which rotates counter clockwise around the center
+    angle = -torch.deg2rad(v.double())
+    cos, sin = torch.cos(angle), torch.sin(angle)
+    cx, cy = size[1] / 2.0, size[0] / 2.0
+    return _affine_matrices(len(v), a=cos, b=sin, c=cx - cos*cx - sin*cy,
+                            d=-sin, e=cos, f=cy + sin*cx - cos*cy)
+
+def _affine_matrices(n:int, a=1.0, b=0.0, c=0.0, d=0.0, e=1.0, f=0.0)->Tensor:
+    """Returns (n, 2, 3) matrices of `PIL.Image.AFFINE` data, which map output to input pixels"""
+    m = torch.zeros(n, 2, 3, dtype=torch.float64)
+    for i, val in enumerate((a, b, c, d, e, f)):
+        m[:, i // 3, i % 3] = val
+    return m
+
+def _fixed(v:Tensor)->Tensor:
+    # 16.16 fixed point numbers, same as PIL's nearest affine transform
+    return (v * 65536.0 + 0.5).floor_().long()
+
+def _apply_affine(imgs:Tensor, matrices:Tensor)->Tensor:
+    n, c, h, w = imgs.shape
+    device = imgs.device
+    m = matrices.to(device)
+
+    # PIL samples input at matrix x (x + 0.5, y + 0.5) and picks the pixel containing it,
+    # the (fixed point) rounding is matched exactly so ties go to the same pixel
+    ys = torch.arange(h, device=device).view(1, h, 1)
+    xs = torch.arange(w, device=device).view(1, 1, w)
+    origin = m[:, :, 2] + 0.5 * m[:, :, 1] + 0.5 * m[:, :, 0]
+    x_in = (_fixed(origin[:, 0]).view(n, 1, 1) + ys * _fixed(m[:, 0, 1]).view(n, 1, 1) \
+            + xs * _fixed(m[:, 0, 0]).view(n, 1, 1)) >> 16
+    y_in = (_fixed(origin[:, 1]).view(n, 1, 1) + ys * _fixed(m[:, 1, 1]).view(n, 1, 1) \
+            + xs * _fixed(m[:, 1, 0]).view(n, 1, 1)) >> 16
+
+    # pixels sampled from outside of the input are filled with black, same as PIL
+    inside = (x_in >= 0) & (x_in < w) & (y_in >= 0) & (y_in < h)
+    idxs = (y_in.clamp(0, h - 1) * w + x_in.clamp(0, w - 1)).view(n, 1, h * w).expand(n, c, h * w)
+
+    out = torch.gather(imgs.reshape(n, c, h * w), 2, idxs).view(n, c, h, w)
+    return out * inside.unsqueeze(1)
+
+def _apply_lut(imgs:Tensor, luts:Tensor)->Tensor:
+    # luts has shape (n, c, 256) with a lookup table for each image and channel
+    n, c, h, w = imgs.shape
+    out = torch.gather(luts.to(imgs.device, torch.uint8).view(n * c, 256), 1,
+                       imgs.reshape(n * c, h * w).long())
+    return out.view(n, c, h, w)
+
+def _histograms(imgs:Tensor)->Tensor:
+    n, c, _, _ = imgs.shape
+    offsets = torch.arange(n * c, device=imgs.device).view(n, c, 1, 1) * 256
+    hist = torch.bincount((imgs.long() + offsets).flatten(), minlength=n * c * 256)
+    return hist.view(n, c, 256)
+
+def _grayscale(imgs:Tensor)->Tensor:
+    # same as `PIL.Image.convert('L')`, returns shape (n, 1, h, w)
+    if imgs.shape[1] == 1:
+        return imgs
+    r, g, b = imgs[:, 0:1].long(), imgs[:, 1:2].long(), imgs[:, 2:3].long()
+    return ((r * 19595 + g * 38470 + b * 7471 + 0x8000) >> 16).to(torch.uint8)
+
+def _blend(degenerate:Tensor, imgs:Tensor, factor:Tensor)->Tensor:
+    # same as `PIL.Image.blend(degenerate, imgs, factor)` of `PIL.ImageEnhance`
+    factor = factor.to(imgs.device, torch.float32).view(-1, 1, 1, 1)
+    degenerate = degenerate.float()
+    out = degenerate + factor * (imgs.float() - degenerate)
+    return out.clamp_(0.0, 255.0).to(torch.uint8)
+
+def auto_contrast(imgs:Tensor, v:Tensor, generator=None)->Tensor:
+    flat = imgs.flatten(2)
+    lo, hi = flat.amin(dim=2).double(), flat.amax(dim=2).double()
+    # true division like PIL, `255.0 / tensor` multiplies by the reciprocal
+    scale = torch.full_like(lo, 255.0) / (hi - lo).clamp(min=1.0)
+    offset = -lo * scale
+
+    ix = torch.arange(256, dtype=torch.float64, device=imgs.device)
+    luts = (ix * scale.unsqueeze(-1) + offset.unsqueeze(-1)).trunc().clamp(0, 255)
+    # channels with a single value are left as-is
+    luts = torch.where((hi <= lo).unsqueeze(-1), ix, luts)
+    return _apply_lut(imgs, luts)
+
+def invert(imgs:Tensor, v:Tensor, generator=None)->Tensor:
+    return 255 - imgs
+
+def equalize(imgs:Tensor, v:Tensor, generator=None)->Tensor:
+    hist = _histograms(imgs)
+    ix = torch.arange(256, device=imgs.device)
+
+    # step excludes the count of the last non-zero bin
+    last = torch.where(hist > 0, ix, -1).amax(dim=2, keepdim=True)
+    step = (hist.sum(dim=2, keepdim=True) - hist.gather(2, last)) // 255
+
+    cum = torch.cumsum(hist, dim=2) - hist
+    luts = ((step // 2 + cum) // step.clamp(min=1)).clamp(max=255)
+    # channels with a single value have step=0 and are left as-is
+    luts = torch.where(step > 0, luts, ix)
+    return _apply_lut(imgs, luts)
+
+def solarize(imgs:Tensor, v:Tensor, generator=None)->Tensor:
+    threshold = v.to(imgs.device).view(-1, 1, 1, 1)
+    return torch.where(imgs < threshold, imgs, 255 - imgs)
+
+def posterize(imgs:Tensor, v:Tensor, generator=None)->Tensor:
+    bits = v.long().to(imgs.device).view(-1, 1, 1, 1)
+    mask = (256 - 2 ** (8 - bits)).to(torch.uint8)
+    return imgs & mask
+
+def contrast(imgs:Tensor, v:Tensor, generator=None)->Tensor:
+    mean = _grayscale(imgs).double().mean(dim=(1, 2, 3), keepdim=True)
+    degenerate = (mean + 0.5).trunc().expand_as(imgs)
+    return _blend(degenerate, imgs, v)
+
+def color(imgs:Tensor, v:Tensor, generator=None)->Tensor:
+    return _blend(_grayscale(imgs).expand_as(imgs), imgs, v)
+
+def brightness(imgs:Tensor, v:Tensor, generator=None)->Tensor:
+    return _blend(torch.zeros_like(imgs), imgs, v)
+
+def sharpness(imgs:Tensor, v:Tensor, generator=None)->Tensor:
+    # PIL.ImageFilter.SMOOTH, which leaves border pixels as-is
+    n, c, h, w = imgs.shape
+    kernel = torch.ones(3, 3, device=imgs.device)
+    kernel[1, 1] = 5.0
+    kernel = (kernel / 13.0).expand(c, 1, 3, 3)
+
+    smooth = F.conv2d(imgs.float(), kernel, groups=c)
+    degenerate = imgs.clone()
+    degenerate[:, :, 1:-1, 1:-1] = (smooth + 0.5).clamp_(0.0, 255.0).to(torch.uint8)
+    return _blend(degenerate, imgs, v)
+
+def cutout(imgs:Tensor, v:Tensor, generator=None)->Tensor:
+    # sizes are relative to width, and zero sized cutouts are skipped
+    v = v * imgs.shape[3]
+    out = cutout_abs(imgs, v, generator=generator)
+    return torch.where((v > 0).to(imgs.device).view(-1, 1, 1, 1), out, imgs)
+
+def cutout_abs(imgs:Tensor, v:Tensor, generator=None)->Tensor:
+    n, c, h, w = imgs.shape
+    v = v.double()
+
+    # same as `np.random.uniform(w)` of CutoutAbs, i.e., uniform in [1, w)
+    x0 = w + (1.0 - w) * _rand(n, generator).double()
+    y0 = h + (1.0 - h) * _rand(n, generator).double()
+    x0 = (x0 - v / 2.0).clamp(min=0).floor()
+    y0 = (y0 - v / 2.0).clamp(min=0).floor()
+    x1 = torch.minimum(x0 + v, torch.tensor(float(w)))
+    y1 = torch.minimum(y0 + v, torch.tensor(float(h)))
+
+    # rectangle includes its end coordinates
+    xs = torch.arange(w, dtype=torch.float64)
+    ys = torch.arange(h, dtype=torch.float64)
+    in_x = (xs >= x0.view(-1, 1)) & (xs <= x1.view(-1, 1).floor())
+    in_y = (ys >= y0.view(-1, 1)) & (ys <= y1.view(-1, 1).floor())
+    mask = (in_y.unsqueeze(2) & in_x.unsqueeze(1)) & (v >= 0).view(-1, 1, 1)
+
+    fill = torch.tensor(_CUTOUT_COLOR[:c] if c <= 3 else _CUTOUT_COLOR[:1] * c,
+                        dtype=torch.uint8, device=imgs.device).view(1, c, 1, 1)
+    return torch.where(mask.to(imgs.device).unsqueeze(1), fill, imgs)
+
+# ops that are combined into a single resampling, they return matrices of (values, size, generator)
+AFFINE_OPS:Dict[str, Callable[[Tensor, Tuple[int, int], Optional[torch.Generator]], Tensor]] = {
+    'ShearX': _shear_x,
+    'ShearY': _shear_y,
+    'TranslateX': _translate_x,
+    'TranslateY': _translate_y,
+    'TranslateXAbs': _translate_x_abs,
+    'TranslateYAbs': _translate_y_abs,
+    'Rotate': _rotate,
+}
+
+# ops that transform (imgs, values, generator)
+IMAGE_OPS:Dict[str, Callable[[Tensor, Tensor, Optional[torch.Generator]], Tensor]] = {
+    'AutoContrast': auto_contrast,
+    'Invert': invert,
+    'Equalize': equalize,
+    'Solarize': solarize,
+    'Posterize': posterize,
+    'Posterize2': posterize,
+    'Contrast': contrast,
+    'Color': color,
+    'Brightness': brightness,
+    'Sharpness': sharpness,
+    'Cutout': cutout,
+    'CutoutAbs': cutout_abs,
+}
+
+class BatchAugmentation:
+    """Batched version of `augmentation.Augmentation` for uint8 tensors of shape (N, C, H, W).
+
+    Each image gets its own randomly chosen policy, and ops of the policies are applied
+    position by position: images are masked by the op chosen for them and its probability,
+    then all affine ops are done with a single resampling, and every other op is applied
+    to the images that use it at once.
+    """
+
+    def __init__(self, policies:List, generator:Optional[torch.Generator]=None)->None:
+        self.policies = policies
+        self.generator = generator
+
+        self._op_names = sorted({name for policy in policies for name, _, _ in policy})
+        for name in self._op_names:
+            if name not in AFFINE_OPS and name not in IMAGE_OPS:
+                raise ValueError(f'Augmentation is not supported in batches: {name}')
+
+        # policies are padded with a no-op (-1) to the largest number of ops
+        max_ops = max(len(policy) for policy in policies)
+        self._op_ids = torch.full((len(policies), max_ops), -1, dtype=torch.long)
+        self._probs = torch.zeros(len(policies), max_ops, dtype=torch.float64)
+        self._values = torch.zeros(len(policies), max_ops, dtype=torch.float64)
+        for i, policy in enumerate(policies):
+            for j, (name, pr, level) in enumerate(policy):
+                _, low, high = augmentation.get_augment(name)
+                self._op_ids[i, j] = self._op_names.index(name)
+                self._probs[i, j] = pr
+                self._values[i, j] = level * (high - low) + low
+
+    def __call__(self, imgs:Tensor)->Tensor:
+        assert imgs.dtype == torch.uint8 and imgs.dim() == 4, 'expected uint8 images of shape (N, C, H, W)'
+
+        n = imgs.shape[0]
+        policy_idxs = torch.randint(len(self.policies), (n,), generator=self.generator)
+
+        for j in range(self._op_ids.shape[1]):
+            op_ids = self._op_ids[policy_idxs, j]
+            values = self._values[policy_idxs, j]
+            # same as `random.random() > pr` which skips the op
+            applied = (_rand(n, self.generator) <= self._probs[policy_idxs, j]) & (op_ids >= 0)
+            imgs = self._apply(imgs, op_ids, values, applied)
+
+        return imgs
+
+    def _apply(self, imgs:Tensor, op_ids:Tensor, values:Tensor, applied:Tensor)->Tensor:
+        imgs = imgs.clone()
+
+        matrices, affine_idxs = [], []
+        for op_id in torch.unique(op_ids[applied]).tolist():
+            name = self._op_names[op_id]
+            idxs = torch.nonzero(applied & (op_ids == op_id)).flatten()
+
+            if name in AFFINE_OPS:
+                matrices.append(AFFINE_OPS[name](values[idxs], tuple(imgs.shape[2:]), self.generator))
+                affine_idxs.append(idxs)
+            else:
+                device_idxs = idxs.to(imgs.device)
+                imgs[device_idxs] = IMAGE_OPS[name](imgs[device_idxs], values[idxs], self.generator)
+
+        if affine_idxs:
+            device_idxs = torch.cat(affine_idxs).to(imgs.device)
+            imgs[device_idxs] = _apply_affine(imgs[device_idxs], torch.cat(matrices))
+
+        return imgs
@@ -7,7 +7,7 @@ from typing import Iterable, Optional, Tuple
 import numpy as np
 import torch
 import torch.distributed as dist
-from sklearn.model_selection import StratifiedKFold, StratifiedShuffleSplit
+from sklearn.model_selection import StratifiedShuffleSplit
 from torch.utils.data import Sampler
 from torch.utils.data.dataset import Dataset
 
@@ -37,6 +37,10 @@ class DistributedStratifiedSampler(Sampler):
     However, this then requires that training code calls `sampler.set_epoch(epoch)`
     to set seed at every epoch.
 
+    Targets are converted to an array once, and the indices of every epoch are cached
+    when they do not depend on the epoch (e.g., when `val_ratio > 0`, which uses a fixed seed),
+    so only the final shuffle is performed at the start of these epochs.
+
     """
 
     def __init__(
@@ -99,6 +103,10 @@ class DistributedStratifiedSampler(Sampler):
         self.max_samples = max_samples if max_samples is not None and max_samples >= 0 else None
         assert self.data_len == len(dataset.targets)
 
+        # Avoids indexing `dataset.targets` (usually a list) element by element every epoch
+        self.targets = np.asarray(dataset.targets)
+        self._cached_indices: Optional[np.ndarray] = None
+
         self.val_ratio = val_ratio
         self.is_val_split = is_val_split
 
@@ -118,6 +126,23 @@ class DistributedStratifiedSampler(Sampler):
         return self._len
 
     def __iter__(self) -> Iterable:
+        if self._cached_indices is not None:
+            indices = self._cached_indices.copy()
+        else:
+            indices = self._create_indices()
+            if self._is_epoch_independent():
+                self._cached_indices = indices.copy()
+
+        if self.shuffle and self.val_ratio > 0.0 and self.epoch > 0:
+            np.random.shuffle(indices)
+
+        return iter(indices)
+
+    def _is_epoch_independent(self) -> bool:
+        # Seed is fixed when there is a validation split, otherwise it is only used with shuffling and sample limits
+        return self.val_ratio > 0.0 or (not self.shuffle and self.max_samples is None)
+
+    def _create_indices(self) -> np.ndarray:
         indices, targets = self._get_indices()
         indices, targets = self._split_rank(indices, targets)
         indices, targets = self._limit_indices(indices, targets, self.max_samples)
@@ -125,22 +150,12 @@ class DistributedStratifiedSampler(Sampler):
         indices, _ = self._split_indices(indices, targets, self.val_split_len, self.is_val_split)
         assert len(indices) == self._len
 
-        if self.shuffle and self.val_ratio > 0.0 and self.epoch > 0:
-            np.random.shuffle(indices)
-
-        return iter(indices)
+        return indices
 
     def _split_rank(self, indices: np.ndarray, targets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         if self.world_size > 1:
-            replica_fold_idxs = None
-
-            rfolder = StratifiedKFold(n_splits=self.world_size, shuffle=False)
-            folds = rfolder.split(indices, targets)
-
-            for _ in range(self.rank + 1):
-                _, replica_fold_idxs = next(folds)
-
-            assert replica_fold_idxs is not None and len(replica_fold_idxs) == self.replica_len_full
+            replica_fold_idxs = _stratified_fold(targets, self.world_size, self.rank)
+            assert len(replica_fold_idxs) == self.replica_len_full
 
             return indices[replica_fold_idxs], targets[replica_fold_idxs]
 
@@ -160,7 +175,7 @@ class DistributedStratifiedSampler(Sampler):
         else:
             assert self.total_size == self.data_len, "`total_size` cannot be less than dataset size."
 
-        targets = np.array(list(self.dataset.targets[i] for i in indices))
+        targets = self.targets[indices]
         assert len(indices) == self.total_size
 
         return indices, targets
@@ -201,3 +216,29 @@ class DistributedStratifiedSampler(Sampler):
         """
 
         self.epoch = epoch
+
+
+def _stratified_fold(targets: np.ndarray, n_splits: int, fold: int) -> np.ndarray:
+    # Vectorized version of `StratifiedKFold(n_splits, shuffle=False).split()` that returns the test indices
+    # of a single fold, which assigns the same samples as scikit-learn without a pass over the data for each class
+    _, first_idxs, inverse = np.unique(targets, return_index=True, return_inverse=True)
+    inverse = inverse.reshape(-1)
+
+    # Classes are encoded by their order of appearance
+    _, class_perm = np.unique(first_idxs, return_inverse=True)
+    y_encoded = class_perm[inverse]
+    n_classes = len(first_idxs)
+
+    if np.all(n_splits > np.bincount(y_encoded)):
+        raise ValueError(f"n_splits={n_splits} cannot be greater than the number of members in each class.")
+
+    # Samples of each class are distributed to folds by a round robin over the sorted targets,
+    # and assigned in blocks following their order within the class
+    order = np.argsort(y_encoded, kind="stable")
+    sorted_folds = np.arange(len(y_encoded)) % n_splits
+    allocation = np.bincount(y_encoded[order] * n_splits + sorted_folds, minlength=n_classes * n_splits)
+
+    test_folds = np.empty(len(y_encoded), dtype=np.int64)
+    test_folds[order] = np.repeat(np.tile(np.arange(n_splits), n_classes), allocation)
+
+    return np.flatnonzero(test_folds == fold)
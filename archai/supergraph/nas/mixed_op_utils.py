@@ -0,0 +1,78 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT license.
+
+from typing import List, Optional, Sequence
+
+import torch
+from torch import Tensor, nn
+
+
+def select_ops(weights:Tensor, none_index:Optional[int]=None,
+               top_k:Optional[int]=None, threshold:Optional[float]=None)->List[int]:
+    """Returns indices of ops whose outputs contribute to the weighted sum.
+
+    The 'none' op always outputs zeros, so it never contributes and it is always
+    skipped. If weights don't need gradients, ops with exactly zero weight are
+    skipped as well (for ex, evicted ops or hard samples). If top_k or threshold
+    is given, only the top_k largest weights and/or the weights >= threshold are
+    kept. This sparse mode is an approximation during search because skipped
+    ops don't receive gradients.
+    """
+    n = weights.shape[0]
+    sparse = top_k is not None or threshold is not None
+    if not sparse and weights.requires_grad:
+        # keep it free of host-device syncs
+        return [i for i in range(n) if i != none_index]
+
+    # single device-to-host copy for all the decisions below
+    w = weights.detach().tolist()
+    indices = [i for i in range(n) if i != none_index]
+    if not weights.requires_grad:
+        indices = [i for i in indices if w[i] != 0.0]
+    if threshold is not None:
+        indices = [i for i in indices if w[i] >= threshold]
+    if top_k is not None:
+        indices = sorted(sorted(indices, key=lambda i: w[i], reverse=True)[:top_k])
+    return indices
+
+def weighted_sum_ops(x:Tensor, weights:Tensor, ops:Sequence[nn.Module],
+                     none_index:Optional[int]=None, top_k:Optional[int]=None,
+                     threshold:Optional[float]=None,
+                     activs:Optional[List[Optional[Tensor]]]=None)->Tensor:
+    """Computes sum(w * op(x)) for the mixed op of a supernet.
+
+    Only the ops returned by select_ops() are run, and their outputs are
+    accumulated in place into the output buffer instead of materializing every
+    weighted output and summing them. If activs is given, it receives output of
+    each op with None for skipped ops.
+    """
+    assert weights.shape[0] == len(ops)
+
+    indices = select_ops(weights, none_index=none_index, top_k=top_k,
+                         threshold=threshold)
+    if activs is not None:
+        activs[:] = [None] * len(ops)
+
+    # nothing contributes, fall back to 'none' op (or the first op) to get
+    # output of the correct shape
+    if not indices:
+        i = none_index if none_index is not None else 0
+        return ops[i](x) * weights[i]
+
+    out:Optional[Tensor] = None
+    for i in indices:
+        y = ops[i](x)
+        if activs is not None:
+            activs[i] = y
+        if out is None:
+            # first output allocates the buffer we accumulate into
+            out = y * weights[i]
+        else:
+            out = out.addcmul_(y, weights[i]) if _can_accumulate(out, y) \
+                  else out + y * weights[i]
+    assert out is not None
+    return out
+
+def _can_accumulate(out:Tensor, y:Tensor)->bool:
+    # in-place ops are not allowed if broadcasting would change shape of output
+    return out.shape == y.shape and out.dtype == y.dtype
@@ -9,6 +9,7 @@ import time
 from collections import defaultdict
 from typing import List, Mapping, Optional, Tuple
 
+import torch
 import yaml
 from torch import Tensor
 
@@ -33,19 +34,26 @@ class Metrics:
 
     The post_step will simply update the running averages while post_epoch updates
     best we have seen for each epoch.
+
+    In deferred mode, post_step keeps the running sums of top1, top5 and loss as
+    device tensors so it doesn't have to wait for the step to finish. The sums are
+    resolved to the running averages only when they are logged and at epoch end.
     """
 
-    def __init__(self, title:str, apex:Optional[ApexUtils], logger_freq:int=50) -> None:
+    def __init__(self, title:str, apex:Optional[ApexUtils], logger_freq:int=50,
+                 deferred:bool=False) -> None:
         """Create the metrics object to maintain epoch stats
 
         Arguments:
             title {str} -- descriptive name of the stage for which metrics are collected
         Keyword Arguments:
             logger_freq {int} -- Must be > 0 for epoch level logging, the step level logging is decided by this number (default: {50})
+            deferred {bool} -- Accumulate step metrics on device and avoid a device sync on every step (default: {False})
         """
         self.logger_freq = logger_freq
         self.title = title
         self._apex = apex
+        self._deferred = deferred
         self._reset_run()
 
     def _reset_run(self)->None:
@@ -109,21 +117,28 @@ class Metrics:
         top1, top5 = ml_utils.accuracy(logits, y, topk=(1, 5))
 
         epoch = self.run_metrics.cur_epoch()
-        epoch.post_step(top1.item(), top5.item(),
-                        loss.item(), batch_size)
+        if self._deferred:
+            epoch.post_step_deferred(torch.stack([top1, top5, loss.detach().float()]),
+                                     batch_size)
+        else:
+            epoch.post_step(top1.item(), top5.item(),
+                            loss.item(), batch_size)
 
         if self.logger_freq > 0 and \
                 ((epoch.step+1) % self.logger_freq == 0):
+            epoch.resolve()
             logger.info({'top1': epoch.top1.avg,
                         'top5': epoch.top5.avg,
                         'loss': epoch.loss.avg,
                         'step_time': epoch.step_time.last})
 
             if self.is_dist():
-                logger.info({'dist_top1': self.reduce_mean(epoch.top1.avg),
-                            'dist_top5': self.reduce_mean(epoch.top5.avg),
-                            'dist_loss': self.reduce_mean(epoch.loss.avg),
-                            'dist_step_time': self.reduce_mean(epoch.step_time.last)})
+                dist_top1, dist_top5, dist_loss, dist_step_time = self.reduce_mean_all(
+                    [epoch.top1.avg, epoch.top5.avg, epoch.loss.avg, epoch.step_time.last])
+                logger.info({'dist_top1': dist_top1,
+                            'dist_top5': dist_top5,
+                            'dist_loss': dist_loss,
+                            'dist_step_time': dist_step_time})
 
 
         # NOTE: Tensorboard step-level logging is removed as it becomes exponentially expensive on Azure blobs
@@ -163,12 +178,10 @@ class Metrics:
                             'step_time': epoch.step_time.avg,
                             'end_lr': lr})
                 if self.is_dist():
-                    logger.info({'dist_top1': self.reduce_mean(epoch.top1.avg),
-                                'dist_top5': self.reduce_mean(epoch.top5.avg),
-                                'dist_loss': self.reduce_mean(epoch.loss.avg),
-                                'dist_duration': self.reduce_mean(epoch.duration()),
-                                'dist_step_time': self.reduce_mean(epoch.step_time.avg),
-                                'dist_end_lr': self.reduce_mean(lr)})
+                    dist_vals = self.reduce_mean_all([epoch.top1.avg, epoch.top5.avg, epoch.loss.avg,
+                                                      epoch.duration(), epoch.step_time.avg, lr])
+                    logger.info(dict(zip(['dist_top1', 'dist_top5', 'dist_loss',
+                                          'dist_duration', 'dist_step_time', 'dist_end_lr'], dist_vals)))
             if val_epoch_metrics:
                 with logger.pushd('val'):
                     logger.info({'top1': val_epoch_metrics.top1.avg,
@@ -176,10 +189,10 @@ class Metrics:
                                 'loss': val_epoch_metrics.loss.avg,
                                 'duration': val_epoch_metrics.duration()})
                     if self.is_dist():
-                        logger.info({'dist_top1': self.reduce_mean(val_epoch_metrics.top1.avg),
-                                    'dist_top5': self.reduce_mean(val_epoch_metrics.top5.avg),
-                                    'dist_loss': self.reduce_mean(val_epoch_metrics.loss.avg),
-                                    'dist_duration': self.reduce_mean(val_epoch_metrics.duration())})
+                        dist_vals = self.reduce_mean_all([val_epoch_metrics.top1.avg, val_epoch_metrics.top5.avg,
+                                                          val_epoch_metrics.loss.avg, val_epoch_metrics.duration()])
+                        logger.info(dict(zip(['dist_top1', 'dist_top5', 'dist_loss', 'dist_duration'],
+                                             dist_vals)))
 
         # writer = get_tb_writer()
         # writer.add_scalar(f'{self._tb_path}/train_epochs/loss',
@@ -238,6 +251,11 @@ class Metrics:
         if not self._apex:
             return val
         return self._apex.reduce(val, op='mean')
+    def reduce_mean_all(self, vals:List[float])->List[float]:
+        """Reduces all values with a single all-reduce"""
+        if not self._apex or not self.is_dist():
+            return vals
+        return self._apex.reduce(vals, op='mean').tolist()
     def is_dist(self)->bool:
         if not self._apex:
             return False
@@ -306,6 +324,13 @@ class EpochMetrics:
         self.start_lr = math.nan
         self.end_lr = math.nan
         self.val_metrics:Optional[EpochMetrics] = None
+        self._reset_pending()
+
+    def _reset_pending(self):
+        # device tensors of [top1, top5, loss] not yet added to the meters
+        self._pending_sum:Optional[Tensor] = None
+        self._pending_last:Optional[Tensor] = None
+        self._pending_cnt = 0
 
     def pre_step(self):
         self._step_start_time = time.time()
@@ -315,11 +340,35 @@ class EpochMetrics:
         self.top1.update(top1, batch)
         self.top5.update(top5, batch)
         self.loss.update(loss, batch)
+    def post_step_deferred(self, vals:Tensor, batch:int):
+        """Same as post_step but vals is a device tensor of [top1, top5, loss]
+        which is only accumulated, call resolve() to update the meters"""
+        self.step_time.update(time.time() - self._step_start_time)
+        if self._pending_sum is None:
+            # accumulate in double same as python floats of the meters
+            self._pending_sum = vals.double() * batch
+        else:
+            self._pending_sum.add_(vals, alpha=batch)
+        self._pending_last = vals
+        self._pending_cnt += batch
+    def resolve(self):
+        """Adds the accumulated step metrics to the meters, this syncs with the device"""
+        if self._pending_sum is None:
+            return
+        assert self._pending_last is not None
+        sums, lasts = torch.stack([self._pending_sum, self._pending_last]).tolist()
+        for meter, s, last in zip((self.top1, self.top5, self.loss), sums, lasts):
+            meter.sum += s
+            meter.cnt += self._pending_cnt
+            meter.avg = meter.sum / meter.cnt
+            meter.last = last
+        self._reset_pending()
 
     def pre_epoch(self, lr:float):
         self.start_time = time.time()
         self.start_lr = lr
     def post_epoch(self, lr:float, val_metrics:Optional[Metrics]):
+        self.resolve()
         self.end_time = time.time()
         self.end_lr = lr
 
@@ -330,6 +379,17 @@ class EpochMetrics:
     def duration(self):
         return self.end_time-self.start_time
 
+    def __getstate__(self):
+        # device tensors are not serialized
+        self.resolve()
+        state = self.__dict__.copy()
+        for k in ('_pending_sum', '_pending_last', '_pending_cnt'):
+            del state[k]
+        return state
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reset_pending()
+
 class RunMetrics:
     """Metrics for the entire run. It mainly consist of metrics for each epoch"""
     def __init__(self) -> None:
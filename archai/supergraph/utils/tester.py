@@ -21,6 +21,8 @@ class Tester(EnforceOverrides):
     def __init__(self, conf_val:Config, model:nn.Module, apex:ApexUtils)->None:
         self._title = conf_val['title']
         self._logger_freq = conf_val['logger_freq']
+        # avoid device sync on every step to update metrics
+        self._deferred_metrics = conf_val.get_val('deferred_metrics', True)
         conf_lossfn = conf_val['lossfn']
         self.batch_chunks = conf_val['batch_chunks']
 
@@ -115,5 +117,6 @@ class Tester(EnforceOverrides):
         metrics.post_step(x, y, logits, loss, steps)
 
     def _create_metrics(self)->Metrics:
-        return Metrics(self._title, self._apex, logger_freq=self._logger_freq)
+        return Metrics(self._title, self._apex, logger_freq=self._logger_freq,
+                       deferred=self._deferred_metrics)
 
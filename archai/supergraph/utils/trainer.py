@@ -33,6 +33,8 @@ class Trainer(EnforceOverrides):
         self._grad_clip = conf_train['grad_clip']
         self._drop_path_prob = conf_train['drop_path_prob']
         self._logger_freq = conf_train['logger_freq']
+        # avoid device sync on every step to update metrics
+        self._deferred_metrics = conf_train.get_val('deferred_metrics', True)
         self._title = conf_train['title']
         self._epochs = conf_train['epochs']
         self.conf_optim = conf_train['optimizer']
@@ -70,7 +72,8 @@ class Trainer(EnforceOverrides):
 
         assert data_loaders.train_dl is not None
 
-        self._metrics = Metrics(self._title, self._apex, logger_freq=self._logger_freq)
+        self._metrics = Metrics(self._title, self._apex, logger_freq=self._logger_freq,
+                                deferred=self._deferred_metrics)
 
         # create optimizers and schedulers
         self._multi_optim = self.create_multi_optim(len(data_loaders.train_dl))
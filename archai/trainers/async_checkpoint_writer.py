@@ -0,0 +1,150 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT license.
+
+import copy
+import os
+import shutil
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import torch
+
+from archai.common.ordered_dict_logger import OrderedDictLogger
+
+logger = OrderedDictLogger(source=__name__)
+
+
+def save_atomic(obj: Any, file_path: str, link_file_paths: Optional[List[str]] = None) -> None:
+    """Save an object with `torch.save` to a temporary file and atomically rename it.
+
+    Readers never observe a partially written file, and a crash during the write leaves the
+    previous file untouched. Since every write creates a new file (inode), the additional paths
+    are hard-linked to it instead of being copied: they keep pointing to their own contents
+    when `file_path` is overwritten later on.
+
+    Args:
+        obj: Object to be saved.
+        file_path: Path to the file.
+        link_file_paths: Additional paths that should point to the same file.
+
+    """
+
+    tmp_file_path = file_path + ".tmp"
+    torch.save(obj, tmp_file_path)
+    os.replace(tmp_file_path, file_path)
+
+    for link_file_path in link_file_paths or []:
+        tmp_link_file_path = link_file_path + ".tmp"
+        if os.path.lexists(tmp_link_file_path):
+            os.remove(tmp_link_file_path)
+
+        # Falls back to a copy on file systems that do not support hard links
+        try:
+            os.link(file_path, tmp_link_file_path)
+        except OSError:
+            shutil.copyfile(file_path, tmp_link_file_path)
+
+        os.replace(tmp_link_file_path, link_file_path)
+
+
+class AsyncCheckpointWriter:
+    """Save checkpoints in a background thread without stalling the training.
+
+    The state is snapshotted to CPU buffers (pinned if it is on a GPU) when `save()` is called,
+    which only costs a device-to-host copy. The snapshot is then written by a background thread
+    with `save_atomic()`, while the training resumes and keeps updating the original tensors.
+
+    At most one checkpoint is pending at a time, so the buffers are re-used between checkpoints
+    and the memory overhead is bounded by the size of a single checkpoint.
+
+    """
+
+    def __init__(self) -> None:
+        """Initialize the background thread and the snapshot buffers."""
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checkpoint_writer")
+        self._future: Optional[Future] = None
+        self._buffers: Dict[Tuple[Any, ...], torch.Tensor] = {}
+
+    def _get_buffer(self, key: Tuple[Any, ...], tensor: torch.Tensor) -> torch.Tensor:
+        buffer = self._buffers.get(key, None)
+
+        if buffer is None or buffer.shape != tensor.shape or buffer.dtype != tensor.dtype:
+            buffer = torch.empty(tensor.shape, dtype=tensor.dtype, pin_memory=tensor.is_cuda)
+            self._buffers[key] = buffer
+
+        return buffer
+
+    def _snapshot(self, obj: Any, key: Tuple[Any, ...], memo: Dict[Tuple[Any, ...], torch.Tensor]) -> Any:
+        if isinstance(obj, torch.Tensor):
+            # Tensors that share the same memory (e.g., tied weights) are snapshotted only once
+            memo_key = (obj.device, obj.data_ptr(), obj.dtype, obj.shape, obj.stride())
+            if memo_key not in memo:
+                memo[memo_key] = self._get_buffer(key, obj).copy_(obj.detach(), non_blocking=True)
+
+            return memo[memo_key]
+
+        if isinstance(obj, dict):
+            snapshot = copy.copy(obj)
+            for k, v in obj.items():
+                snapshot[k] = self._snapshot(v, key + (k,), memo)
+
+            return snapshot
+
+        if isinstance(obj, (list, tuple)) and not hasattr(obj, "_fields"):
+            return type(obj)(self._snapshot(v, key + (i,), memo) for i, v in enumerate(obj))
+
+        # Other objects (e.g., trainer's state and model's configuration) might be modified by the training
+        return copy.deepcopy(obj)
+
+    def _write(
+        self, state: Dict[str, Any], file_path: str, link_file_paths: List[str], event: Optional[torch.cuda.Event]
+    ) -> None:
+        if event is not None:
+            event.synchronize()
+
+        save_atomic(state, file_path, link_file_paths=link_file_paths)
+        logger.debug(f"Checkpoint saved: {file_path}")
+
+    def save(self, state: Dict[str, Any], file_path: str, link_file_paths: Optional[List[str]] = None) -> None:
+        """Snapshot a state and schedule it to be written in the background.
+
+        Args:
+            state: State to be saved.
+            file_path: Path to the checkpoint file.
+            link_file_paths: Additional paths that should point to the checkpoint file.
+
+        """
+
+        # Buffers can only be re-used after the previous checkpoint has been written
+        self.wait()
+
+        state = self._snapshot(state, (), {})
+
+        # Device-to-host copies are asynchronous, so the writer waits for them to be completed
+        event = None
+        if torch.cuda.is_available() and torch.cuda.is_initialized():
+            event = torch.cuda.Event()
+            event.record()
+
+        self._future = self._executor.submit(self._write, state, file_path, link_file_paths or [], event)
+
+    def wait(self) -> None:
+        """Block until the pending checkpoint has been written.
+
+        Exceptions raised while writing the checkpoint are re-raised here.
+
+        """
+
+        if self._future is not None:
+            future, self._future = self._future, None
+            future.result()
+
+    def close(self) -> None:
+        """Wait for the pending checkpoint, release the buffers and stop the background thread."""
+
+        try:
+            self.wait()
+        finally:
+            self._buffers.clear()
+            self._executor.shutdown()
@@ -7,6 +7,8 @@ from typing import Any, Callable, Dict, Iterable, Optional, Union
 import torch
 from torch import optim
 
+from archai.trainers.optimizer_utils import check_foreach, use_foreach
+
 
 class CocobBackprop(optim.Optimizer):
     """Coin Betting optimizer with Backpropagation.
@@ -20,7 +22,11 @@ class CocobBackprop(optim.Optimizer):
     """
 
     def __init__(
-        self, params: Union[Iterable, Dict[str, Any]], alpha: Optional[float] = 100.0, eps: Optional[float] = 1e-8
+        self,
+        params: Union[Iterable, Dict[str, Any]],
+        alpha: Optional[float] = 100.0,
+        eps: Optional[float] = 1e-8,
+        foreach: Optional[bool] = None,
     ) -> None:
         """Initialize the optimizer.
 
@@ -31,21 +37,97 @@ class CocobBackprop(optim.Optimizer):
                 gauarantee does not depend on choice of `alpha`.
             eps: Positive initial wealth for betting algorithm. Theoretical convergence
                 gauarantee does not depend on choice of `eps`.
+            foreach: Whether the parameters of a group should be updated at once with multi-tensor
+                operators. If `None`, they are used when all parameters are on GPU.
 
         """
 
+        check_foreach(foreach)
+
         self.alpha = alpha
         self.eps = eps
+        self.foreach = foreach
         defaults = dict(alpha=alpha, eps=eps)
 
         super(CocobBackprop, self).__init__(params, defaults)
 
+    def _multi_tensor_step(self, group: Dict[str, Any]) -> None:
+        params, grads, states = [], [], []
+
+        for param in group["params"]:
+            if param.grad is None:
+                continue
+
+            state = self.state[param]
+
+            if len(state) == 0:
+                # Initial weights are copied since parameters are updated in-place
+                state["initial_weight"] = param.detach().clone()
+                state["reward"] = torch.zeros_like(param)
+                state["bet"] = torch.zeros_like(param)
+                state["neg_grads_sum"] = torch.zeros_like(param)
+                state["grads_abs_sum"] = torch.zeros_like(param)
+                state["max_observed_scale"] = torch.full_like(param, self.eps)
+                state["bet_fraction"] = torch.zeros_like(param)
+
+            params.append(param)
+            grads.append(param.grad)
+            states.append(state)
+
+        if not params:
+            return
+
+        initial_weights, rewards, bets, neg_grads_sums, grads_abs_sums, max_observed_scales, bet_fractions = (
+            [state[key] for state in states]
+            for key in [
+                "initial_weight",
+                "reward",
+                "bet",
+                "neg_grads_sum",
+                "grads_abs_sum",
+                "max_observed_scale",
+                "bet_fraction",
+            ]
+        )
+
+        # Update internal states useful for computing betting fraction
+        abs_grads = torch._foreach_abs(grads)
+        torch._foreach_maximum_(max_observed_scales, abs_grads)
+        torch._foreach_add_(grads_abs_sums, abs_grads)
+        torch._foreach_sub_(neg_grads_sums, grads)
+
+        # Update better's reward with the amount won on the -ve gradient prediction (negative reward is not allowed)
+        torch._foreach_addcmul_(rewards, bets, grads, value=-1)
+        torch._foreach_clamp_min_(rewards, 0.0)
+
+        # Better decides the bet fraction based on so-far observations
+        denoms = torch._foreach_add(grads_abs_sums, max_observed_scales)
+        torch._foreach_maximum_(denoms, torch._foreach_mul(max_observed_scales, self.alpha))
+        torch._foreach_mul_(denoms, max_observed_scales)
+        torch._foreach_copy_(bet_fractions, neg_grads_sums)
+        torch._foreach_div_(bet_fractions, denoms)
+
+        # Better makes the bet according to decided betting fraction
+        torch._foreach_copy_(bets, max_observed_scales)
+        torch._foreach_add_(bets, rewards)
+        torch._foreach_mul_(bets, bet_fractions)
+
+        # Set parameter weights
+        torch._foreach_copy_(params, initial_weights)
+        torch._foreach_add_(params, bets)
+
+    @torch.no_grad()
     def step(self, closure: Optional[Callable] = None) -> torch.FloatTensor:
         loss = None
         if closure is not None:
-            loss = closure()
+            with torch.enable_grad():
+                loss = closure()
 
         for group in self.param_groups:
+            if use_foreach(self.foreach, group["params"]):
+                self._multi_tensor_step(group)
+                continue
+
             for param in group["params"]:
                 if param.grad is None:
                     continue
@@ -126,7 +208,9 @@ class CocobOns(optim.Optimizer):
 
     """
 
-    def __init__(self, params: Union[Iterable, Dict[str, Any]], eps: Optional[float] = 1e-8):
+    def __init__(
+        self, params: Union[Iterable, Dict[str, Any]], eps: Optional[float] = 1e-8, foreach: Optional[bool] = None
+    ):
         """Initialize the optimizer.
 
         Args:
@@ -134,20 +218,89 @@ class CocobOns(optim.Optimizer):
                 parameter groups.
             eps: Positive initial wealth for betting algorithm. Theoretical convergence
                 gauarantee does not depend on choice of `eps`.
+            foreach: Whether the parameters of a group should be updated at once with multi-tensor
+                operators. If `None`, they are used when all parameters are on GPU.
 
         """
 
+        check_foreach(foreach)
+
         self.eps = eps
+        self.foreach = foreach
         defaults = dict(eps=eps)
 
         super(CocobOns, self).__init__(params, defaults)
 
+    def _multi_tensor_step(self, group: Dict[str, Any]) -> None:
+        params, grads, states = [], [], []
+
+        for param in group["params"]:
+            if param.grad is None:
+                continue
+
+            state = self.state[param]
+
+            if len(state) == 0:
+                # Initial weights are copied since parameters are updated in-place
+                state["initial_weight"] = param.detach().clone()
+                state["wealth"] = torch.full_like(param, self.eps)
+                state["bet_fraction"] = torch.zeros_like(param)
+                state["bet"] = torch.zeros_like(param)
+                state["z_square_sum"] = torch.zeros_like(param)
+
+            params.append(param)
+            grads.append(param.grad)
+            states.append(state)
+
+        if not params:
+            return
+
+        initial_weights, wealths, bet_fractions, bets, z_square_sums = (
+            [state[key] for state in states]
+            for key in ["initial_weight", "wealth", "bet_fraction", "bet", "z_square_sum"]
+        )
+
+        # Clip gradients to be in (-1, 1)
+        torch._foreach_clamp_min_(grads, -1.0)
+        torch._foreach_clamp_max_(grads, 1.0)
+
+        # Update better's wealth with the amount won on the -ve gradient prediction
+        torch._foreach_addcmul_(wealths, bets, grads, value=-1)
+
+        # Better decides the bet fraction based on so-far observations
+        # z, A variable notations from Algo 1 in paper)
+        denoms = torch._foreach_mul(bet_fractions, grads)
+        torch._foreach_neg_(denoms)
+        torch._foreach_add_(denoms, 1)
+        zs = torch._foreach_div(grads, denoms)
+        torch._foreach_addcmul_(z_square_sums, zs, zs)
+
+        As = torch._foreach_add(z_square_sums, 1)
+        torch._foreach_div_(zs, As)
+        torch._foreach_add_(bet_fractions, zs, alpha=-(2 / (2 - math.log(3))))
+        torch._foreach_clamp_min_(bet_fractions, -0.5)
+        torch._foreach_clamp_max_(bet_fractions, 0.5)
+
+        # Better makes the bet according to decided betting fraction
+        torch._foreach_copy_(bets, bet_fractions)
+        torch._foreach_mul_(bets, wealths)
+
+        # Set parameter weights
+        torch._foreach_copy_(params, initial_weights)
+        torch._foreach_add_(params, bets)
+
+    @torch.no_grad()
     def step(self, closure: Optional[Callable] = None) -> torch.FloatTensor:
         loss = None
         if closure is not None:
-            loss = closure()
+            with torch.enable_grad():
+                loss = closure()
 
         for group in self.param_groups:
+            if use_foreach(self.foreach, group["params"]):
+                self._multi_tensor_step(group)
+                continue
+
             for param in group["params"]:
                 if param.grad is None:
                     continue
@@ -5,11 +5,17 @@
 # Copyright (c) 2019 cybertronai.
 # Licensed under the MIT license.
 
-from typing import Iterable, Optional, Tuple
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 import torch
 from torch.optim import Optimizer
 
+from archai.trainers.optimizer_utils import (
+    check_foreach,
+    group_tensors_by_device_and_dtype,
+    use_foreach,
+)
+
 
 class Lamb(Optimizer):
     """Lamb algorithm for large batch optimization.
@@ -30,6 +36,7 @@ class Lamb(Optimizer):
         eps: Optional[float] = 1e-6,
         weight_decay: Optional[float] = 0.0,
         adam: Optional[bool] = False,
+        foreach: Optional[bool] = None,
     ) -> None:
         """Initialize the optimizer.
 
@@ -40,6 +47,8 @@ class Lamb(Optimizer):
             eps: Term added to the denominator to improve numerical stability.
             weight_decay: Weight decay.
             adam: Whether to turn current optimizer into Adam.
+            foreach: Whether the parameters of a group should be updated at once with multi-tensor
+                operators. If `None`, they are used when all parameters are on GPU.
 
         Raises:
             ValueError: If the learning rate, epsilon value, or beta parameters are invalid.
@@ -55,18 +64,91 @@ class Lamb(Optimizer):
         if not 0.0 <= betas[1] < 1.0:
             raise ValueError("Invalid beta parameter at index 1: {}".format(betas[1]))
 
+        check_foreach(foreach)
+
         defaults = dict(lr=lr, betas=betas, eps=eps, weight_decay=weight_decay)
 
         self.adam = adam
+        self.foreach = foreach
 
         super().__init__(params, defaults)
 
+    def _multi_tensor_step(self, group: Dict[str, Any]) -> None:
+        params, grads, exp_avgs, exp_avg_sqs = [], [], [], []
+
+        for p in group["params"]:
+            if p.grad is None:
+                continue
+
+            if p.grad.is_sparse:
+                raise RuntimeError("Lamb does not support sparse gradients.")
+
+            state = self.state[p]
+
+            # State initialization
+            if len(state) == 0:
+                state["step"] = 0
+                state["exp_avg"] = torch.zeros_like(p, memory_format=torch.preserve_format)
+                state["exp_avg_sq"] = torch.zeros_like(p, memory_format=torch.preserve_format)
+
+            state["step"] += 1
+
+            params.append(p)
+            grads.append(p.grad)
+            exp_avgs.append(state["exp_avg"])
+            exp_avg_sqs.append(state["exp_avg_sq"])
+
+        beta1, beta2 = group["betas"]
+
+        # Trust ratios are stacked to be computed at once, which requires tensors on the same device and data type
+        grouped_tensors = group_tensors_by_device_and_dtype(params, grads, exp_avgs, exp_avg_sqs)
+        for params, grads, exp_avgs, exp_avg_sqs in grouped_tensors.values():
+            # m_t and v_t
+            torch._foreach_mul_(exp_avgs, beta1)
+            torch._foreach_add_(exp_avgs, grads, alpha=1 - beta1)
+            torch._foreach_mul_(exp_avg_sqs, beta2)
+            torch._foreach_addcmul_(exp_avg_sqs, grads, grads, value=1 - beta2)
+
+            denoms = torch._foreach_sqrt(exp_avg_sqs)
+            torch._foreach_add_(denoms, group["eps"])
+            adam_steps = torch._foreach_div(exp_avgs, denoms)
+            if group["weight_decay"] != 0:
+                torch._foreach_add_(adam_steps, params, alpha=group["weight_decay"])
+
+            weight_norms = torch.stack(torch._foreach_norm(params)).clamp_(0, 10)
+            adam_norms = torch.stack(torch._foreach_norm(adam_steps))
+
+            # Trust ratios are selected on device instead of branching on the host
+            trust_ratios = torch.where(
+                (weight_norms == 0.0) | (adam_norms == 0.0),
+                torch.ones_like(weight_norms),
+                weight_norms / (adam_norms + group["eps"]),
+            )
+
+            for p, weight_norm, adam_norm, trust_ratio in zip(params, weight_norms, adam_norms, trust_ratios):
+                state = self.state[p]
+                state["weight_norm"] = weight_norm
+                state["adam_norm"] = adam_norm
+                state["trust_ratio"] = trust_ratio
+
+            if self.adam:
+                torch._foreach_add_(params, adam_steps, alpha=-group["lr"])
+            else:
+                torch._foreach_mul_(adam_steps, (trust_ratios * -group["lr"]).unbind())
+                torch._foreach_add_(params, adam_steps)
+
+    @torch.no_grad()
     def step(self, closure: Optional[callable] = None) -> torch.FloatTensor:
         loss = None
         if closure is not None:
-            loss = closure()
+            with torch.enable_grad():
+                loss = closure()
 
         for group in self.param_groups:
+            if use_foreach(self.foreach, group["params"]):
+                self._multi_tensor_step(group)
+                continue
+
             for p in group["params"]:
                 if p.grad is None:
                     continue
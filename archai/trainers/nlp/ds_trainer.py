@@ -233,6 +233,17 @@ class DsTrainer(TrainerBase):
 
         return total_loss / gradient_accumulation_steps
 
+    def _save_trainer_state(self) -> None:
+        # Trainer's state is written by a single rank and atomically renamed,
+        # so that it always matches a complete checkpoint
+        if self.engine.global_rank != 0:
+            return
+
+        trainer_state_path = os.path.join(self.args.output_dir, "trainer_state.json")
+        with open(trainer_state_path + ".tmp", "w") as f:
+            json.dump(self.client_state, f)
+        os.replace(trainer_state_path + ".tmp", trainer_state_path)
+
     @overrides
     def train(
         self,
@@ -344,9 +355,10 @@ class DsTrainer(TrainerBase):
                 self.client_state["total_consumed_samples"] = self.engine.global_samples
                 self.client_state["log_history"] = log_history
 
+                # DeepSpeed checkpoints are sharded and collectively saved by the engine
                 self.engine.save_checkpoint(self.args.output_dir, step + 1, client_state=self.client_state)
-                with open(os.path.join(self.args.output_dir, "trainer_state.json"), "w") as f:
-                    json.dump(self.client_state, f)
+
+                self._save_trainer_state()
 
         train_time = time.time() - train_time
 
@@ -5,10 +5,9 @@ import copy
 import itertools
 import math
 import os
-import shutil
 import sys
 import time
-from typing import Any, Dict, Iterator, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 import torch
 import torch.nn as nn
@@ -27,6 +26,10 @@ from archai.datasets.nlp.nvidia_data_loader_utils import (
 from archai.datasets.nlp.nvidia_dataset_provider import NvidiaDatasetProvider
 from archai.quantization.mixed_qat import MixedQAT
 from archai.quantization.qat import prepare_with_qat, qat_to_float_modules
+from archai.trainers.async_checkpoint_writer import (
+    AsyncCheckpointWriter,
+    save_atomic,
+)
 from archai.trainers.cyclic_cosine_scheduler import CyclicCosineDecayLR
 from archai.trainers.lamb_optimizer import JITLamb, Lamb
 from archai.trainers.nlp.nvidia_training_args import NvidiaTrainingArguments
@@ -45,6 +48,7 @@ def save_checkpoint(
     prefix: Optional[str] = "",
     save_all_checkpoints: Optional[bool] = False,
     is_best_model: Optional[bool] = False,
+    checkpoint_writer: Optional[AsyncCheckpointWriter] = None,
 ) -> None:
     """Save a checkpoint that holds enough information to resume the training.
 
@@ -58,6 +62,10 @@ def save_checkpoint(
     If `save_all_checkpoints` is `True`, the function will also save a copy of the checkpoint
     with the step number in the file name.
 
+    Checkpoints are written atomically and their copies are hard links to the same file. If
+    `checkpoint_writer` is supplied, the function returns as soon as the state has been snapshotted,
+    and the checkpoint is written in the background.
+
     Args:
         output_dir: Folder where checkpoint should be saved.
         model: Instance of model.
@@ -69,40 +77,39 @@ def save_checkpoint(
         prefix: Prefix which should be added to the checkpoint's file name.
         save_all_checkpoints: Whether all `eval_steps` steps should be saved.
         is_best_model: Whether best model should be saved.
+        checkpoint_writer: Writer used to save the checkpoint in the background.
 
     """
 
-    state = {
-        "model_config": model.config,
-        "model_state": model.state_dict(),
-        "optimizer_state": optimizer.state_dict(),
-        "scheduler_state": scheduler.state_dict() if scheduler else None,
-        "scaler_state": scaler.state_dict() if fp16 else None,
-        "trainer_state": trainer_state,
-    }
-
     checkpoint_name = prefix + "checkpoint-last.pt"
 
     with sync_workers() as rank:
         checkpoint_path = os.path.join(output_dir, checkpoint_name)
 
         if rank == 0:
-            logger.info(f"Saving checkpoint: {checkpoint_path}")
-            torch.save(state, checkpoint_path)
-
+            state = {
+                "model_config": model.config,
+                "model_state": model.state_dict(),
+                "optimizer_state": optimizer.state_dict(),
+                "scheduler_state": scheduler.state_dict() if scheduler else None,
+                "scaler_state": scaler.state_dict() if fp16 else None,
+                "trainer_state": trainer_state,
+            }
+
+            checkpoint_link_paths = []
             if is_best_model:
-                checkpoint_step_name = prefix + "checkpoint-best.pt"
-                checkpoint_step_path = os.path.join(output_dir, checkpoint_step_name)
-
-                logger.info(f"Saving checkpoint: {checkpoint_step_path}")
-                shutil.copy(checkpoint_path, checkpoint_step_path)
-
+                checkpoint_link_paths.append(os.path.join(output_dir, prefix + "checkpoint-best.pt"))
             if save_all_checkpoints:
                 checkpoint_step_name = prefix + f"checkpoint-{trainer_state['step']}.pt"
-                checkpoint_step_path = os.path.join(output_dir, checkpoint_step_name)
+                checkpoint_link_paths.append(os.path.join(output_dir, checkpoint_step_name))
+
+            for path in [checkpoint_path] + checkpoint_link_paths:
+                logger.info(f"Saving checkpoint: {path}")
 
-                logger.info(f"Saving checkpoint: {checkpoint_step_path}")
-                shutil.copy(checkpoint_path, checkpoint_step_path)
+            if checkpoint_writer is not None:
+                checkpoint_writer.save(state, checkpoint_path, link_file_paths=checkpoint_link_paths)
+            else:
+                save_atomic(state, checkpoint_path, link_file_paths=checkpoint_link_paths)
 
 
 class NvidiaTrainer(TrainerBase):
@@ -141,6 +148,8 @@ class NvidiaTrainer(TrainerBase):
 
         self.model.to(self.args.device)
 
+        self.checkpoint_writer = None
+
         self.trainer_state = {
             "iterator": 0,
             "epoch": 0,
@@ -297,7 +306,7 @@ class NvidiaTrainer(TrainerBase):
 
     def _training_step_chunk(
         self, input_ids: torch.LongTensor, labels: torch.LongTensor, autocast: torch.autocast
-    ) -> float:
+    ) -> Union[float, torch.Tensor]:
         with autocast:
             loss = self.dist_model(input_ids, labels=input_ids)[0]
             loss = loss.float().mean().type_as(loss) / self.args.gradient_accumulation_steps
@@ -307,8 +316,25 @@ class NvidiaTrainer(TrainerBase):
         else:
             loss.backward()
 
+        # Loss is kept on device to prevent a host synchronization for every chunk
+        if self.args.sync_free_accumulation:
+            return loss.detach().float()
+
         return loss.float().item()
 
+    def _zero_grad(self, parameters: List[torch.nn.Parameter]) -> None:
+        # Gradients are set to `None` instead of zeroed, which frees their memory and
+        # lets the first backward pass assign them instead of accumulating into zeros
+        for param in parameters:
+            param.grad = None
+
+    def _clip_grad_norm(self, parameters: List[torch.nn.Parameter]) -> None:
+        # Multi-tensor (`foreach`) implementation is only available with PyTorch >= 2.0
+        if self.args.sync_free_accumulation and version.parse(torch.__version__) >= version.parse("2.0"):
+            torch.nn.utils.clip_grad_norm_(parameters, self.args.max_grad_norm, foreach=True)
+        else:
+            torch.nn.utils.clip_grad_norm_(parameters, self.args.max_grad_norm)
+
     def _training_step(
         self,
         train_dataloader: Iterator,
@@ -320,6 +346,8 @@ class NvidiaTrainer(TrainerBase):
     ) -> None:
         self.model.train()
 
+        parameters = list(self.model.parameters())
+
         train_loss, log_step, n_labels_tokens = 0.0, 0, 0
         best_eval_loss = self.trainer_state["best_eval_loss"]
 
@@ -341,8 +369,7 @@ class NvidiaTrainer(TrainerBase):
             log_step += 1
             n_labels_tokens += labels.numel()
 
-            for param in self.model.parameters():
-                param.grad = None
+            self._zero_grad(parameters)
 
             # Split into chunks for gradient accumulation
             input_ids_chunks = torch.chunk(input_ids, self.args.gradient_accumulation_steps, 0)
@@ -361,9 +388,7 @@ class NvidiaTrainer(TrainerBase):
 
             if self.args.fp16:
                 self.scaler.unscale_(self.optimizer)
-                torch.nn.utils.clip_grad_norm_(self.model.parameters(), self.args.max_grad_norm)
-            else:
-                torch.nn.utils.clip_grad_norm_(self.model.parameters(), self.args.max_grad_norm)
+            self._clip_grad_norm(parameters)
 
             if self.args.fp16:
                 self.scaler.step(self.optimizer)
@@ -390,6 +415,10 @@ class NvidiaTrainer(TrainerBase):
 
                 lr = self.optimizer.param_groups[0]["lr"]
 
+                # On-device loss is only synchronized with the host when logging
+                if isinstance(train_loss, torch.Tensor):
+                    train_loss = train_loss.item()
+
                 loss = train_loss / log_step
                 loss = all_reduce(loss, op="mean")
 
@@ -446,7 +475,7 @@ class NvidiaTrainer(TrainerBase):
                 )
 
                 iterator = train_dataloader.last_iter
-                save_model = copy.deepcopy(self.model)
+                save_model = self.model
                 prefix = ""
 
                 self.trainer_state["iterator"] = iterator
@@ -454,8 +483,9 @@ class NvidiaTrainer(TrainerBase):
                 self.trainer_state["batch"] = batch
                 self.trainer_state["step"] = step
 
-                # Model needs to be converted back to FP32 when using QAT
+                # Model needs to be converted back to FP32 when using QAT (on a copy, since it is in-place)
                 if self.args.qat:
+                    save_model = copy.deepcopy(self.model)
                     qat_to_float_modules(save_model)
                     prefix = "qat-"
 
@@ -481,6 +511,7 @@ class NvidiaTrainer(TrainerBase):
                     prefix=prefix,
                     save_all_checkpoints=self.args.save_all_checkpoints,
                     is_best_model=is_best_model,
+                    checkpoint_writer=self.checkpoint_writer,
                 )
 
             if is_final_step:
@@ -522,6 +553,8 @@ class NvidiaTrainer(TrainerBase):
         logger.info("Starting training ...")
         logger.debug(f"Training arguments: {self.args.to_dict()}")
 
+        self.checkpoint_writer = AsyncCheckpointWriter() if self.args.async_checkpoint else None
+
         start_time = time.time()
         try:
             for epoch in itertools.count(start=start_epoch):
@@ -538,6 +571,11 @@ class NvidiaTrainer(TrainerBase):
 
         except KeyboardInterrupt:
             logger.info("Exiting from training ...")
+        finally:
+            # Ensures that the last checkpoint is completely written before returning
+            if self.checkpoint_writer is not None:
+                self.checkpoint_writer.close()
+                self.checkpoint_writer = None
         end_time = time.time()
 
         train_time = end_time - start_time
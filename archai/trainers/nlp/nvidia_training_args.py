@@ -83,6 +83,7 @@ class NvidiaTrainingArguments:
         do_eval: Whether to enable evaluation.
         eval_steps: Number of steps between evaluations.
         save_all_checkpoints: Whether to save all checkpoints from `eval_steps` steps.
+        async_checkpoint: Whether checkpoints should be written in the background.
         dataset_name: Name of the dataset.
         dataset_dir: Dataset folder.
         dataset_cache_dir: Dataset cache folder.
@@ -98,6 +99,8 @@ class NvidiaTrainingArguments:
         find_unused_parameters: Whether unused parameters should be found.
         max_steps: Maximum number of training steps.
         gradient_accumulation_steps: Number of gradient accumulation steps.
+        sync_free_accumulation: Whether training losses should be accumulated on device and only
+            synchronized with the host when logging.
         fp16: Whether FP16 precision should be used.
         optim: Name of the optimizer.
         learning_rate: Optimizer learning rate.
@@ -136,6 +139,10 @@ class NvidiaTrainingArguments:
         default=False, metadata={"help": "Whether to save all checkpoints from `eval_steps` steps."}
     )
 
+    async_checkpoint: bool = field(
+        default=True, metadata={"help": "Whether checkpoints should be written in the background."}
+    )
+
     dataset_name: str = field(default="wt103", metadata={"help": "Name of the dataset."})
 
     dataset_dir: str = field(default="", metadata={"help": "Dataset folder."})
@@ -166,6 +173,10 @@ class NvidiaTrainingArguments:
 
     gradient_accumulation_steps: int = field(default=1, metadata={"help": "Number of gradient accumulation steps."})
 
+    sync_free_accumulation: bool = field(
+        default=True, metadata={"help": "Whether losses should be accumulated on device and synchronized when logging."}
+    )
+
     fp16: bool = field(default=False, metadata={"help": "Whether FP16 precision should be used."})
 
     optim: str = field(default="jitlamb", metadata={"help": "Name of the optimizer."})
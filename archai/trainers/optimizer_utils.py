@@ -0,0 +1,70 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT license.
+
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import torch
+from packaging import version
+
+# Multi-tensor (`foreach`) operators used by the optimizers are only available with PyTorch >= 2.1
+FOREACH_AVAILABLE = version.parse(torch.__version__).release >= (2, 1)
+
+
+def check_foreach(foreach: Optional[bool]) -> None:
+    """Check whether multi-tensor operators can be used.
+
+    Args:
+        foreach: Whether multi-tensor operators should be used.
+
+    Raises:
+        ValueError: If multi-tensor operators are required but not available.
+
+    """
+
+    if foreach and not FOREACH_AVAILABLE:
+        raise ValueError("Multi-tensor (`foreach`) operators require PyTorch >= 2.1.")
+
+
+def use_foreach(foreach: Optional[bool], params: List[torch.Tensor]) -> bool:
+    """Decide whether multi-tensor operators should be used to update the parameters.
+
+    When not explicitly set, they are only used if all parameters are on GPU, since on CPU,
+    they fall back to per-tensor kernels which are slower than their in-place counterparts.
+
+    Args:
+        foreach: Whether multi-tensor operators should be used. If `None`, it is automatically decided.
+        params: Parameters to be updated.
+
+    Returns:
+        Whether multi-tensor operators should be used.
+
+    """
+
+    if foreach is None:
+        return FOREACH_AVAILABLE and all(param.is_cuda for param in params)
+
+    return foreach
+
+
+def group_tensors_by_device_and_dtype(
+    *tensor_lists: List[torch.Tensor],
+) -> Dict[Tuple[torch.device, torch.dtype], List[List[torch.Tensor]]]:
+    """Group lists of tensors by the device and data type of the first list's tensors.
+
+    Args:
+        tensor_lists: Lists of tensors with the same length.
+
+    Returns:
+        Lists of tensors for each device and data type.
+
+    """
+
+    grouped_tensors = defaultdict(lambda: [[] for _ in tensor_lists])
+
+    for tensors in zip(*tensor_lists):
+        group = grouped_tensors[(tensors[0].device, tensors[0].dtype)]
+        for tensor_list, tensor in zip(group, tensors):
+            tensor_list.append(tensor)
+
+    return grouped_tensors
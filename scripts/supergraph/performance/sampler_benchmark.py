@@ -0,0 +1,99 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT license.
+
+import argparse
+import time
+from typing import List, Tuple
+
+import numpy as np
+from sklearn.model_selection import StratifiedKFold
+
+from archai.supergraph.datasets.distributed_stratified_sampler import (
+    DistributedStratifiedSampler,
+)
+
+
+class _Dataset:
+    def __init__(self, targets: List[int]) -> None:
+        self.targets = targets
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+
+class _LegacySampler(DistributedStratifiedSampler):
+    """Previous implementation: targets are gathered element by element, ranks are split with
+    scikit-learn and nothing is cached across epochs."""
+
+    def _is_epoch_independent(self) -> bool:
+        return False
+
+    def _get_indices(self) -> Tuple[np.ndarray, np.ndarray]:
+        indices, _ = super()._get_indices()
+        targets = np.array(list(self.dataset.targets[i] for i in indices))
+
+        return indices, targets
+
+    def _split_rank(self, indices: np.ndarray, targets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if self.world_size > 1:
+            folds = StratifiedKFold(n_splits=self.world_size, shuffle=False).split(indices, targets)
+            for _ in range(self.rank + 1):
+                _, replica_fold_idxs = next(folds)
+
+            return indices[replica_fold_idxs], targets[replica_fold_idxs]
+
+        return indices, targets
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmarks the epoch-start latency of DistributedStratifiedSampler.")
+
+    parser.add_argument("-n", "--n_samples", type=int, default=1281167, help="Number of samples (ImageNet by default).")
+
+    parser.add_argument("-c", "--n_classes", type=int, default=1000, help="Number of classes.")
+
+    parser.add_argument("-ws", "--world_size", type=int, default=8, help="Number of replicas.")
+
+    parser.add_argument("-vr", "--val_ratio", type=float, default=0.0, help="Ratio of the validation split.")
+
+    parser.add_argument("-e", "--n_epochs", type=int, default=3, help="Number of timed epochs.")
+
+    args = parser.parse_args()
+
+    return args
+
+
+def benchmark(sampler: DistributedStratifiedSampler, n_epochs: int) -> Tuple[List[float], List[np.ndarray]]:
+    times, indices = [], []
+    for epoch in range(n_epochs):
+        sampler.set_epoch(epoch)
+
+        # Seeds the shuffle of validation splits, so both samplers return the same indices
+        np.random.seed(epoch)
+
+        start_time = time.perf_counter()
+        indices.append(np.fromiter(iter(sampler), dtype=np.int64))
+        times.append(time.perf_counter() - start_time)
+
+    return times, indices
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    dataset = _Dataset(np.random.default_rng(0).integers(args.n_classes, size=args.n_samples).tolist())
+    print(
+        f"Samples: {args.n_samples} | Classes: {args.n_classes} | World size: {args.world_size} | "
+        f"Validation ratio: {args.val_ratio}"
+    )
+
+    results = {}
+    for name, sampler_cls in [("Legacy", _LegacySampler), ("Current", DistributedStratifiedSampler)]:
+        sampler = sampler_cls(dataset, world_size=args.world_size, rank=args.world_size - 1, val_ratio=args.val_ratio)
+        results[name] = benchmark(sampler, args.n_epochs)
+
+        times = " | ".join(f"{t * 1000:.1f}" for t in results[name][0])
+        print(f"{name}: {times} ms/epoch")
+
+    assert all(np.array_equal(i, j) for i, j in zip(results["Legacy"][1], results["Current"][1]))
+    print(f"Speedup: {np.mean(results['Legacy'][0]) / np.mean(results['Current'][0]):.2f}x")
@@ -0,0 +1,77 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT license.
+
+import argparse
+import time
+from typing import Callable, List
+
+import torch
+
+from archai.trainers.coin_betting_optimizer import CocobBackprop, CocobOns
+from archai.trainers.lamb_optimizer import JITLamb, Lamb
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmarks the per-parameter and multi-tensor optimizers.")
+
+    parser.add_argument("-np", "--n_params", type=int, default=200, help="Number of parameter tensors.")
+
+    parser.add_argument("-ps", "--param_size", type=int, default=256, help="Size of each (square) parameter tensor.")
+
+    parser.add_argument("-n", "--n_steps", type=int, default=50, help="Number of timed optimizer steps.")
+
+    parser.add_argument("-d", "--device", type=str, default="cpu", help="Device where parameters are placed.")
+
+    args = parser.parse_args()
+
+    return args
+
+
+def benchmark(create_optimizer: Callable, params: List[torch.Tensor], n_steps: int, device: torch.device) -> float:
+    params = [param.detach().clone().requires_grad_() for param in params]
+    for param in params:
+        param.grad = torch.randn_like(param) * 1e-2
+
+    optimizer = create_optimizer(params)
+
+    # Warms up the optimizer, which initializes its state
+    optimizer.step()
+
+    if device.type == "cuda":
+        torch.cuda.synchronize()
+    start_time = time.perf_counter()
+
+    for _ in range(n_steps):
+        optimizer.step()
+
+    if device.type == "cuda":
+        torch.cuda.synchronize()
+
+    return (time.perf_counter() - start_time) / n_steps
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    device = torch.device(args.device)
+    params = [torch.randn(args.param_size, args.param_size, device=device) for _ in range(args.n_params)]
+
+    optimizers = {
+        "Lamb": lambda params, foreach: Lamb(params, weight_decay=0.01, foreach=foreach),
+        "CocobBackprop": lambda params, foreach: CocobBackprop(params, foreach=foreach),
+        "CocobOns": lambda params, foreach: CocobOns(params, foreach=foreach),
+    }
+
+    print(f"Parameters: {args.n_params} x ({args.param_size}, {args.param_size}) | Device: {device}")
+
+    jit_lamb_time = benchmark(lambda params: JITLamb(params, weight_decay=0.01), params, args.n_steps, device)
+    print(f"JITLamb: {jit_lamb_time * 1000:.3f} ms/step")
+
+    for name, create_optimizer in optimizers.items():
+        step_time = benchmark(lambda params: create_optimizer(params, False), params, args.n_steps, device)
+        foreach_step_time = benchmark(lambda params: create_optimizer(params, True), params, args.n_steps, device)
+
+        print(
+            f"{name}: {step_time * 1000:.3f} ms/step | foreach: {foreach_step_time * 1000:.3f} ms/step | "
+            f"Speedup: {step_time / foreach_step_time:.2f}x"
+        )
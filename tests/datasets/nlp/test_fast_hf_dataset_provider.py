@@ -2,6 +2,13 @@
 # Licensed under the MIT license.
 
 import shutil
+
+import numpy as np
+import pytest
+from datasets import Dataset, DatasetDict
+from tokenizers import Tokenizer, models, pre_tokenizers
+from transformers import PreTrainedTokenizerFast
+
 from archai.datasets.nlp.fast_hf_dataset_provider import FastHfDatasetProvider
 
 TEST_CACHE_DIR='test_fast_hf_dataset_cache'
@@ -41,3 +48,46 @@ def test_fast_hf_dataset_provider_from_cache():
         assert len(test_dataset) == 169
 
     shutil.rmtree(TEST_CACHE_DIR)
+
+
+@pytest.mark.parametrize(
+    "use_streaming,use_shared_memory,num_workers",
+    [(False, False, 1), (False, True, 2), (True, False, 1), (True, False, 2)],
+)
+def test_fast_hf_dataset_provider_document_boundaries(tmp_path, use_streaming, use_shared_memory, num_workers):
+    # Word-level tokenizer, which encodes `w{i}` as `i + 1` and splits the EOS token from the last word
+    vocab = {"<eos>": 0, **{f"w{i}": i + 1 for i in range(9)}}
+    tokenizer = Tokenizer(models.WordLevel(vocab, unk_token="<eos>"))
+    tokenizer.pre_tokenizer = pre_tokenizers.Sequence(
+        [pre_tokenizers.Split("<eos>", "isolated"), pre_tokenizers.WhitespaceSplit()]
+    )
+    tokenizer = PreTrainedTokenizerFast(tokenizer_object=tokenizer, eos_token="<eos>")
+
+    # Splits have more documents than a batch of the default mapping function
+    texts = [" ".join(f"w{j}" for j in range(i % 7 + 1)) for i in range(2500)]
+    splits = {"train": texts, "validation": texts[:1200], "test": texts[:10]}
+    DatasetDict({split: Dataset.from_dict({"text": texts}) for split, texts in splits.items()}).save_to_disk(
+        str(tmp_path / "dataset")
+    )
+
+    dataset_provider = FastHfDatasetProvider.from_disk(
+        str(tmp_path / "dataset"),
+        tokenizer=tokenizer,
+        num_workers=num_workers,
+        use_shared_memory=use_shared_memory,
+        use_streaming=use_streaming,
+        cache_dir=str(tmp_path / "cache"),
+    )
+
+    # Assert that offsets mark the end of every document (with its EOS token)
+    for split, texts in splits.items():
+        document_lengths = [i % 7 + 2 for i in range(len(texts))]
+        assert np.load(tmp_path / "cache" / f"{split}.npy").tolist() == [
+            token for length in document_lengths for token in list(range(1, length)) + [0]
+        ]
+        assert np.load(tmp_path / "cache" / f"{split}_offsets.npy").tolist() == np.cumsum(document_lengths).tolist()
+
+    # Assert that labels are ignored exactly when inputs are EOS tokens, i.e., at the end of documents
+    with dataset_provider.get_train_dataset(seq_len=64, use_document_boundaries=True) as train_dataset:
+        for input_ids, labels in train_dataset.__getitems__(list(range(len(train_dataset)))):
+            assert labels.eq(-100).tolist() == input_ids.eq(0).tolist()
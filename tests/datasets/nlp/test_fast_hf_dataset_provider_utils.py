@@ -0,0 +1,79 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT license.
+
+import pickle
+
+import numpy as np
+import torch
+from datasets import Dataset
+from torch.utils.data import DataLoader
+
+from archai.datasets.nlp.fast_hf_dataset_provider_utils import (
+    FastHfDataset,
+    _get_streaming_shard,
+    process_with_streaming,
+)
+
+
+def _encode_examples(examples, dtype=np.uint16):
+    return {"input_ids": [np.array(text.split(), dtype=dtype) for text in examples["text"]]}
+
+
+def test_fast_hf_dataset(tmp_path):
+    np.save(tmp_path / "input_ids.npy", np.arange(1001, dtype=np.uint16))
+    input_ids = np.load(tmp_path / "input_ids.npy", mmap_mode="r")
+
+    with FastHfDataset(input_ids, seq_len=10) as dataset:
+        assert len(dataset) == 100
+
+        # Assert that batches of sequences are the same as individual sequences
+        indices = [0, 42, 99]
+        for idx, (batch_input_ids, batch_labels) in zip(indices, dataset.__getitems__(indices)):
+            input_ids, labels = dataset[idx]
+            assert input_ids.tolist() == list(range(idx * 10, idx * 10 + 10))
+            assert labels.tolist() == list(range(idx * 10 + 1, idx * 10 + 11))
+            assert torch.equal(batch_input_ids, input_ids) and torch.equal(batch_labels, labels)
+            assert batch_input_ids.dtype == torch.int64
+
+        # Assert that data loaders gather batches with `__getitems__`
+        input_ids, labels = next(iter(DataLoader(dataset, batch_size=4)))
+        assert input_ids.shape == (4, 10)
+        assert torch.equal(labels[:, :-1], input_ids[:, 1:])
+
+
+def test_fast_hf_dataset_document_boundaries():
+    dataset = FastHfDataset(np.arange(41, dtype=np.uint16), seq_len=10, document_offsets=np.array([5, 25, 41]))
+
+    # Assert that labels from a different document than their inputs are ignored
+    _, labels = dataset[0]
+    assert labels.tolist() == [1, 2, 3, 4, -100, 6, 7, 8, 9, 10]
+
+    batch = dataset.__getitems__([0, 1, 2])
+    assert [labels.eq(-100).nonzero().flatten().tolist() for _, labels in batch] == [[4], [], [4]]
+
+
+def test_process_with_streaming(tmp_path):
+    texts = [" ".join(str(i) for i in range(n % 7)) for n in range(100)]
+    dataset_dict = {"train": Dataset.from_dict({"text": texts}), "test": Dataset.from_dict({"text": texts[:3]})}
+
+    # Assert that shards encoded by different processes are concatenated in order
+    cache_files = process_with_streaming(
+        dataset_dict, tmp_path, np.uint16, _encode_examples, {}, num_proc=2, batch_size=16
+    )
+    assert np.load(cache_files["train"]).tolist() == [int(token) for text in texts for token in text.split()]
+    assert np.load(tmp_path / "train_offsets.npy").tolist() == np.cumsum([n % 7 for n in range(100)]).tolist()
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "test.npy",
+        "test_offsets.npy",
+        "train.npy",
+        "train_offsets.npy",
+    ]
+
+
+def test_get_streaming_shard():
+    dataset = Dataset.from_dict({"text": [str(i) * 100 for i in range(1000)]})
+
+    # Assert that shards of in-memory datasets are pickled without the rest of the table
+    shards = [_get_streaming_shard(dataset, 4, i) for i in range(4)]
+    assert [text for shard in shards for text in shard["text"]] == dataset["text"]
+    assert all(len(pickle.dumps(shard)) < len(pickle.dumps(dataset)) / 3 for shard in shards)
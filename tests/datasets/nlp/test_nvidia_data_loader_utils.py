@@ -4,6 +4,7 @@
 import torch
 import os
 import shutil
+import numpy as np
 from archai.datasets.nlp.tokenizer_utils.gpt2_tokenizer import Gpt2Tokenizer
 from archai.datasets.nlp.nvidia_data_loader_utils import LMOrderedIterator, LMMultiFileIterator
 
@@ -29,6 +30,58 @@ def test_lm_ordered_iterator():
     assert warmup is True
 
 
+def test_lm_ordered_iterator_warmup_roll(tmp_path):
+    # Assert that warmup batches prepend the end of the previous row
+    iterator = LMOrderedIterator(torch.arange(16), 2, 4, mem_len=4)
+    input_ids, labels, seq_len, warmup = next(iter(iterator))
+    assert input_ids.tolist() == [[12, 13, 14, 15], [4, 5, 6, 7]]
+    assert labels.tolist() == [[13, 14, 15, 0], [5, 6, 7, 8]]
+    assert warmup is False
+    assert iterator.n_batch == 3
+
+    # Assert that memory-mapped arrays give the same batches as tensors after rolling
+    np.save(tmp_path / "input_ids.npy", np.arange(1000, dtype=np.uint16))
+    mmap_input_ids = np.load(tmp_path / "input_ids.npy", mmap_mode="r")
+
+    iterator = LMOrderedIterator(torch.arange(1000), 4, 16, mem_len=16)
+    mmap_iterator = LMOrderedIterator(mmap_input_ids, 4, 16, mem_len=16)
+    iterator.roll(seed=1)
+    mmap_iterator.roll(seed=1)
+
+    for batch, mmap_batch in zip(iterator, mmap_iterator):
+        assert mmap_batch[0].dtype == torch.int64
+        assert torch.equal(batch[0], mmap_batch[0]) and torch.equal(batch[1], mmap_batch[1])
+
+    # Assert that each row is rolled independently and the array is not modified
+    mmap_iterator = LMOrderedIterator(mmap_input_ids, 4, 10)
+    mmap_iterator.roll(seed=1)
+
+    rows = torch.cat([input_ids for input_ids, _, _, _ in mmap_iterator], dim=1)
+    for i, row in enumerate(rows):
+        unrolled_row = torch.arange(i * 250, (i + 1) * 250)
+        assert torch.equal(row, unrolled_row.roll(-(row[0].item() - i * 250))[:249])
+    assert np.array_equal(mmap_input_ids, np.arange(1000))
+
+
+def test_lm_ordered_iterator_gather_out(tmp_path):
+    np.save(tmp_path / "input_ids.npy", np.arange(1000, dtype=np.uint16))
+    mmap_input_ids = np.load(tmp_path / "input_ids.npy", mmap_mode="r")
+
+    # Assert that batches gathered into a preallocated buffer match the allocated ones,
+    # with and without rolling (which gathers indices instead of slicing)
+    iterator = LMOrderedIterator(mmap_input_ids, 4, 16, mem_len=16)
+    buffer = torch.empty(4 * 16 * 2, dtype=torch.long)
+
+    for seed in [None, 1]:
+        if seed is not None:
+            iterator.roll(seed=seed)
+
+        for start_idx in [0, 16, 100]:
+            out = iterator._gather(start_idx, start_idx + 16, out=buffer[64:].view(4, -1))
+            assert out.data_ptr() == buffer[64:].data_ptr()
+            assert torch.equal(out, iterator._gather(start_idx, start_idx + 16))
+
+
 def test_lm_multi_file_iterator():
     input_files = [f"tmp_{i}.txt" for i in range(5)]
     for input_file in input_files:
@@ -49,3 +102,33 @@ def test_lm_multi_file_iterator():
     for input_file in input_files:
         os.remove(input_file)
     shutil.rmtree("tokenizer")
+
+
+def test_lm_multi_file_iterator_stream_iterator():
+    class RangeTokenizer:
+        def encode_file(self, path):
+            return torch.arange(int(path))
+
+    iterator = LMMultiFileIterator(["100"], RangeTokenizer(), 2, 4, ext_len=2, n_chunks=1)
+    batches = list(iterator.stream_iterator(torch.arange(100)))
+
+    # Assert that each row is carved out of `bptt + 1` contiguous tokens
+    # and that inputs retain the last `ext_len` input tokens of previous batches
+    assert len(batches) == 10
+    input_ids, labels, seq_len, warmup = batches[0]
+    assert input_ids.tolist() == [[0, 1, 2, 3], [5, 6, 7, 8]]
+    assert labels.tolist() == [[1, 2, 3, 4], [6, 7, 8, 9]]
+
+    input_ids, labels, seq_len, warmup = batches[1]
+    assert input_ids.tolist() == [[2, 3, 10, 11, 12, 13], [7, 8, 15, 16, 17, 18]]
+    assert labels.tolist() == [[11, 12, 13, 14], [16, 17, 18, 19]]
+    assert seq_len == 4 and warmup is True
+
+    # Assert that iterators over tokens and prefetched batches give the same results
+    for iterator_batch, batch in zip(iterator.stream_iterator(iter(torch.arange(100))), batches):
+        assert torch.equal(iterator_batch[0], batch[0]) and torch.equal(iterator_batch[1], batch[1])
+
+    iterator.prefetch = 2
+    for iterator_batch, batch in zip(iterator, batches):
+        assert torch.equal(iterator_batch[0], batch[0]) and torch.equal(iterator_batch[1], batch[1])
+    assert iterator.last_iter == 9
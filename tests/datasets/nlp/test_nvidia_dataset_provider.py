@@ -4,6 +4,8 @@
 import os
 import shutil
 
+import numpy as np
+
 from archai.datasets.nlp.nvidia_dataset_provider import NvidiaDatasetProvider
 
 
@@ -31,5 +33,13 @@ def test_nvidia_dataset_provider():
     test_dataset = dataset_provider.get_test_dataset()
     assert len(test_dataset) == 6
 
+    # Assert that datasets are memory-mapped from the cache with compact token identifiers
+    assert isinstance(train_dataset, np.memmap)
+    assert train_dataset.dtype == np.uint16
+
+    # Assert that the cache is loaded by new providers
+    cached_dataset_provider = NvidiaDatasetProvider("olx_tmp", dataset_dir=f"{unique_data_root}/olx_tmp")
+    assert np.array_equal(cached_dataset_provider.get_train_dataset(), train_dataset)
+
     shutil.rmtree("cache")
     shutil.rmtree(unique_data_root)
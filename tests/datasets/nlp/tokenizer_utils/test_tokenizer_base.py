@@ -1,6 +1,9 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT license.
 
+import os
+
+import numpy as np
 import pytest
 from overrides import overrides
 
@@ -96,3 +99,23 @@ def test_tokenizer_base_token_to_id(tokenizer_base):
 
 def test_tokenizer_base_id_to_token(tokenizer_base):
     assert tokenizer_base.id_to_token(5) == "token"
+
+
+def test_tokenizer_base_encode_file(tmp_path, tokenizer_base):
+    lines = [f"line {'x' * (i % 7)}\n" for i in range(1000)]
+    input_file = tmp_path / "input.txt"
+    input_file.write_text("".join(lines), encoding="utf-8")
+
+    tokenizer_base.encode_text = lambda text: [len(text), 1]
+    expected = [token for line in lines for token in [len(line), 1]]
+
+    # Assert that shards and worker processes preserve the order of the lines
+    assert tokenizer_base.encode_file(str(input_file)).tolist() == expected
+    assert tokenizer_base.encode_file(str(input_file), num_workers=2, shard_size=100, batch_size=3).tolist() == expected
+
+    # Assert that tokens are written to a memory-mapped file with the smallest data type
+    output_file = tmp_path / "output.npy"
+    encoded = tokenizer_base.encode_file(str(input_file), shard_size=100, output_path=str(output_file))
+    assert encoded.dtype == np.uint8
+    assert np.load(output_file).tolist() == expected
+    assert set(os.listdir(tmp_path)) == {"input.txt", "output.npy"}
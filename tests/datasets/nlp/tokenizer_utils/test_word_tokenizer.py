@@ -0,0 +1,37 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT license.
+
+from archai.datasets.nlp.tokenizer_utils.word_tokenizer import WordTokenizer
+
+
+def test_word_tokenizer(tmp_path):
+    lines = [f"w{i % 5} w{i % 3}  W{i % 2}\n" for i in range(100)] + ["\n", "last line"]
+    input_file = tmp_path / "input.txt"
+    input_file.write_text("".join(lines), encoding="utf-8")
+
+    tokenizer = WordTokenizer(str(tmp_path / "vocab"), vocab_size=8, bos_token="<s>")
+    tokenizer.train([str(input_file)])
+
+    # Assert that the vocabulary holds the special tokens followed by the most common symbols
+    assert tokenizer.idx2sym == ["<unk>", "<s>", "<eos>", "w0", "w1", "w2", "W0", "W1"]
+
+    # Assert that texts are encoded with special tokens and unknown symbols
+    assert tokenizer.encode_text("w1 w4 w0") == [1, 4, 0, 3, 2]
+
+    # Assert that new lines inside a text do not split it into several sequences
+    assert tokenizer.encode_text("w1 w2\nW0 w0") == [1, 4, 5, 6, 3, 2]
+    assert tokenizer.encode_text("w1\r\nw2") == [1, 4, 5, 2]
+    assert tokenizer.encode_batch(["w1", "", "W0 w9"]) == [[1, 4, 2], [1, 2], [1, 6, 0, 2]]
+    assert tokenizer.tokens_to_ids(["w2", "w9"]) == [5, 0]
+    assert tokenizer.ids_to_tokens([5, 0]) == ["w2", "<unk>"]
+
+    # Assert that files are encoded line by line, regardless of shards and worker processes
+    expected = [token for line in lines for token in tokenizer.encode_text(line)]
+    assert tokenizer.encode_file(str(input_file)).tolist() == expected
+    assert tokenizer.encode_file(str(input_file), num_workers=2, shard_size=100, batch_size=7).tolist() == expected
+
+    # Assert that counting shards in worker processes gives the same vocabulary
+    parallel_tokenizer = WordTokenizer(str(tmp_path / "parallel_vocab"), vocab_size=8, bos_token="<s>", num_workers=2)
+    parallel_tokenizer._add_file(str(input_file), shard_size=100)
+    assert parallel_tokenizer.counter == tokenizer.counter
+    assert list(parallel_tokenizer.counter) == list(tokenizer.counter)
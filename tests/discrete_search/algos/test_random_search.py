@@ -6,6 +6,7 @@ import os
 import pytest
 
 from archai.discrete_search.algos.random_search import RandomSearch
+from archai.discrete_search.api.search_results import SearchResults
 
 
 @pytest.fixture(scope="session")
@@ -19,6 +20,14 @@ def test_random_search(output_dir, search_space, search_objectives):
     search_results = algo.search()
     assert len(os.listdir(output_dir)) > 0
 
+    # Assert that iterations are appended to the search state, which is only saved as .csv in the end
+    assert sorted(os.listdir(output_dir / "search_state")) == ["segment_000000.parquet", "segment_000001.parquet"]
+    assert sorted(f for f in os.listdir(output_dir) if f.endswith(".csv")) == ["search_state_2.csv"]
+
+    loaded_results = SearchResults(search_space, search_objectives)
+    loaded_results.load_search_state(output_dir / "search_state")
+    assert loaded_results.iteration_num == 2
+
     df = search_results.get_search_state_df()
     assert all(0 <= x <= 0.4 for x in df["Random1"].tolist())
 
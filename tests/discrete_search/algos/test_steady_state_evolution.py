@@ -0,0 +1,86 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT license.
+
+import os
+from typing import Dict, List, Optional
+
+import pytest
+from overrides import overrides
+
+from archai.discrete_search.algos.steady_state_evolution import (
+    SteadyStateEvolutionSearch,
+)
+from archai.discrete_search.api.archai_model import ArchaiModel
+from archai.discrete_search.api.model_evaluator import AsyncModelEvaluator
+
+
+class LastJobFirstEvaluator(AsyncModelEvaluator):
+    """Async. evaluator that completes the most recent job first, one at a time."""
+
+    def __init__(self) -> None:
+        self.jobs = []
+        self.max_num_pending_jobs = 0
+
+    @overrides
+    def send(self, arch: ArchaiModel, budget: Optional[float] = None) -> None:
+        self.jobs.append(len(arch.archid))
+        self.max_num_pending_jobs = max(self.max_num_pending_jobs, sum(job is not None for job in self.jobs))
+
+    @overrides
+    def fetch_all(self) -> List[Optional[float]]:
+        results, self.jobs = self.jobs, []
+        return results
+
+    @overrides
+    def fetch_ready(self, timeout: Optional[float] = None) -> Dict[int, Optional[float]]:
+        job_idx = max(i for i, job in enumerate(self.jobs) if job is not None)
+        results = {job_idx: float(self.jobs[job_idx])}
+        self.jobs[job_idx] = None
+
+        if all(job is None for job in self.jobs):
+            self.jobs = []
+
+        return results
+
+
+@pytest.fixture(scope="session")
+def output_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp("out_sse")
+
+
+def test_steady_state_evolution(output_dir, search_space, search_objectives):
+    evaluator = LastJobFirstEvaluator()
+    search_objectives.add_objective("ArchidLength", evaluator, higher_is_better=False)
+
+    algo = SteadyStateEvolutionSearch(
+        search_space=search_space,
+        search_objectives=search_objectives,
+        output_dir=output_dir,
+        num_models=12,
+        max_pending_models=4,
+        init_num_models=4,
+        pareto_sample_size=4,
+        history_size=10,
+        save_every=5,
+        seed=1,
+    )
+
+    search_results = algo.search()
+    assert len(os.listdir(output_dir)) > 0
+    assert search_objectives.num_pending_models == 0
+
+    # Asserts that models are evaluated one at a time, with a full queue of jobs
+    assert evaluator.max_num_pending_jobs == 4
+    assert all(len(iter_r["models"]) == 1 for iter_r in search_results.results)
+
+    df = search_results.get_search_state_df()
+    assert len(df) == 12
+    assert df["archid"].is_unique
+    assert all(0 <= x <= 0.4 for x in df["Random1"].tolist())
+    assert df["parent"].notnull().sum() == 8
+
+    all_models = [m for iter_r in search_results.results for m in iter_r["models"]]
+
+    # Checks if all registered models satisfy constraints
+    _, valid_models = search_objectives.validate_constraints(all_models)
+    assert len(valid_models) == len(all_models)
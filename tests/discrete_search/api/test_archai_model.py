@@ -1,6 +1,10 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT license.
 
+import pickle
+from functools import partial
+
+import pytest
 import torch
 
 from archai.discrete_search.api.archai_model import ArchaiModel
@@ -20,3 +24,60 @@ def test_archai_model():
         str(archai_model)
         == "ArchaiModel(\n\tarchid=test_archid, \n\tmetadata={'key': 'value'}, \n\tarch=Linear(in_features=10, out_features=1, bias=True)\n)"
     )
+
+
+def test_archai_model_builder():
+    num_builds = []
+
+    def builder():
+        num_builds.append(1)
+        return torch.nn.Linear(10, 1)
+
+    # Assert that the model is only built when accessed
+    archai_model = ArchaiModel(None, "test_archid", builder=builder)
+    assert not archai_model.is_built
+    assert "arch=<not built>" in str(archai_model)
+
+    assert isinstance(archai_model.arch, torch.nn.Linear)
+    assert archai_model.is_built
+    assert archai_model.arch is archai_model.arch
+    assert len(num_builds) == 1
+
+    # Assert that cleared models are not silently built again, only explicitly
+    archai_model.clear()
+    assert not archai_model.is_built
+    assert "arch=<cleared>" in str(archai_model)
+    with pytest.raises(RuntimeError):
+        archai_model.arch
+    assert len(num_builds) == 1
+
+    assert isinstance(archai_model.build(), torch.nn.Linear)
+    assert archai_model.arch is archai_model.arch
+    assert len(num_builds) == 2
+
+
+def test_archai_model_clear():
+    archai_model = ArchaiModel(torch.nn.Linear(10, 1), "test_archid")
+    archai_model.clear()
+
+    # Assert that cleared models without a builder can not be accessed or built
+    with pytest.raises(RuntimeError):
+        archai_model.arch
+    with pytest.raises(ValueError):
+        archai_model.build()
+
+    # Assert that assigning a new model object replaces the cleared one
+    model = torch.nn.Linear(10, 1)
+    archai_model.arch = model
+    assert archai_model.arch is model
+
+
+def test_archai_model_pickle():
+    # Assert that lazy models are pickled with their builder, and built models without it
+    archai_model = ArchaiModel(None, "test_archid", builder=partial(torch.nn.Linear, 10, 1))
+    assert isinstance(pickle.loads(pickle.dumps(archai_model)).arch, torch.nn.Linear)
+
+    archai_model.arch
+    unpickled_model = pickle.loads(pickle.dumps(archai_model))
+    assert unpickled_model.builder is None and isinstance(unpickled_model.arch, torch.nn.Linear)
+    assert archai_model.builder is not None
@@ -2,11 +2,16 @@
 # Licensed under the MIT license.
 
 import random
+import threading
 from typing import Tuple
 
 import pytest
 import torch
+from overrides import overrides
 
+from archai.discrete_search.api.archai_model import ArchaiModel
+from archai.discrete_search.api.model_evaluator import AsyncModelEvaluator
+from archai.discrete_search.api import search_objectives as search_objectives_module
 from archai.discrete_search.api.search_objectives import SearchObjectives
 from archai.discrete_search.evaluators.functional import EvaluationFunction
 from archai.discrete_search.evaluators.onnx_model import AvgOnnxLatency
@@ -14,6 +19,7 @@ from archai.discrete_search.evaluators.pt_profiler import TorchFlops, TorchNumPa
 from archai.discrete_search.search_spaces.nlp.transformer_flex.search_space import (
     TransformerFlexSearchSpace,
 )
+from archai.discrete_search.utils.objective_cache import SqliteObjectiveCache
 
 
 @pytest.fixture
@@ -124,3 +130,136 @@ def test_eval_cache(sample_input, models):
     cons_vals, cons_filtered = search_objectives.validate_constraints(models, False)
     assert cons_vals["Random number"][0] == cached_val
     assert len(cons_filtered) == len(models)
+
+
+def _budget_value(model, budget):
+    return budget
+
+
+def _num_modules(model, budget):
+    return len(list(model.arch.modules()))
+
+
+@pytest.mark.parametrize("executor,multithreaded", [("thread", False), ("process", False), ("process", True)])
+def test_eval_executor(monkeypatch, models, executor, multithreaded):
+    # Worker processes are forked unless the main process is multi-threaded
+    monkeypatch.setattr(search_objectives_module, "_is_multithreaded", lambda: multithreaded)
+
+    search_objectives = SearchObjectives(cache_objective_evaluation=True, executor=executor, max_workers=2)
+    search_objectives.add_objective("NumberOfParameters", TorchNumParameters(), higher_is_better=False)
+    search_objectives.add_objective("Budget Value", EvaluationFunction(_budget_value), higher_is_better=True)
+    search_objectives.add_constraint("NumberOfModules", EvaluationFunction(_num_modules), (0, float("inf")))
+
+    # Assert that results follow the order of `models`
+    result = search_objectives.eval_all_objs(models, budgets={"Budget Value": list(range(len(models)))})
+    assert list(result["Budget Value"]) == list(range(len(models)))
+    assert list(result["NumberOfParameters"]) == [TorchNumParameters().evaluate(m) for m in models]
+
+    # Assert that results are cached
+    assert search_objectives.lookup_cache("Budget Value", models[1].archid, 1) == 1
+
+    _, valid_indices = search_objectives.validate_constraints(models)
+    assert len(valid_indices) == len(models)
+
+
+def test_get_mp_context():
+    # Assert that processes are not forked while other threads are running
+    event = threading.Event()
+    thread = threading.Thread(target=event.wait)
+    thread.start()
+
+    try:
+        assert search_objectives_module._get_mp_context().get_start_method() != "fork"
+    finally:
+        event.set()
+        thread.join()
+
+
+def test_eval_persistent_cache(tmp_path, models):
+    cache_path = tmp_path / "cache.db"
+
+    search_objectives = SearchObjectives(cache=SqliteObjectiveCache(cache_path))
+    search_objectives.add_objective("Random number", EvaluationFunction(lambda m, b: random.random()), True)
+    result = search_objectives.eval_all_objs(models)
+
+    # Assert that a new `SearchObjectives` reuses the persisted evaluations
+    other_search_objectives = SearchObjectives(cache=SqliteObjectiveCache(cache_path))
+    other_search_objectives.add_objective("Random number", EvaluationFunction(lambda m, b: random.random()), True)
+    other_result = other_search_objectives.eval_all_objs(models)
+
+    assert list(result["Random number"]) == list(other_result["Random number"])
+
+
+def test_generate_valid_models():
+    search_objectives = SearchObjectives()
+    search_objectives.add_constraint("Is odd", EvaluationFunction(lambda m, b: int(m.archid) % 2), (1, 1))
+
+    counter = iter(range(1000))
+    generators = [lambda: ArchaiModel(None, str(next(counter))), lambda: ArchaiModel(None, "2"), lambda: None]
+
+    # Assert that quotas are met with valid and unseen models only
+    generated = search_objectives.generate_valid_models(generators, [5, 1, 1], patience=20, exclude_archids={"1"})
+    assert len(generated[0]) == 5
+    assert all(int(m.archid) % 2 == 1 and m.archid != "1" for m in generated[0])
+
+    # Assert that generators that never produce valid models give up after `patience` tries
+    assert generated[1] == [] and generated[2] == []
+
+
+def test_generate_valid_models_skips_seen_archids():
+    validated_archids = []
+
+    def _is_odd(model, budget):
+        validated_archids.append(model.archid)
+        return int(model.archid) % 2
+
+    search_objectives = SearchObjectives(cache_objective_evaluation=False)
+    search_objectives.add_constraint("Is odd", EvaluationFunction(_is_odd), (1, 1))
+
+    archids = iter(["1", "3", "3", "2", "2", "5", "7"])
+    generated = search_objectives.generate_valid_models(
+        [lambda: ArchaiModel(None, next(archids))], 3, patience=7, exclude_archids={"1"}
+    )
+
+    # Assert that excluded and repeated architectures are discarded before validating constraints
+    assert [m.archid for m in generated[0]] == ["3", "5", "7"]
+    assert validated_archids == ["3", "2", "5", "7"]
+
+
+def test_send_fetch_ready_objs():
+    class AsyncArchidLength(AsyncModelEvaluator):
+        def __init__(self):
+            self.jobs = []
+
+        @overrides
+        def send(self, arch, budget=None):
+            self.jobs.append(len(arch.archid))
+
+        @overrides
+        def fetch_all(self):
+            results, self.jobs = self.jobs, []
+            return results
+
+    evaluator = AsyncArchidLength()
+
+    search_objectives = SearchObjectives()
+    search_objectives.add_objective("Archid", EvaluationFunction(lambda m, b: int(m.archid)), higher_is_better=True)
+    search_objectives.add_objective("Length", evaluator, higher_is_better=False)
+
+    # Assert that synchronous objectives are evaluated and asynchronous jobs are sent
+    search_objectives.send_all_objs([ArchaiModel(None, "7"), ArchaiModel(None, "10")])
+    assert search_objectives.num_pending_models == 2
+    assert evaluator.jobs == [1, 2]
+
+    models, results = search_objectives.fetch_ready_objs()
+    assert [m.archid for m in models] == ["7", "10"]
+    assert results["Archid"].tolist() == [7, 10] and results["Length"].tolist() == [1, 2]
+    assert search_objectives.num_pending_models == 0
+
+    # Assert that cached models are ready without sending jobs
+    search_objectives.send_all_objs([ArchaiModel(None, "10"), ArchaiModel(None, "100")])
+    assert evaluator.jobs == [3]
+
+    models, results = search_objectives.fetch_ready_objs()
+    assert [m.archid for m in models] == ["10", "100"]
+    assert results["Length"].tolist() == [2, 3]
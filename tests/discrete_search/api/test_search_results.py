@@ -5,12 +5,18 @@ import numpy as np
 import torch
 
 from archai.discrete_search.api.archai_model import ArchaiModel
+from archai.discrete_search.api import search_results as search_results_module
 from archai.discrete_search.api.search_objectives import SearchObjectives
 from archai.discrete_search.api.search_results import SearchResults
+from archai.discrete_search.evaluators.functional import EvaluationFunction
 from archai.discrete_search.evaluators.pt_profiler import TorchNumParameters
 from archai.discrete_search.search_spaces.nlp.transformer_flex.search_space import (
     TransformerFlexSearchSpace,
 )
+from archai.discrete_search.utils.multi_objective import (
+    get_non_dominated_sorting,
+    get_pareto_frontier,
+)
 
 
 def test_search_results():
@@ -45,3 +51,117 @@ def test_add_iteration_results():
     assert len(search_results.results) == 1
     assert len(search_results.results[0]["models"]) == 1
     assert search_results.results[0][obj_name][0] == 0.5
+
+    # Assert that results are materialized once and extended with new iterations
+    results = search_results.results
+    search_results.add_iteration_results(models, {obj_name: np.array([0.25], dtype=np.float32)})
+    assert search_results.results is results
+    assert [r[obj_name].tolist() for r in search_results.results] == [[0.5], [0.25]]
+
+
+def test_get_pareto_frontier():
+    search_space = TransformerFlexSearchSpace("gpt2")
+
+    objectives = SearchObjectives()
+    objectives.add_objective("obj1", EvaluationFunction(lambda m, b: b), higher_is_better=True)
+    objectives.add_objective("obj2", EvaluationFunction(lambda m, b: b), higher_is_better=False)
+
+    search_results = SearchResults(search_space, objectives)
+    rng = np.random.default_rng(0)
+
+    for _ in range(5):
+        models = [ArchaiModel(torch.nn.Linear(10, 1), "archid") for _ in range(20)]
+        evaluation_results = {obj_name: rng.integers(0, 5, size=20).astype(np.float32) for obj_name in ["obj1", "obj2"]}
+        search_results.add_iteration_results(models, evaluation_results)
+
+    # Assert that the incremental frontiers match the ones computed from scratch
+    for end_iteration in range(1, 6):
+        all_results = {
+            obj_name: np.concatenate([search_results.results[it][obj_name] for it in range(end_iteration)])
+            for obj_name in ["obj1", "obj2"]
+        }
+        all_models = [m for it in range(end_iteration) for m in search_results.results[it]["models"]]
+
+        expected = get_pareto_frontier(all_models, all_results, objectives)
+        pareto_frontier = search_results.get_pareto_frontier(end_iteration=end_iteration)
+
+        assert list(pareto_frontier["indices"]) == list(expected["indices"])
+        assert list(pareto_frontier["iteration_nums"]) == [idx // 20 for idx in expected["indices"]]
+        assert np.array_equal(pareto_frontier["evaluation_results"]["obj1"], expected["evaluation_results"]["obj1"])
+
+    # Assert that the non-dominated sorting matches the one computed from scratch
+    all_models = [m for it_results in search_results.results for m in it_results["models"]]
+    expected = get_non_dominated_sorting(all_models, search_results.all_evaluated_objs, objectives)
+    nds_frontiers = search_results.get_non_dominated_sorting()
+
+    assert [list(f["indices"]) for f in nds_frontiers] == [list(f["indices"]) for f in expected]
+
+
+def test_append_and_load_search_state(tmp_path):
+    search_space = TransformerFlexSearchSpace("gpt2")
+
+    objectives = SearchObjectives()
+    objectives.add_objective("obj1", EvaluationFunction(lambda m, b: b), higher_is_better=True)
+    objectives.add_objective("obj2", EvaluationFunction(lambda m, b: b), higher_is_better=False)
+
+    search_results = SearchResults(search_space, objectives)
+    rng = np.random.default_rng(0)
+
+    for it in range(3):
+        models = [ArchaiModel(None, f"archid_{it}_{i}") for i in range(10)]
+        evaluation_results = {obj_name: rng.random(10) for obj_name in ["obj1", "obj2"]}
+        search_results.add_iteration_results(models, evaluation_results, extra_model_data={"parent": [None] * 10})
+        search_results.append_search_state(tmp_path)
+
+    # Assert that each call only saved the results of the new iteration
+    assert len(list(tmp_path.glob("segment_*.parquet"))) == 3
+
+    loaded_results = SearchResults(search_space, objectives)
+    loaded_results.load_search_state(tmp_path)
+
+    # Assert that the loaded search state matches the original one
+    assert loaded_results.iteration_num == 3
+    assert [m.archid for m in loaded_results.get_pareto_frontier()["models"]] == [
+        m.archid for m in search_results.get_pareto_frontier()["models"]
+    ]
+    assert np.array_equal(loaded_results.get_search_state_df()["obj1"], search_results.get_search_state_df()["obj1"])
+
+
+def test_checkpoint_into_previous_search_directory(tmp_path):
+    objectives = SearchObjectives()
+    objectives.add_objective("obj1", EvaluationFunction(lambda m, b: b), higher_is_better=True)
+
+    for run in range(2):
+        search_results = SearchResults(TransformerFlexSearchSpace("gpt2"), objectives)
+        for it in range(2 - run):
+            models = [ArchaiModel(None, f"archid_{run}_{it}")]
+            search_results.add_iteration_results(models, {"obj1": np.array([0.5])})
+            search_results.checkpoint(tmp_path)
+
+    loaded_results = SearchResults(TransformerFlexSearchSpace("gpt2"), objectives)
+    loaded_results.load_search_state(tmp_path)
+
+    # Assert that segments of the previous search are not merged with the new ones
+    assert list(loaded_results.get_search_state_df()["archid"]) == ["archid_1_0"]
+
+    # Assert that a loaded search state is resumed in the same directory
+    loaded_results.add_iteration_results([ArchaiModel(None, "archid_1_1")], {"obj1": np.array([0.5])})
+    loaded_results.checkpoint(tmp_path)
+    loaded_results.load_search_state(tmp_path)
+    assert list(loaded_results.get_search_state_df()["archid"]) == ["archid_1_0", "archid_1_1"]
+    assert len(list(tmp_path.glob("segment_*.parquet"))) == 2
+
+
+def test_checkpoint_without_pyarrow(tmp_path, monkeypatch):
+    monkeypatch.setattr(search_results_module, "PARQUET_AVAILABLE", False)
+
+    objectives = SearchObjectives()
+    objectives.add_objective("obj1", EvaluationFunction(lambda m, b: b), higher_is_better=True)
+
+    search_results = SearchResults(TransformerFlexSearchSpace("gpt2"), objectives)
+    search_results.add_iteration_results([ArchaiModel(None, "archid_0")], {"obj1": np.array([0.5])})
+
+    # Assert that the complete search state is saved when segments can not be written
+    search_results.checkpoint(tmp_path / "search_state", csv_file_path=tmp_path / "search_state_1.csv")
+    assert sorted(p.name for p in (tmp_path / "search_state").iterdir()) == ["search_state.csv"]
+    assert (tmp_path / "search_state_1.csv").exists()
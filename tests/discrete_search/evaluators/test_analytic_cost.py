@@ -0,0 +1,159 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT license.
+
+import pytest
+import torch
+
+from archai.discrete_search.api.archai_model import ArchaiModel
+from archai.discrete_search.evaluators.analytic_cost import (
+    AnalyticFlops,
+    AnalyticMacs,
+    AnalyticNumParameters,
+    get_analytic_cost,
+)
+from archai.discrete_search.evaluators.pt_profiler import (
+    TorchFlops,
+    TorchMacs,
+    TorchNumParameters,
+)
+from archai.discrete_search.search_spaces.cv.segmentation_dag.model import (
+    SegmentationDagModel,
+)
+from archai.discrete_search.search_spaces.nlp.tfpp.search_space import TfppSearchSpace
+from archai.discrete_search.search_spaces.nlp.transformer_flex.search_space import (
+    TransformerFlexSearchSpace,
+)
+
+
+@pytest.fixture
+def sample_input():
+    return torch.zeros(2, 32, dtype=torch.long)
+
+
+@pytest.mark.parametrize("arch_type", ["gpt2", "gpt2-flex"])
+def test_gpt2_cost(arch_type, sample_input):
+    search_space = TransformerFlexSearchSpace(
+        arch_type,
+        max_layers=3,
+        d_inner_options=[128, 256],
+        d_model_options=[64, 128],
+        share_d_inner=(arch_type == "gpt2"),
+        vocab_size=500,
+        max_sequence_length=64,
+    )
+
+    for model in [search_space.random_sample() for _ in range(3)]:
+        kwargs = {"batch_size": 2, "seq_len": 32}
+        is_built = model.is_built
+
+        params = AnalyticNumParameters(arch_type).evaluate(model)
+        macs = AnalyticMacs(arch_type, **kwargs).evaluate(model)
+        flops = AnalyticFlops(arch_type, **kwargs).evaluate(model)
+
+        # Assert that analytic costs do not build the model
+        assert model.is_built == is_built
+
+        # Assert that parameters and MACs match the profiler, while FLOPs are close
+        assert params == TorchNumParameters().evaluate(model)
+        assert macs == TorchMacs(sample_input).evaluate(model)
+        assert flops == pytest.approx(TorchFlops(sample_input).evaluate(model), rel=0.02)
+
+
+def test_mem_transformer_cost(sample_input):
+    search_space = TransformerFlexSearchSpace(
+        "mem-transformer", max_layers=2, d_model_options=[64, 128], vocab_size=300_000, max_sequence_length=32
+    )
+    model = search_space.random_sample()
+    kwargs = {"batch_size": 2, "seq_len": 32}
+
+    assert AnalyticNumParameters("mem-transformer").evaluate(model) == TorchNumParameters().evaluate(model)
+    assert AnalyticFlops("mem-transformer", **kwargs).evaluate(model) == pytest.approx(
+        TorchFlops(sample_input).evaluate(model), rel=0.02
+    )
+
+    # Assert that MACs match the profiler, which does not count the MACs of the
+    # attention `einsum` (content-based and position-based scores, and context)
+    config = model.arch.config
+    einsum_macs = 3 * config.n_layer * 2 * config.n_head * 32 * (32 + config.mem_len) * config.d_head
+    macs = TorchMacs(sample_input).evaluate(model) + einsum_macs
+    assert AnalyticMacs("mem-transformer", **kwargs).evaluate(model) == macs
+
+
+def test_mem_transformer_cost_unsupported():
+    with pytest.raises(ValueError):
+        AnalyticFlops("mem-transformer", primer_conv=True)
+
+
+@pytest.mark.parametrize("backbone", ["gpt2", "codegen"])
+def test_tfpp_cost(backbone, sample_input):
+    hf_config_kwargs = {"vocab_size": 100, "n_positions": 64, "rotary_dim": 8}
+    search_space = TfppSearchSpace(
+        backbone,
+        embed_dims=(64,),
+        inner_dims=(128,),
+        total_heads=(4,),
+        total_layers=(2, 3),
+        op_subset=["mha", "sep_conv1d", "local_attn"],
+        local_attn_window_sizes=(8,),
+        sconv1d_kernel_sizes=(4,),
+        seed=1,
+        **hf_config_kwargs,
+    )
+
+    for model in [search_space.random_sample() for _ in range(3)]:
+        cost = get_analytic_cost("tfpp", model.metadata["config"], batch_size=2, seq_len=32, **hf_config_kwargs)
+
+        assert cost.params == TorchNumParameters().evaluate(model)
+        assert cost.flops == pytest.approx(TorchFlops(sample_input).evaluate(model), rel=0.05)
+
+
+@pytest.mark.parametrize("op_name", ["sgconv", "sgconv3", "lsh_attn"])
+def test_tfpp_cost_fft_and_lsh_ops(op_name, sample_input):
+    hf_config_kwargs = {"vocab_size": 100, "n_positions": 64}
+    search_space = TfppSearchSpace(
+        "gpt2",
+        embed_dims=(64,),
+        inner_dims=(128,),
+        total_heads=(4,),
+        total_layers=(2,),
+        op_subset=[op_name],
+        sgconv_kernel_sizes=(8,),
+        lsh_attn_num_hashes=(2,),
+        lsh_attn_bucket_size=(8,),
+        **hf_config_kwargs,
+    )
+    model = search_space.random_sample()
+
+    cost = get_analytic_cost("tfpp", model.metadata["config"], batch_size=2, seq_len=32, **hf_config_kwargs)
+    flops = TorchFlops(sample_input).evaluate(model)
+
+    assert cost.params == TorchNumParameters().evaluate(model)
+
+    # The profiler does not count FFTs, so only the FLOPs of LSH attention are close
+    if op_name == "lsh_attn":
+        assert cost.flops == pytest.approx(flops, rel=0.05)
+    else:
+        assert cost.flops > flops
+
+
+def test_segmentation_dag_cost():
+    graph = [
+        {"name": "input", "inputs": None, "op": "mbconv3x3_e2", "scale": 1},
+        {"name": "layer_0", "inputs": ["input"], "op": "conv5x5", "scale": 2},
+        {"name": "layer_1", "inputs": ["layer_0", "input"], "op": "mbconv5x5_e1", "scale": 4},
+        {"name": "layer_2", "inputs": ["layer_1"], "op": "conv3x3", "scale": 2},
+        {"name": "output", "inputs": ["layer_2", "layer_0"], "op": None, "scale": 2},
+    ]
+
+    arch = SegmentationDagModel(
+        graph, {"base_channels": 8, "delta_channels": 4}, post_upsample_layers=2, img_size=(64, 96), nb_classes=5
+    )
+    model = ArchaiModel(arch.eval(), arch.to_hash(), metadata={"config": arch.to_config()})
+    sample_input = torch.zeros(1, 3, 96, 64)
+
+    kwargs = {"img_size": (64, 96), "nb_classes": 5}
+    assert AnalyticNumParameters("segmentation-dag", **kwargs).evaluate(model) == TorchNumParameters().evaluate(model)
+    assert AnalyticMacs("segmentation-dag", **kwargs).evaluate(model) == TorchMacs(sample_input).evaluate(model)
+    assert AnalyticFlops("segmentation-dag", **kwargs).evaluate(model) == pytest.approx(
+        TorchFlops(sample_input).evaluate(model), rel=0.02
+    )
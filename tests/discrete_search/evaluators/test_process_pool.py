@@ -0,0 +1,62 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT license.
+
+import time
+from typing import Optional
+
+import pytest
+from overrides import overrides
+
+from archai.discrete_search.api.archai_model import ArchaiModel
+from archai.discrete_search.api.model_evaluator import ModelEvaluator
+from archai.discrete_search.evaluators.process_pool import ProcessParallelEvaluator
+
+
+class SleepEvaluator(ModelEvaluator):
+    @overrides
+    def evaluate(self, arch: ArchaiModel, budget: Optional[float] = None) -> float:
+        time.sleep(arch.metadata["duration"])
+        return arch.metadata["duration"]
+
+
+@pytest.fixture
+def models():
+    return [ArchaiModel(None, str(i), metadata={"duration": duration}) for i, duration in enumerate([1.0, 0.0, 0.5])]
+
+
+def test_process_parallel_evaluator(models):
+    evaluator = ProcessParallelEvaluator(SleepEvaluator(), max_workers=3)
+
+    # Assert that results are fetched in the same order jobs were sent
+    for model in models:
+        evaluator.send(model)
+    assert evaluator.fetch_all() == [1.0, 0.0, 0.5]
+
+
+def test_process_parallel_evaluator_as_completed(models):
+    evaluator = ProcessParallelEvaluator(SleepEvaluator(), max_workers=3)
+
+    # Assert that results are iterated as they complete
+    job_ids = [evaluator.send(model) for model in models]
+    assert job_ids == [0, 1, 2]
+    assert evaluator.pending_jobs() == [0, 1, 2]
+
+    results = list(evaluator.as_completed())
+    assert [job_idx for job_idx, _ in results] == [1, 2, 0]
+    assert dict(results) == {0: 1.0, 1: 0.0, 2: 0.5}
+    assert evaluator.pending_jobs() == [] and evaluator.poll() == {}
+
+    # Assert that queued jobs can be cancelled and are fetched with `None` results
+    evaluator = ProcessParallelEvaluator(SleepEvaluator(), max_workers=1)
+
+    job_ids = [evaluator.send(model) for model in models]
+    time.sleep(0.5)
+    assert evaluator.cancel(job_ids[2])
+    assert not evaluator.cancel(job_ids[0])
+
+    assert dict(evaluator.as_completed()) == {0: 1.0, 1: 0.0, 2: None}
+
+    # Assert that `as_completed` raises after `timeout` seconds
+    evaluator.send(models[0])
+    with pytest.raises(TimeoutError):
+        list(evaluator.as_completed(timeout=0.1))
@@ -142,3 +142,23 @@ def test_ss_archid(rng, tree_c2):
         archids.add(config.archid)
 
     assert len(archids) == 3 # Will fail with probability approx 1/2^100
+
+
+def test_ss_lazy_build(tree_c2):
+    tree = ArchParamTree(tree_c2)
+    built_configs = []
+
+    def use_arch(c):
+        built_configs.append(c)
+        c.pick('p1')
+
+    ss = ConfigSearchSpace(use_arch, tree, seed=1, track_unused_params=False)
+    m = ss.random_sample()
+    m2 = ss.mutate(m)
+
+    # Assert that models are only built when accessed
+    assert not m.is_built and not m2.is_built
+    assert built_configs == []
+
+    m.arch
+    assert built_configs == [m.metadata['config']]
@@ -0,0 +1,44 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT license.
+
+import numpy as np
+
+from archai.discrete_search.utils.columnar_store import ColumnarStore
+
+
+def test_columnar_store():
+    store = ColumnarStore(initial_capacity=2)
+
+    store.append({"archid": ["a", "b"], "obj": np.array([0.1, 0.2], dtype=np.float32)})
+    store.append({"archid": ["c", "d", "e"], "obj": [0.3, 0.4, 0.5], "extra": [1, 2, 3]})
+
+    # Assert that columns grow and missing values are filled
+    assert len(store) == 5
+    assert store.column_names == ["archid", "obj", "extra"]
+    assert list(store["archid"]) == ["a", "b", "c", "d", "e"]
+    assert np.allclose(store["obj"], [0.1, 0.2, 0.3, 0.4, 0.5])
+    assert np.isnan(store["extra"][:2]).all()
+    assert list(store["extra"][2:]) == [1, 2, 3]
+
+    df = store.to_pandas()
+    assert list(df.columns) == ["archid", "obj", "extra"]
+    assert len(df) == 5
+
+
+def test_columnar_store_segments(tmp_path):
+    store = ColumnarStore()
+
+    store.append({"archid": ["a", "b"], "obj": [1.0, 2.0]})
+    assert store.save_segment(tmp_path) is not None
+
+    # Assert that saving without new rows does not create a segment
+    assert store.save_segment(tmp_path) is None
+
+    store.append({"archid": ["c"], "obj": [3.0]})
+    store.save_segment(tmp_path)
+
+    loaded_store = ColumnarStore.load(tmp_path)
+    assert loaded_store.num_segments == 2
+    assert loaded_store.num_saved_rows == 3
+    assert list(loaded_store["archid"]) == ["a", "b", "c"]
+    assert np.array_equal(loaded_store["obj"], [1.0, 2.0, 3.0])
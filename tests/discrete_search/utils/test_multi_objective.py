@@ -8,6 +8,8 @@ from archai.discrete_search.api.archai_model import ArchaiModel
 from archai.discrete_search.api.search_objectives import SearchObjectives
 from archai.discrete_search.evaluators.functional import EvaluationFunction
 from archai.discrete_search.utils.multi_objective import (
+    _find_non_dominated_sorting,
+    _find_pareto_frontier_points,
     get_non_dominated_sorting,
     get_pareto_frontier,
 )
@@ -65,3 +67,36 @@ def test_get_non_dominated_sorting():
     # Assert that the length of each list is the same
     assert len(result) == 5
     assert all(len(r["models"]) == len(r["evaluation_results"]["obj1"]) == len(r["indices"]) for r in result)
+
+
+def _brute_force_pareto_frontier(points):
+    unique_points = np.unique(points, axis=0)
+    return {tuple(p) for p in unique_points if not any(np.all(q <= p) and np.any(q < p) for q in unique_points)}
+
+
+def test_find_pareto_frontier_points():
+    rng = np.random.default_rng(0)
+
+    for dim in [1, 2, 3, 5]:
+        for points in [rng.random((300, dim)), rng.integers(0, 4, size=(300, dim)).astype(np.float32)]:
+            pareto_points = _find_pareto_frontier_points(points)
+
+            # Assert that the frontier matches a brute-force search and has no duplicates
+            assert len(pareto_points) == len(set(pareto_points))
+            assert {tuple(points[idx]) for idx in pareto_points} == _brute_force_pareto_frontier(points)
+
+
+def test_find_non_dominated_sorting():
+    rng = np.random.default_rng(0)
+
+    for dim in [2, 3, 4]:
+        points = rng.integers(0, 5, size=(200, dim)).astype(np.float32)
+        frontiers = _find_non_dominated_sorting(points)
+
+        # Assert that frontiers partition all points
+        assert sorted(idx for frontier in frontiers for idx in frontier) == list(range(len(points)))
+
+        # Assert that every point is weakly dominated by a point of the previous frontier
+        for prev_frontier, frontier in zip(frontiers[:-1], frontiers[1:]):
+            for idx in frontier:
+                assert np.any(np.all(points[prev_frontier] <= points[idx], axis=1))
@@ -0,0 +1,69 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT license.
+
+from archai.discrete_search.evaluators.functional import EvaluationFunction
+from archai.discrete_search.evaluators.pt_profiler import TorchFlops
+from archai.discrete_search.utils.objective_cache import (
+    ObjectiveCache,
+    SqliteObjectiveCache,
+    get_evaluator_version,
+)
+
+
+def test_get_evaluator_version():
+    # Assert that versions depend on the evaluator class and configuration
+    assert get_evaluator_version(TorchFlops(ignore_layers=["a"])) == get_evaluator_version(
+        TorchFlops(ignore_layers=["a"])
+    )
+    assert get_evaluator_version(TorchFlops(ignore_layers=["a"])) != get_evaluator_version(
+        TorchFlops(ignore_layers=["b"])
+    )
+    assert get_evaluator_version(TorchFlops()) != get_evaluator_version(EvaluationFunction(lambda m, b: b))
+
+
+def test_objective_cache():
+    cache = ObjectiveCache()
+    cache.set_many({("obj", "arch1", None): 1.0, ("obj", "arch2", 2): 2.0})
+
+    assert cache.get_many([("obj", "arch1", None), ("obj", "arch2", 2), ("obj", "arch3", None)]) == [1.0, 2.0, None]
+    assert cache.get(("obj", "arch3", None), 0.0) == 0.0
+    assert len(cache.to_dict()) == 2
+
+
+def test_sqlite_objective_cache(tmp_path):
+    file_path = tmp_path / "cache.db"
+
+    cache = SqliteObjectiveCache(file_path)
+    cache.set_many({("obj", "arch1", None): 1.0, ("obj", "arch2", 2): 2.0, ("obj", "arch3", None): None})
+
+    # Assert that evaluations are shared with other caches using the same database
+    other_cache = SqliteObjectiveCache(file_path)
+    assert other_cache.get_many([("obj", "arch1", None), ("obj", "arch2", 2.0), ("obj", "arch3", None)]) == [
+        1.0,
+        2.0,
+        None,
+    ]
+    assert other_cache.to_dict() == {("obj", "arch1", None): 1.0, ("obj", "arch2", 2.0): 2.0}
+
+    # Assert that versioned caches only reuse evaluations with the same version
+    versioned_cache = SqliteObjectiveCache(file_path, use_version=True)
+    versioned_cache.set_many({("obj", "arch1", None): 3.0}, version="v1")
+    assert versioned_cache.get(("obj", "arch1", None), version="v1") == 3.0
+    assert versioned_cache.get(("obj", "arch1", None), version="v2") is None
+
+    # Assert that expired evaluations are not reused
+    expired_cache = SqliteObjectiveCache(file_path, ttl=-1.0)
+    assert expired_cache.get(("obj", "arch1", None)) is None
+
+
+def test_sqlite_objective_cache_non_scalar_values(tmp_path):
+    cache = SqliteObjectiveCache(tmp_path / "cache.db")
+    cache.set_many({("obj", "arch1", None): (1.0, 2.0), ("obj", "arch2", None): {"a": [1, 2]}, ("obj", "arch3", 1): 3})
+
+    # Assert that non-scalar evaluations are serialized, while numbers are stored as floats
+    assert cache.get_many([("obj", "arch1", None), ("obj", "arch2", None), ("obj", "arch3", 1)]) == [
+        (1.0, 2.0),
+        {"a": [1, 2]},
+        3.0,
+    ]
+    assert cache.to_dict()[("obj", "arch1", None)] == (1.0, 2.0)
@@ -2,7 +2,9 @@
 # Licensed under the MIT license.
 
 import torch
+from torch.quantization import MinMaxObserver
 
+from archai.quantization.observers import OnnxDynamicObserver
 from archai.quantization.quantizers import FakeDynamicQuant
 
 
@@ -73,3 +75,35 @@ def test_fake_dynamic_quant():
             x, fake_quant._scale, fake_quant._zero_pointer, fake_quant.qmin, fake_quant.qmax
         ),
     )
+
+
+def test_fake_dynamic_quant_matches_observers():
+    torch.manual_seed(0)
+    x = torch.randn(64) * 3
+
+    # Assert that the 8-bit scale and zero point match the ones calculated by the observers
+    for dtype, qscheme in [(torch.quint8, torch.per_tensor_affine), (torch.qint8, torch.per_tensor_symmetric)]:
+        for reduce_range in [True, False]:
+            fake_quant = FakeDynamicQuant(dtype=dtype, bits=8, reduce_range=reduce_range)
+            fake_quant(x)
+
+            observer = MinMaxObserver(dtype=dtype, qscheme=qscheme, reduce_range=reduce_range)
+            observer(x)
+            scale, zero_pointer = observer.calculate_qparams()
+            assert torch.equal(fake_quant._scale.view(-1), scale)
+            assert torch.equal(fake_quant._zero_pointer.view(-1).long(), zero_pointer.long())
+
+        # `OnnxDynamicObserver` does not reduce the range, so neither clamps the zero point
+        fake_quant = FakeDynamicQuant(dtype=dtype, bits=8, reduce_range=False, onnx_compatible=True)
+        fake_quant(x)
+
+        observer = OnnxDynamicObserver(dtype=dtype)
+        observer(x)
+        scale, zero_pointer = observer.calculate_qparams()
+        assert torch.equal(fake_quant._scale.view(-1), scale)
+        assert torch.equal(fake_quant._zero_pointer.view(-1).long(), zero_pointer.long())
+
+    # Assert that gradients are passed through inside the quantization range
+    x.requires_grad_()
+    FakeDynamicQuant(dtype=torch.quint8, bits=16)(x).sum().backward()
+    assert torch.equal(x.grad, torch.ones_like(x))
@@ -0,0 +1,118 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT license.
+
+import random
+
+import numpy as np
+import PIL.Image
+import pytest
+import torch
+
+from archai.supergraph.datasets import augmentation, batch_augmentation
+from archai.supergraph.datasets.aug_policies import fa_reduced_cifar10
+from archai.supergraph.datasets.batch_augmentation import (
+    AFFINE_OPS,
+    IMAGE_OPS,
+    BatchAugmentation,
+    _affine_matrices,
+    _apply_affine,
+)
+
+
+def _images(n_images, size=32, seed=0):
+    # Smooth images, so affine and filter ops have something to work with
+    rng = np.random.default_rng(seed)
+    base = rng.integers(30, 200, size=(n_images, 4, 4, 3)).astype(np.uint8)
+    return np.stack([np.array(PIL.Image.fromarray(b).resize((size, size), PIL.Image.BILINEAR)) for b in base])
+
+
+def _to_tensor(imgs):
+    return torch.from_numpy(imgs).permute(0, 3, 1, 2).contiguous()
+
+
+def _to_numpy(imgs):
+    return imgs.permute(0, 2, 3, 1).numpy()
+
+
+@pytest.mark.parametrize(
+    "name,v",
+    [
+        ("AutoContrast", 0.0),
+        ("Invert", 0.0),
+        ("Equalize", 0.0),
+        ("Solarize", 100.0),
+        ("Posterize", 5.0),
+        ("Contrast", 1.6),
+        ("Color", 0.3),
+        ("Brightness", 1.4),
+        ("Sharpness", 1.8),
+    ],
+)
+def test_image_ops(name, v):
+    imgs = _images(4)
+    augment_fn, _, _ = augmentation.get_augment(name)
+    expected = np.stack([np.array(augment_fn(PIL.Image.fromarray(img), v)) for img in imgs])
+
+    # Assert that color ops are pixel-exact with PIL
+    outputs = IMAGE_OPS[name](_to_tensor(imgs), torch.full((len(imgs),), v, dtype=torch.float64))
+    assert np.array_equal(_to_numpy(outputs), expected)
+
+
+@pytest.mark.parametrize(
+    "matrix", [(1, 0.2, 0, 0, 1, 0), (1, 0, 0, -0.3, 1, 0), (1, 0, 7, 0, 1, 0), (1, 0, 0, 0, 1, -5)]
+)
+def test_affine(matrix):
+    imgs = _images(4)
+    expected = np.stack(
+        [np.array(PIL.Image.fromarray(img).transform(img.shape[:2], PIL.Image.AFFINE, matrix)) for img in imgs]
+    )
+
+    # Assert that affine ops are pixel-exact with PIL, including ties
+    outputs = _apply_affine(_to_tensor(imgs), _affine_matrices(len(imgs), *matrix))
+    assert np.array_equal(_to_numpy(outputs), expected)
+
+
+@pytest.mark.parametrize("angle", [3.3, 17.0, -29.0])
+def test_rotate(monkeypatch, angle):
+    imgs = _images(4)
+    expected = np.stack([np.array(PIL.Image.fromarray(img).rotate(angle)) for img in imgs])
+
+    # Disables the random mirroring of the angle
+    monkeypatch.setattr(batch_augmentation, "_random_sign", lambda n, generator: torch.ones(n))
+    matrices = AFFINE_OPS["Rotate"](torch.full((len(imgs),), angle, dtype=torch.float64), (32, 32), None)
+
+    outputs = _apply_affine(_to_tensor(imgs), matrices)
+    assert np.array_equal(_to_numpy(outputs), expected)
+
+
+def test_unsupported_op():
+    with pytest.raises(ValueError):
+        BatchAugmentation([[("SamplePairing", 0.5, 0.5)]])
+
+
+@pytest.mark.parametrize("policies", [fa_reduced_cifar10(), augmentation.autoaug_policy()])
+def test_statistical_equivalence(policies):
+    n_images, n_repeats = 4, 300
+    imgs = _images(n_images)
+
+    random.seed(0)
+    np.random.seed(0)
+    aug = augmentation.Augmentation(policies)
+    expected = np.stack([[np.array(aug(PIL.Image.fromarray(img))) for _ in range(n_repeats)] for img in imgs])
+
+    batch_aug = BatchAugmentation(policies, generator=torch.Generator().manual_seed(0))
+    outputs = batch_aug(_to_tensor(np.repeat(imgs, n_repeats, axis=0)))
+    outputs = _to_numpy(outputs).reshape(expected.shape)
+
+    expected, outputs = expected.astype(np.float64), outputs.astype(np.float64)
+
+    # Per-pixel statistics over the random draws of each image
+    # (differences between two seeds of the PIL path are about 2.0)
+    assert np.abs(expected.mean(axis=1) - outputs.mean(axis=1)).mean() < 4.0
+    assert np.abs(expected.std(axis=1) - outputs.std(axis=1)).mean() < 4.0
+
+    # Distribution of the mean intensity of the augmented images
+    quantiles = np.linspace(0.05, 0.95, 19)
+    expected_q = np.quantile(expected.mean(axis=(2, 3, 4)), quantiles, axis=1)
+    outputs_q = np.quantile(outputs.mean(axis=(2, 3, 4)), quantiles, axis=1)
+    assert np.abs(expected_q - outputs_q).max() < 25.0
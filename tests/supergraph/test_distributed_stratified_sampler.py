@@ -0,0 +1,57 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT license.
+
+import numpy as np
+import pytest
+from sklearn.model_selection import StratifiedKFold
+
+from archai.supergraph.datasets.distributed_stratified_sampler import (
+    DistributedStratifiedSampler,
+    _stratified_fold,
+)
+
+
+class _Dataset:
+    def __init__(self, targets):
+        self.targets = targets
+
+    def __len__(self):
+        return len(self.targets)
+
+
+@pytest.mark.parametrize("n_samples,n_classes,n_splits", [(1000, 10, 4), (997, 7, 3), (31, 5, 2)])
+def test_stratified_fold(n_samples, n_classes, n_splits):
+    targets = np.random.default_rng(0).integers(n_classes, size=n_samples)
+
+    # Assert that folds are the same as scikit-learn's
+    for fold, (_, test_idxs) in enumerate(StratifiedKFold(n_splits).split(np.zeros(n_samples), targets)):
+        assert np.array_equal(_stratified_fold(targets, n_splits, fold), test_idxs)
+
+
+def test_distributed_stratified_sampler():
+    dataset = _Dataset([i % 10 for i in range(1003)])
+
+    train_idxs, val_idxs = [], []
+    for rank in range(2):
+        train_sampler = DistributedStratifiedSampler(dataset, world_size=2, rank=rank, val_ratio=0.2)
+        val_sampler = DistributedStratifiedSampler(dataset, world_size=2, rank=rank, val_ratio=0.2, is_val_split=True)
+
+        # Assert that indices are cached across epochs and only shuffled
+        epoch_idxs = list(train_sampler)
+        train_sampler.set_epoch(1)
+        assert train_sampler._cached_indices is not None
+        assert sorted(train_sampler) == sorted(epoch_idxs)
+
+        train_idxs.extend(epoch_idxs)
+        val_idxs.extend(val_sampler)
+
+    # Assert that train and validation splits are disjoint and cover the dataset
+    assert not set(train_idxs) & set(val_idxs)
+    assert set(train_idxs) | set(val_idxs) == set(range(len(dataset)))
+    assert len(train_idxs) == 2 * len(train_sampler)
+
+    # Assert that indices are not cached when they depend on the epoch
+    sampler = DistributedStratifiedSampler(dataset, world_size=2, rank=0)
+    epoch_idxs = list(sampler)
+    sampler.set_epoch(1)
+    assert sampler._cached_indices is None and list(sampler) != epoch_idxs
@@ -0,0 +1,75 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT license.
+
+import copy
+
+import pytest
+import torch
+from overrides import overrides
+from torch import nn
+
+from archai.supergraph.algos.darts.bilevel_optimizer import BilevelOptimizer
+from archai.supergraph.algos.darts.functional_bilevel_optimizer import (
+    FUNCTIONAL_AVAILABLE,
+    FunctionalBilevelOptimizer,
+)
+from archai.supergraph.nas.arch_module import ArchModule
+
+
+class _MixedModel(ArchModule):
+    def __init__(self):
+        super().__init__()
+
+        self.convs = nn.ModuleList([nn.Conv2d(3, 4, 3, padding=1), nn.Conv2d(3, 4, 1)])
+        self.bn = nn.BatchNorm2d(4)
+        self.linear = nn.Linear(4, 5)
+        self.create_arch_params([("alphas", nn.Parameter(1e-1 * torch.randn(2)))])
+        self._alphas = list(self.arch_params().param_by_kind("alphas"))
+
+    @overrides
+    def forward(self, x):
+        weights = torch.softmax(self._alphas[0], dim=0)
+        x = sum(w * conv(x) for w, conv in zip(weights, self.convs))
+        x = torch.relu(self.bn(x)).mean(dim=(2, 3))
+        return self.linear(x), None
+
+
+@pytest.mark.skipif(not FUNCTIONAL_AVAILABLE, reason="requires PyTorch >= 2.1")
+def test_functional_bilevel_optimizer():
+    torch.manual_seed(0)
+    conf_alpha_optim = {"type": "sgd", "lr": 0.1, "decay": 0.0, "momentum": 0.0, "nesterov": False}
+    x_train, y_train = torch.randn(8, 3, 6, 6), torch.randint(5, (8,))
+    x_valid, y_valid = torch.randn(8, 3, 6, 6), torch.randint(5, (8,))
+
+    models, alphas_grads = [], []
+    for bilevel_optim_cls in [BilevelOptimizer, FunctionalBilevelOptimizer]:
+        torch.manual_seed(1)
+        model = _MixedModel()
+        models.append(model)
+
+        # Populates momentum buffers of the weights' optimizer
+        w_optim = torch.optim.SGD(model.parameters(), lr=0.05, momentum=0.9)
+        model(x_train)[0].sum().backward()
+        w_optim.step()
+
+        weights = copy.deepcopy(dict(model.named_parameters()))
+        bilevel_optim = bilevel_optim_cls(
+            conf_alpha_optim, 0.9, 3e-4, model, nn.CrossEntropyLoss(), torch.device("cpu"), batch_chunks=2
+        )
+        bilevel_optim.step(x_train, y_train, x_valid, y_valid, w_optim)
+        alphas_grads.append(model._alphas[0].grad)
+
+        # Assert that weights (except alphas) are left as-is
+        for name, value in model.named_parameters():
+            if "alphas" not in name:
+                assert torch.allclose(value, weights[name], atol=1e-6), name
+
+    # Assert that both optimizers compute the same gradients and updates of alphas
+    assert alphas_grads[0].abs().sum() > 0
+    assert torch.allclose(alphas_grads[0], alphas_grads[1], atol=1e-5)
+    assert torch.allclose(models[0]._alphas[0], models[1]._alphas[0], atol=1e-6)
+
+    # Assert that state of the functional optimizer is small and can be restored
+    state_dict = bilevel_optim.state_dict()
+    assert set(state_dict["vbuffers"]) == {"bn.running_mean", "bn.running_var", "bn.num_batches_tracked"}
+    bilevel_optim.load_state_dict(state_dict)
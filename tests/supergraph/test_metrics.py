@@ -0,0 +1,49 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT license.
+
+import pytest
+import torch
+
+from archai.supergraph.utils.metrics import Metrics
+
+
+def _run_epoch(metrics, batches):
+    metrics.pre_epoch()
+    for x, y, logits, loss in batches:
+        metrics.pre_step(x, y)
+        metrics.post_step(x, y, logits, loss, len(batches))
+
+
+def test_deferred_metrics(monkeypatch):
+    monkeypatch.setattr("archai.supergraph.utils.metrics.get_tb_writer", lambda: None)
+
+    torch.manual_seed(0)
+    batches = []
+    for batch_size in [8, 8, 5]:
+        x, y, logits = torch.randn(batch_size, 3), torch.randint(10, (batch_size,)), torch.randn(batch_size, 10)
+        batches.append((x, y, logits, torch.nn.functional.cross_entropy(logits, y)))
+
+    metrics = Metrics("eager", None, logger_freq=2)
+    deferred_metrics = Metrics("deferred", None, logger_freq=2, deferred=True)
+    metrics.pre_run()
+    deferred_metrics.pre_run()
+    _run_epoch(metrics, batches)
+    _run_epoch(deferred_metrics, batches)
+
+    # Assert that step metrics are accumulated on device until they are resolved
+    epoch, deferred_epoch = metrics.cur_epoch(), deferred_metrics.cur_epoch()
+    assert deferred_epoch.top1.cnt == 16 and deferred_epoch._pending_cnt == 5
+
+    # Assert that state dict resolves pending metrics without serializing tensors
+    state_dict = deferred_metrics.state_dict()
+    assert "Tensor" not in state_dict["yaml"]
+    deferred_metrics.load_state_dict(state_dict)
+
+    metrics.post_epoch()
+    deferred_metrics.post_epoch()
+    epoch, deferred_epoch = metrics.cur_epoch(), deferred_metrics.cur_epoch()
+    for name in ["top1", "top5", "loss"]:
+        meter, deferred_meter = getattr(epoch, name), getattr(deferred_epoch, name)
+        assert deferred_meter.cnt == meter.cnt == 21
+        assert deferred_meter.avg == pytest.approx(meter.avg)
+        assert deferred_meter.last == pytest.approx(meter.last)
@@ -0,0 +1,84 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT license.
+
+import pytest
+import torch
+import torch.nn.functional as F
+
+from archai.supergraph.algos.darts.mixed_op import MixedOp
+from archai.supergraph.algos.gumbelsoftmax.gs_op import GsOp
+from archai.supergraph.nas.mixed_op_utils import select_ops, weighted_sum_ops
+from archai.supergraph.nas.model_desc import ConvMacroParams, OpDesc
+
+
+def _create_op(op_cls, stride, **params):
+    op_desc = OpDesc(
+        "mixed_op", params={"conv": ConvMacroParams(4, 4), "stride": stride, **params}, in_len=1, trainables=None
+    )
+    return op_cls(op_desc, arch_params=None, affine=True)
+
+
+def _grads(module, x):
+    return [p.grad.clone() for p in module.parameters()] + [x.grad.clone()]
+
+
+@pytest.mark.parametrize("stride", [1, 2])
+def test_mixed_op_matches_weighted_sum(stride):
+    torch.manual_seed(0)
+    op = _create_op(MixedOp, stride)
+    x = torch.randn(2, 4, 8, 8, requires_grad=True)
+
+    # Assert that forward and gradients (including the alphas') match the reference sum
+    y = op(x)
+    y.square().sum().backward()
+    grads = _grads(op, x)
+
+    op.zero_grad()
+    x.grad = None
+    weights = F.softmax(op._alphas[0], dim=0)
+    y_ref = sum(w * o(x) for w, o in zip(weights, op._ops))
+    y_ref.square().sum().backward()
+
+    assert torch.allclose(y, y_ref, atol=1e-6)
+    for grad, grad_ref in zip(grads, _grads(op, x)):
+        assert torch.allclose(grad, grad_ref, atol=1e-5)
+
+
+def test_gs_op_skips_zero_weights():
+    torch.manual_seed(0)
+    op = _create_op(GsOp, 2)
+    x = torch.randn(2, 4, 8, 8)
+
+    # Assert that hard samples only run the sampled op
+    weights = torch.zeros(len(GsOp.PRIMITIVES))
+    weights[3] = 1.0
+    op.set_op_sampled_weights(weights)
+    assert select_ops(weights, none_index=len(weights) - 1) == [3]
+    assert torch.allclose(op(x), op._ops[3](x))
+
+    # Assert that sampling only 'none' still gives an output of the correct shape
+    weights = torch.zeros(len(GsOp.PRIMITIVES))
+    weights[-1] = 1.0
+    op.set_op_sampled_weights(weights)
+    assert torch.equal(op(x), torch.zeros(2, 4, 4, 4))
+
+
+def test_weighted_sum_ops_sparse():
+    ops = [torch.nn.Identity() for _ in range(5)]
+    weights = torch.tensor([0.1, 0.4, 0.2, 0.3, 0.5], requires_grad=True)
+    x = torch.ones(3)
+
+    # Assert that 'none' is never selected and that sparse modes keep the largest weights
+    assert select_ops(weights, none_index=4) == [0, 1, 2, 3]
+    assert select_ops(weights, none_index=4, top_k=2) == [1, 3]
+    assert select_ops(weights, none_index=4, threshold=0.25) == [1, 3]
+    assert select_ops(weights, none_index=4, top_k=1, threshold=0.25) == [1]
+
+    y = weighted_sum_ops(x, weights, ops, none_index=4, top_k=2)
+    y.sum().backward()
+    assert torch.allclose(y, torch.full((3,), 0.7))
+    assert weights.grad.tolist() == [0.0, 3.0, 0.0, 3.0, 0.0]
+
+    activs = []
+    weighted_sum_ops(x, weights, ops, none_index=4, threshold=0.35, activs=activs)
+    assert [a is not None for a in activs] == [False, True, False, False, False]
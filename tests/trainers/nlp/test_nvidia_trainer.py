@@ -4,10 +4,13 @@
 import os
 import tempfile
 
+import pytest
 import torch
 from transformers import GPT2Config, GPT2LMHeadModel
 
-from archai.trainers.nlp.nvidia_trainer import save_checkpoint
+from archai.trainers.async_checkpoint_writer import AsyncCheckpointWriter
+from archai.trainers.nlp.nvidia_trainer import NvidiaTrainer, save_checkpoint
+from archai.trainers.nlp.nvidia_training_args import NvidiaTrainingArguments
 
 
 def test_save_checkpoint():
@@ -71,3 +74,63 @@ def test_save_checkpoint():
         assert checkpoint["scheduler_state"][key] == scheduler.state_dict()[key]
     assert checkpoint["scaler_state"] is None
     assert checkpoint["trainer_state"] == trainer_state
+
+    # Assert that step checkpoints are written in the background and linked to the last checkpoint
+    checkpoint_writer = AsyncCheckpointWriter()
+    save_checkpoint(
+        output_dir=output_dir,
+        model=model,
+        optimizer=optimizer,
+        scheduler=scheduler,
+        scaler=scaler,
+        trainer_state={"step": 1},
+        fp16=False,
+        save_all_checkpoints=True,
+        is_best_model=False,
+        checkpoint_writer=checkpoint_writer,
+    )
+    checkpoint_writer.close()
+    checkpoint_path = os.path.join(output_dir, "checkpoint-1.pt")
+    assert os.path.samefile(checkpoint_path, os.path.join(output_dir, "checkpoint-last.pt"))
+    assert torch.load(checkpoint_path)["trainer_state"] == {"step": 1}
+    assert torch.load(os.path.join(output_dir, "checkpoint-best.pt"))["trainer_state"] == trainer_state
+
+
+def test_nvidia_trainer_sync_free_accumulation(tmp_path):
+    dataset_dir = tmp_path / "textpred" / "olx_tmp"
+    dataset_dir.mkdir(parents=True)
+    for split in ["train", "valid", "test"]:
+        lines = [" ".join(f"w{(i * j) % 13}" for j in range(10)) for i in range(100)]
+        (dataset_dir / f"{split}.txt").write_text("\n".join(lines))
+
+    # Assert that losses accumulated on device are the same as the ones synchronized for every chunk
+    losses = []
+    for sync_free_accumulation in [False, True]:
+        args = NvidiaTrainingArguments(
+            "tmp",
+            output_dir=str(tmp_path / "output"),
+            no_cuda=True,
+            dataset_name="olx_tmp",
+            dataset_dir=str(tmp_path),
+            vocab_type="word",
+            vocab_size=None,
+            max_steps=6,
+            logging_steps=2,
+            do_eval=False,
+            global_batch_size=4,
+            seq_len=8,
+            gradient_accumulation_steps=2,
+            optim="adam",
+            lr_scheduler_warmup_steps=2,
+            sync_free_accumulation=sync_free_accumulation,
+        )
+
+        torch.manual_seed(0)
+        model = GPT2LMHeadModel(config=GPT2Config(vocab_size=20, n_positions=16, n_embd=16, n_layer=1, n_head=2))
+
+        trainer = NvidiaTrainer(model, args=args)
+        trainer.train()
+        losses.append([log["loss"] for log in trainer.trainer_state["log_history"]])
+
+    assert len(losses[0]) == 3
+    assert losses[0] == pytest.approx(losses[1], rel=1e-5)
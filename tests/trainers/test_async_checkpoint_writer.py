@@ -0,0 +1,54 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT license.
+
+import os
+
+import torch
+
+from archai.trainers.async_checkpoint_writer import AsyncCheckpointWriter, save_atomic
+
+
+def test_save_atomic(tmp_path):
+    file_path = str(tmp_path / "checkpoint-last.pt")
+    link_file_path = str(tmp_path / "checkpoint-best.pt")
+
+    # Assert that additional paths are hard links to the saved file
+    save_atomic({"step": 1}, file_path, link_file_paths=[link_file_path])
+    assert os.path.samefile(file_path, link_file_path)
+    assert sorted(os.listdir(tmp_path)) == ["checkpoint-best.pt", "checkpoint-last.pt"]
+
+    # Assert that overwriting the file does not modify its previous links
+    save_atomic({"step": 2}, file_path)
+    assert torch.load(file_path) == {"step": 2}
+    assert torch.load(link_file_path) == {"step": 1}
+
+
+def test_async_checkpoint_writer(tmp_path):
+    model = torch.nn.Linear(4, 4)
+    trainer_state = {"step": 1, "log_history": []}
+    model_state = {"weight": model.weight, "tied_weight": model.weight.detach()}
+    state = {"model_state": model_state, "trainer_state": trainer_state}
+    file_path = str(tmp_path / "checkpoint-last.pt")
+
+    writer = AsyncCheckpointWriter()
+    writer.save(state, file_path, link_file_paths=[str(tmp_path / "checkpoint-1.pt")])
+
+    # Assert that updates after `save()` are not written to the checkpoint
+    weight = model.weight.detach().clone()
+    with torch.no_grad():
+        model.weight.add_(1.0)
+    trainer_state["log_history"].append({"loss": 1.0})
+
+    writer.wait()
+    checkpoint = torch.load(file_path)
+    assert torch.equal(checkpoint["model_state"]["weight"], weight)
+    assert checkpoint["trainer_state"] == {"step": 1, "log_history": []}
+
+    # Assert that tensors sharing the same memory are still shared in the checkpoint
+    assert checkpoint["model_state"]["tied_weight"].data_ptr() == checkpoint["model_state"]["weight"].data_ptr()
+
+    # Assert that buffers are re-used by the following checkpoints
+    writer.save(state, file_path)
+    writer.close()
+    assert torch.equal(torch.load(file_path)["model_state"]["weight"], model.weight.detach())
+    assert torch.equal(torch.load(str(tmp_path / "checkpoint-1.pt"))["model_state"]["weight"], weight)
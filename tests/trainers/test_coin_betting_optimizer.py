@@ -1,6 +1,7 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the MIT license.
 
+import pytest
 import torch
 from torch.optim import Optimizer
 
@@ -31,3 +32,26 @@ def test_cocob_ons():
     loss = loss_fn(outputs, torch.randn(10, 5))
     loss.backward()
     assert loss.shape == torch.Size([])
+
+
+@pytest.mark.parametrize("optimizer_cls", [CocobBackprop, CocobOns])
+def test_cocob_foreach_step(optimizer_cls):
+    params = [torch.randn(10, 5, requires_grad=True), torch.randn(5, requires_grad=True)]
+    foreach_params = [param.detach().clone().requires_grad_() for param in params]
+
+    optimizer = optimizer_cls(params, foreach=False)
+    foreach_optimizer = optimizer_cls(foreach_params, foreach=True)
+
+    # Assert that the multi-tensor implementation gives the same parameters and updates them in-place
+    data_ptrs = [param.data_ptr() for param in foreach_params]
+    for _ in range(5):
+        for param, foreach_param in zip(params, foreach_params):
+            grad = 2 * torch.randn_like(param)
+            param.grad, foreach_param.grad = grad, grad.clone()
+
+        optimizer.step()
+        foreach_optimizer.step()
+
+    for param, foreach_param in zip(params, foreach_params):
+        assert torch.allclose(param, foreach_param, atol=1e-6)
+    assert [param.data_ptr() for param in foreach_params] == data_ptrs
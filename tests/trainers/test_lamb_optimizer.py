@@ -103,3 +103,29 @@ def test_jit_lamb_step():
     jit_lamb = JITLamb([torch.randn(10, 5)])
     loss = jit_lamb.step()
     assert loss is None
+
+
+@pytest.mark.parametrize("weight_decay,adam", [(0.0, False), (0.1, False), (0.1, True)])
+def test_lamb_foreach_step(weight_decay, adam):
+    params = [torch.randn(10, 5, requires_grad=True), torch.zeros(5, requires_grad=True)]
+    foreach_params = [param.detach().clone().requires_grad_() for param in params]
+
+    lamb = Lamb(params, lr=0.1, weight_decay=weight_decay, adam=adam, foreach=False)
+    foreach_lamb = Lamb(foreach_params, lr=0.1, weight_decay=weight_decay, adam=adam, foreach=True)
+
+    # Assert that the multi-tensor implementation gives the same parameters and trust ratios,
+    # including parameters and steps with a zero norm
+    for i in range(5):
+        for param, foreach_param in zip(params, foreach_params):
+            grad = torch.zeros_like(param) if i == 0 else torch.randn_like(param)
+            param.grad, foreach_param.grad = grad, grad.clone()
+
+        lamb.step()
+        foreach_lamb.step()
+
+        for param, foreach_param in zip(params, foreach_params):
+            assert torch.allclose(param, foreach_param, atol=1e-6)
+            assert torch.allclose(
+                torch.as_tensor(lamb.state[param]["trust_ratio"], dtype=torch.float32),
+                foreach_lamb.state[foreach_param]["trust_ratio"],
+            )